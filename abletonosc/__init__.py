@@ -4,13 +4,19 @@ logger = logging.getLogger("abletonosc")
 logger.info("Reloading abletonosc...")
 
 from .osc_server import OSCServer
-from .application import ApplicationHandler
-from .song import SongHandler
-from .clip import ClipHandler
-from .clip_slot import ClipSlotHandler
-from .track import TrackHandler
-from .device import DeviceHandler
-from .chain import ChainHandler
-from .scene import SceneHandler
-from .view import ViewHandler
+from .resolver import ObjectResolver
 from .constants import OSC_LISTEN_PORT, OSC_RESPONSE_PORT
+try:
+    from .application import ApplicationHandler
+    from .song import SongHandler
+    from .clip import ClipHandler
+    from .clip_slot import ClipSlotHandler
+    from .track import TrackHandler
+    from .device import DeviceHandler
+    from .chain import ChainHandler
+    from .scene import SceneHandler
+    from .view import ViewHandler
+except ImportError:
+    # The handlers import Live, which is only available within Ableton Live.
+    # This allows the OSC server to be unit tested through pytest without it.
+    pass
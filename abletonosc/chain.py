@@ -13,8 +13,7 @@ class ChainHandler(AbletonOSCHandler):
                 device_index = int(params[1])
                 chain_index = int(params[2])
                 
-                track = self.song.tracks[track_index]
-                device = track.devices[device_index]
+                device = self.resolver.get_device(track_index, device_index)
                 
                 # Check if device has chains
                 if not hasattr(device, 'chains') or not device.chains:
@@ -70,8 +69,7 @@ class ChainHandler(AbletonOSCHandler):
             track_index = int(params[0])
             device_index = int(params[1])
             
-            track = self.song.tracks[track_index]
-            device = track.devices[device_index]
+            device = self.resolver.get_device(track_index, device_index)
             
             if hasattr(device, 'chains'):
                 return (track_index, device_index, len(device.chains))
@@ -86,8 +84,7 @@ class ChainHandler(AbletonOSCHandler):
             device_index = int(params[1])
             chain_index = int(params[2])
             
-            track = self.song.tracks[track_index]
-            device = track.devices[device_index]
+            device = self.resolver.get_device(track_index, device_index)
             
             if hasattr(device, 'chains') and chain_index < len(device.chains):
                 chain = device.chains[chain_index]
@@ -105,8 +102,7 @@ class ChainHandler(AbletonOSCHandler):
             chain_index = int(params[2])
             chain_device_index = int(params[3])
             
-            track = self.song.tracks[track_index]
-            device = track.devices[device_index]
+            device = self.resolver.get_device(track_index, device_index)
             
             if hasattr(device, 'chains') and chain_index < len(device.chains):
                 chain = device.chains[chain_index]
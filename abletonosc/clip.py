@@ -1,34 +1,605 @@
 import re
+import zlib
+import random
+from collections import deque, OrderedDict
 from typing import Tuple, Callable, Any, Optional
 from .handler import AbletonOSCHandler
+from .constants import OSC_NOTE_STREAM_PAGE_SIZE, OSC_NOTE_STREAM_PAGES_PER_TICK, OSC_MAX_NOTE_SNAPSHOTS
+from .packed import split_packed_flag, pack_column, unpack_column
 import Live
 
+NOTE_NAMES = [["C"],
+              ["C#", "Db"],
+              ["D"],
+              ["D#", "Eb"],
+              ["E"],
+              ["F"],
+              ["F#", "Gb"],
+              ["G"],
+              ["G#", "Ab"],
+              ["A"],
+              ["A#", "Bb"],
+              ["B"]]
+NOTE_NAME_TO_INDEX = {name: index for index, names in enumerate(NOTE_NAMES) for name in names}
+CLIP_NAME_TAGS_REGEX = re.compile("([_-])([A-G][A-G#b1-9-]*)$")
+
 def note_name_to_midi(name):
     """ Maps a MIDI note name (D3, C#6) to a value.
     Assumes that middle C is C4. """
-    note_names = [["C"],
-                  ["C#", "Db"],
-                  ["D"],
-                  ["D#", "Eb"],
-                  ["E"],
-                  ["F"],
-                  ["F#", "Gb"],
-                  ["G"],
-                  ["G#", "Ab"],
-                  ["A"],
-                  ["A#", "Bb"],
-                  ["B"]]
-
-    for index, names in enumerate(note_names):
-        if name in names:
-            return index
-    return None
+    return NOTE_NAME_TO_INDEX.get(name)
+
+def get_clip_name_tags(name: str) -> Tuple:
+    """
+    Returns the note indices tagged at the end of a clip name (e.g. "Bass_C-E-G" -> (0, 4, 7)),
+    or an empty tuple if the name has no tags. Unrecognised note names are returned as None.
+    """
+    match = CLIP_NAME_TAGS_REGEX.search(name)
+    if not match:
+        return ()
+    clip_notes_str = re.sub("[1-9]", "", match.group(2))
+    return tuple(note_name_to_midi(name) for name in clip_notes_str.split("-"))
+
+def iter_bits(bits: int):
+    """
+    Yields the index of each set bit of `bits`, lowest first.
+    """
+    while bits:
+        lowest_bit = bits & -bits
+        yield lowest_bit.bit_length() - 1
+        bits ^= lowest_bit
+
+def get_note_attributes(notes) -> Tuple:
+    """
+    Flattens Live notes into (pitch, start_time, duration, velocity, mute) tuples.
+    """
+    all_note_attributes = []
+    for note in notes:
+        all_note_attributes += [note.pitch, note.start_time, note.duration, note.velocity, note.mute]
+    return tuple(all_note_attributes)
+
+def pack_note_attributes(all_note_attributes: Tuple) -> Tuple[bytes, ...]:
+    """
+    Packs flattened note attributes into packed-mode columns: pitch (i), start_time (f),
+    duration (f), velocity (f), mute (i).
+    """
+    return (pack_column(all_note_attributes[0::5], "i"),
+            pack_column(all_note_attributes[1::5]),
+            pack_column(all_note_attributes[2::5]),
+            pack_column(all_note_attributes[3::5]),
+            pack_column(all_note_attributes[4::5], "i"))
+
+def get_notes_hash(all_note_attributes: Tuple) -> int:
+    """
+    Returns the CRC32 of the packed columns of the given notes, as a signed 32-bit int
+    so that it can be sent as an OSC int.
+    """
+    crc = 0
+    for column in pack_note_attributes(all_note_attributes):
+        crc = zlib.crc32(column, crc)
+    return crc - (1 << 32) if crc >= (1 << 31) else crc
+
+def get_notes_page(all_note_attributes: Tuple, offset: int, limit: int) -> Tuple:
+    """
+    Returns a page of up to `limit` notes from flattened note attributes, starting at
+    note `offset`, as (offset, total note count, *notes).
+    """
+    offset = max(0, offset)
+    return (offset, len(all_note_attributes) // 5, *all_note_attributes[offset * 5:(offset + max(0, limit)) * 5])
+
+#--------------------------------------------------------------------------------
+# Note transforms, applied by /live/clip/transform/notes/<name> to all of the notes
+# of a clip. Each modifies a vector of notes in place, given the request params.
+#--------------------------------------------------------------------------------
+def clamp(value, min_value, max_value):
+    return max(min_value, min(max_value, value))
+
+def transform_transpose(notes, params: Tuple[Any]):
+    semitones = int(params[0])
+    for note in notes:
+        note.pitch = clamp(note.pitch + semitones, 0, 127)
+
+def transform_time_shift(notes, params: Tuple[Any]):
+    beats = float(params[0])
+    for note in notes:
+        note.start_time = max(0.0, note.start_time + beats)
+
+def transform_velocity_scale(notes, params: Tuple[Any]):
+    factor = float(params[0])
+    offset = float(params[1]) if len(params) > 1 else 0.0
+    for note in notes:
+        note.velocity = clamp(note.velocity * factor + offset, 1.0, 127.0)
+
+def transform_humanize(notes, params: Tuple[Any]):
+    time_amount = float(params[0])
+    velocity_amount = float(params[1]) if len(params) > 1 else 0.0
+    rng = random.Random(params[2] if len(params) > 2 else None)
+    for note in notes:
+        note.start_time = max(0.0, note.start_time + rng.uniform(-time_amount, time_amount))
+        note.velocity = clamp(note.velocity + rng.uniform(-velocity_amount, velocity_amount), 1.0, 127.0)
+
+note_transforms = {
+    "transpose": transform_transpose,
+    "time_shift": transform_time_shift,
+    "velocity_scale": transform_velocity_scale,
+    "humanize": transform_humanize,
+}
+
+class NoteSnapshot:
+    """
+    A cached copy of all of the notes in a clip, as flattened
+    (pitch, start_time, duration, velocity, mute) tuples, plus a hash of its contents.
+    `notes` is set to None by the clip's notes listener when the notes change, and
+    the snapshot is discarded when the has_clip property of the clip's slot changes.
+    """
+    __slots__ = ("clip", "listener", "clip_slot", "slot_listener", "notes", "hash")
+
+    def __init__(self, clip, listener):
+        self.clip = clip
+        self.listener = listener
+        self.clip_slot = None
+        self.slot_listener = None
+        self.notes = None
+        self.hash = None
+
+class NoteStream:
+    """
+    A streamed note query in progress: the pages of `notes` from `offset` onwards
+    remain to be sent to `remote_addr`. `notes` and `hash` are None until the clip's
+    snapshot is read, on the stream's first tick.
+    """
+    __slots__ = ("remote_addr", "clip_ids", "clip", "notes", "hash", "offset", "page_size")
+
+    def __init__(self, remote_addr, clip_ids, clip, page_size):
+        self.remote_addr = remote_addr
+        self.clip_ids = clip_ids
+        self.clip = clip
+        self.notes = None
+        self.hash = None
+        self.offset = 0
+        self.page_size = page_size
+
+#--------------------------------------------------------------------------------
+# Predicates accepted by ClipIndex.select(), given as name/value pairs, mapped to
+# the number of values that each takes.
+#--------------------------------------------------------------------------------
+clip_predicate_arity = {
+    "name": 1,
+    "color": 1,
+    "length": 2,
+    "is_playing": 1,
+    "group": 1,
+}
+
+#--------------------------------------------------------------------------------
+# Actions accepted by ClipIndex.apply(), mapped to the number of values that each takes.
+#--------------------------------------------------------------------------------
+clip_action_arity = {
+    "mute": 0,
+    "unmute": 0,
+    "fire": 0,
+    "stop": 0,
+    "color": 1,
+}
+
+def parse_clip_predicates(params: Tuple) -> dict:
+    """
+    Parses predicates given as OSC params (e.g. name, ".*_C$", length, 4, 16)
+    into a dict of predicate name to value (or tuple of values).
+    """
+    predicates = {}
+    index = 0
+    while index < len(params):
+        name = params[index]
+        if name not in clip_predicate_arity:
+            raise ValueError("Unknown clip predicate: %s (expected one of: %s)" %
+                             (name, ", ".join(clip_predicate_arity.keys())))
+        arity = clip_predicate_arity[name]
+        values = tuple(params[index + 1:index + 1 + arity])
+        if len(values) != arity:
+            raise ValueError("Clip predicate %s takes %d value(s)" % (name, arity))
+        predicates[name] = values if arity > 1 else values[0]
+        index += 1 + arity
+    return predicates
+
+class ClipIndex:
+    """
+    A per-set index of the clips in the session view, used by /live/clips/filter,
+    /live/clips/select and /live/clips/apply.
+
+    Each clip slot is a bit position (track_index * num_scenes + scene_index), and
+    each indexed attribute (the note-name tags at the end of clip names, colors and
+    group tracks) maps to an int bitset of the slots that match it. The index is kept
+    current by has_clip listeners on every clip slot and name/muted/color listeners
+    on every clip, and is rebuilt on next use after tracks or scenes are added or
+    removed (which includes grouping and ungrouping tracks).
+    """
+    def __init__(self, song, logger):
+        self.song = song
+        self.logger = logger
+        self.num_scenes = 0
+        self.is_built = False
+        self.clips = {}
+        self.clip_bits = 0
+        self.tag_bits = {}
+        self.tagged_bits = 0
+        self.muted_bits = 0
+        self.color_bits = {}
+        self.group_bits = {}
+        self._slot_tags = {}
+        self._slot_colors = {}
+        self._name_regex_bits = {}
+        self._slot_listeners = {}
+        self._clip_listeners = {}
+        self._removed_clip_listeners = []
+        self._song_listeners = []
+
+    def build(self) -> None:
+        """
+        (Re)build the index from every clip slot of the set.
+        """
+        self.clear()
+        self.num_scenes = len(self.song.scenes)
+        for prop in ("tracks", "scenes"):
+            self._add_listener(self.song, prop, self._invalidate)
+            self._song_listeners.append((self.song, prop, self._invalidate))
+
+        tracks = list(self.song.tracks)
+        track_indices = {track._live_ptr: track_index for track_index, track in enumerate(tracks)}
+        for track_index, track in enumerate(tracks):
+            track_bits = 0
+            for scene_index, clip_slot in enumerate(track.clip_slots):
+                bit = track_index * self.num_scenes + scene_index
+                track_bits |= 1 << bit
+                callback = self._create_has_clip_callback(bit)
+                self._add_listener(clip_slot, "has_clip", callback)
+                self._slot_listeners[bit] = (clip_slot, "has_clip", callback)
+                self._update_slot(bit, clip_slot)
+
+            #--------------------------------------------------------------------------------
+            # Add the track's slots to the group of each group track that contains it,
+            # including those of any nested groups.
+            #--------------------------------------------------------------------------------
+            group_track = track.group_track if track.is_grouped else None
+            while group_track is not None:
+                group_index = track_indices[group_track._live_ptr]
+                self.group_bits[group_index] = self.group_bits.get(group_index, 0) | track_bits
+                group_track = group_track.group_track if group_track.is_grouped else None
+
+        self.is_built = True
+        self.logger.info("Built clip index (%d clips)" % len(self.clips))
+
+    def clear(self) -> None:
+        for target, prop, callback in self._song_listeners:
+            self._remove_listener(target, prop, callback)
+        for target, prop, callback in self._slot_listeners.values():
+            self._remove_listener(target, prop, callback)
+        for bit in list(self._clip_listeners.keys()):
+            self._remove_clip(bit)
+        self.remove_stale_listeners()
+        self._song_listeners = []
+        self._slot_listeners = {}
+        self._slot_tags = {}
+        self._slot_colors = {}
+        self._name_regex_bits = {}
+        self.clips = {}
+        self.clip_bits = 0
+        self.tag_bits = {}
+        self.tagged_bits = 0
+        self.muted_bits = 0
+        self.color_bits = {}
+        self.group_bits = {}
+        self.is_built = False
+
+    def remove_stale_listeners(self) -> None:
+        """
+        Remove the listeners of clips that have been removed from the index. Clips are
+        removed within has_clip notifications, from which listeners can't be removed, so
+        this is called on each tick.
+        """
+        for clip, callbacks in self._removed_clip_listeners:
+            for prop, callback in callbacks.items():
+                self._remove_listener(clip, prop, callback)
+        self._removed_clip_listeners = []
+
+    def get_position(self, bit: int) -> Tuple[int, int]:
+        """
+        Returns the (track_index, scene_index) of a clip slot's bit position.
+        """
+        return divmod(bit, self.num_scenes)
+
+    def filter(self, note_indices) -> int:
+        """
+        Unmute each tagged clip whose tags are all in `note_indices`, and mute every
+        other tagged clip. Only clips whose mute state changes are touched.
+
+        Returns:
+            The number of clips whose mute state was changed.
+        """
+        if not self.is_built:
+            self.build()
+        excluded_bits = 0
+        for tag, bits in self.tag_bits.items():
+            if tag not in note_indices:
+                excluded_bits |= bits
+        mute_bits = excluded_bits & self.tagged_bits & ~self.muted_bits
+        unmute_bits = self.tagged_bits & ~excluded_bits & self.muted_bits
+        self.set_muted(mute_bits, True)
+        self.set_muted(unmute_bits, False)
+        return bin(mute_bits | unmute_bits).count("1")
+
+    def select(self, predicates: dict) -> int:
+        """
+        Returns the bitset of the clips that match all of the given predicates
+        (see parse_clip_predicates).
+
+        Names, colors and groups are matched against the index. Length and playing
+        state change too often to be indexed, so are read from the clips that match
+        the other predicates.
+        """
+        if not self.is_built:
+            self.build()
+        bits = self.clip_bits
+        if "name" in predicates:
+            bits &= self._get_name_regex_bits(predicates["name"])
+        if "color" in predicates:
+            bits &= self.color_bits.get(int(predicates["color"]), 0)
+        if "group" in predicates:
+            bits &= self.group_bits.get(int(predicates["group"]), 0)
+        if "length" in predicates:
+            length_min, length_max = (float(value) for value in predicates["length"])
+            for bit in iter_bits(bits):
+                if not length_min <= self.clips[bit].length <= length_max:
+                    bits &= ~(1 << bit)
+        if "is_playing" in predicates:
+            is_playing = bool(predicates["is_playing"])
+            for bit in iter_bits(bits):
+                if self.clips[bit].is_playing != is_playing:
+                    bits &= ~(1 << bit)
+        return bits
+
+    def set_muted(self, bits: int, muted: bool) -> int:
+        """
+        Mute or unmute the clips in `bits`, skipping those already in that state.
+
+        Returns:
+            The number of clips whose mute state was changed.
+        """
+        bits &= ~self.muted_bits if muted else self.muted_bits
+        for bit in iter_bits(bits):
+            self.clips[bit].muted = muted
+        if muted:
+            self.muted_bits |= bits
+        else:
+            self.muted_bits &= ~bits
+        return bin(bits).count("1")
+
+    def apply(self, bits: int, action: str, action_params: Tuple = ()) -> int:
+        """
+        Apply an action (see clip_action_arity) to each of the clips in `bits`.
+
+        Returns:
+            The number of clips changed. Muting and unmuting skip clips that are
+            already in that state.
+        """
+        if action == "mute":
+            return self.set_muted(bits, True)
+        elif action == "unmute":
+            return self.set_muted(bits, False)
+        elif action == "color":
+            color = int(action_params[0])
+            bits &= ~self.color_bits.get(color, 0)
+            for bit in iter_bits(bits):
+                self.clips[bit].color = color
+        elif action == "fire":
+            for bit in iter_bits(bits):
+                self.clips[bit].fire()
+        elif action == "stop":
+            for bit in iter_bits(bits):
+                self.clips[bit].stop()
+        else:
+            raise ValueError("Unknown clip action: %s (expected one of: %s)" %
+                             (action, ", ".join(clip_action_arity.keys())))
+        return bin(bits).count("1")
+
+    def _get_name_regex_bits(self, pattern: str) -> int:
+        """
+        Returns the bitset of clips whose names match `pattern`. Results are cached
+        until a clip is renamed, added or removed.
+        """
+        if pattern not in self._name_regex_bits:
+            regex = re.compile(pattern)
+            bits = 0
+            for bit, clip in self.clips.items():
+                if regex.search(clip.name):
+                    bits |= 1 << bit
+            self._name_regex_bits[pattern] = bits
+        return self._name_regex_bits[pattern]
+
+    def _invalidate(self) -> None:
+        #--------------------------------------------------------------------------------
+        # Bit positions depend on the number of tracks and scenes, so the index is
+        # rebuilt (on next use) rather than being updated in place.
+        #--------------------------------------------------------------------------------
+        self.is_built = False
+
+    def _create_has_clip_callback(self, bit: int) -> Callable:
+        def has_clip_changed_callback():
+            if self.is_built:
+                self._update_slot(bit, self._slot_listeners[bit][0])
+        return has_clip_changed_callback
+
+    def _update_slot(self, bit: int, clip_slot) -> None:
+        """
+        Re-read the clip of a clip slot, re-attaching its listeners if it has changed.
+        """
+        clip = clip_slot.clip if clip_slot.has_clip else None
+        if bit in self._clip_listeners:
+            if clip is not None and self._clip_listeners[bit][0] == clip:
+                return
+            self._remove_clip(bit)
+        if clip is None:
+            return
+
+        #--------------------------------------------------------------------------------
+        # The listeners of a removed clip remain until the next tick, so each first checks
+        # that its clip is still the one indexed at this slot.
+        #--------------------------------------------------------------------------------
+        def name_changed_callback():
+            if self.clips.get(bit) == clip:
+                self._set_tags(bit, get_clip_name_tags(clip.name))
+                self._name_regex_bits.clear()
+
+        def muted_changed_callback():
+            if self.clips.get(bit) == clip:
+                self._set_muted_bit(bit, clip.muted)
+
+        def color_changed_callback():
+            if self.clips.get(bit) == clip:
+                self._set_color(bit, clip.color)
+
+        callbacks = {
+            "name": name_changed_callback,
+            "muted": muted_changed_callback,
+            "color": color_changed_callback,
+        }
+        for prop, callback in callbacks.items():
+            self._add_listener(clip, prop, callback)
+        self._clip_listeners[bit] = (clip, callbacks)
+        self.clips[bit] = clip
+        self.clip_bits |= 1 << bit
+        self._name_regex_bits.clear()
+        for callback in callbacks.values():
+            callback()
+
+    def _remove_clip(self, bit: int) -> None:
+        self._removed_clip_listeners.append(self._clip_listeners.pop(bit))
+        del self.clips[bit]
+        self.clip_bits &= ~(1 << bit)
+        self._name_regex_bits.clear()
+        self._set_tags(bit, ())
+        self._set_muted_bit(bit, False)
+        self._set_color(bit, None)
+
+    def _set_tags(self, bit: int, tags: Tuple) -> None:
+        mask = 1 << bit
+        for tag in self._slot_tags.pop(bit, ()):
+            self.tag_bits[tag] &= ~mask
+            if not self.tag_bits[tag]:
+                del self.tag_bits[tag]
+        if tags:
+            self._slot_tags[bit] = tags
+            for tag in tags:
+                self.tag_bits[tag] = self.tag_bits.get(tag, 0) | mask
+            self.tagged_bits |= mask
+        else:
+            self.tagged_bits &= ~mask
+
+    def _set_color(self, bit: int, color: Optional[int]) -> None:
+        mask = 1 << bit
+        previous_color = self._slot_colors.pop(bit, None)
+        if previous_color is not None:
+            self.color_bits[previous_color] &= ~mask
+            if not self.color_bits[previous_color]:
+                del self.color_bits[previous_color]
+        if color is not None:
+            self._slot_colors[bit] = color
+            self.color_bits[color] = self.color_bits.get(color, 0) | mask
+
+    def _set_muted_bit(self, bit: int, muted: bool) -> None:
+        if muted:
+            self.muted_bits |= 1 << bit
+        else:
+            self.muted_bits &= ~(1 << bit)
+
+    def _add_listener(self, target, prop: str, callback: Callable) -> None:
+        getattr(target, "add_%s_listener" % prop)(callback)
+
+    def _remove_listener(self, target, prop: str, callback: Callable) -> None:
+        try:
+            getattr(target, "remove_%s_listener" % prop)(callback)
+        except Exception as e:
+            #--------------------------------------------------------------------------------
+            # Benign if the object has since been deleted (see AbletonOSCHandler._remove_listener).
+            #--------------------------------------------------------------------------------
+            self.logger.info("Exception whilst removing %s listener (likely benign): %s" % (prop, e))
 
 class ClipHandler(AbletonOSCHandler):
     def __init__(self, manager):
         super().__init__(manager)
         self.class_identifier = "clip"
-        self._clip_notes_cache = []
+        self.listener_id_count = 2
+        #--------------------------------------------------------------------------------
+        # Index of the clips in the set, used by /live/clips/filter, select and apply,
+        # built on first use.
+        #--------------------------------------------------------------------------------
+        self._clip_index = ClipIndex(self.song, self.logger)
+        #--------------------------------------------------------------------------------
+        # NoteSnapshots of clips whose notes have been queried, keyed by clip._live_ptr,
+        # in order of last use. Snapshots whose clip has been deleted are queued in
+        # _removed_note_snapshots and discarded by tick().
+        #--------------------------------------------------------------------------------
+        self._note_snapshots = OrderedDict()
+        self._removed_note_snapshots = []
+        #--------------------------------------------------------------------------------
+        # Streamed note queries in progress, sent a few pages per tick by tick().
+        #--------------------------------------------------------------------------------
+        self._note_streams = deque()
+
+    def clear_api(self):
+        super().clear_api()
+        self._clear_note_snapshots()
+        self._note_streams.clear()
+        self._clip_index.clear()
+
+    def _clear_listeners(self, remote_addr: Optional[Tuple[str, int]] = None):
+        """
+        Also cancels the streamed note queries of `remote_addr` (or of all clients, if
+        not specified), so that streams are not sent to a client that has gone away.
+        """
+        super()._clear_listeners(remote_addr)
+        if remote_addr is None:
+            self._note_streams.clear()
+        else:
+            self._note_streams = deque(stream for stream in self._note_streams
+                                       if stream.remote_addr != remote_addr)
+
+    def tick(self):
+        """
+        Send the next pages of any streamed note queries, up to
+        OSC_NOTE_STREAM_PAGES_PER_TICK pages in total. Reading the snapshot of a
+        stream's clip counts as one page. Each stream ends with /live/clip/get/notes/end.
+        """
+        super().tick()
+        self._discard_removed_note_snapshots()
+        self._clip_index.remove_stale_listeners()
+        pages_sent = 0
+        while self._note_streams and pages_sent < OSC_NOTE_STREAM_PAGES_PER_TICK:
+            stream = self._note_streams[0]
+            if stream.notes is None:
+                try:
+                    snapshot = self._get_note_snapshot(stream.clip)
+                except Exception:
+                    #--------------------------------------------------------------------------------
+                    # e.g. the clip has been deleted since the stream was requested.
+                    #--------------------------------------------------------------------------------
+                    self._note_streams.popleft()
+                    raise
+                stream.notes, stream.hash = snapshot.notes, snapshot.hash
+                stream.clip = None
+                pages_sent += 1
+                continue
+            note_count = len(stream.notes) // 5
+            if stream.offset < note_count:
+                self.osc_server.send("/live/clip/get/notes/page",
+                                     (*stream.clip_ids, *get_notes_page(stream.notes, stream.offset, stream.page_size)),
+                                     stream.remote_addr)
+                stream.offset += stream.page_size
+                pages_sent += 1
+            if stream.offset >= note_count:
+                self.osc_server.send("/live/clip/get/notes/end",
+                                     (*stream.clip_ids, note_count, stream.hash),
+                                     stream.remote_addr)
+                self._note_streams.popleft()
 
     def init_api(self):
         def create_clip_callback(func, *args, pass_clip_index=False):
@@ -51,8 +622,7 @@ class ClipHandler(AbletonOSCHandler):
                 # numeric arguments as float.
                 #--------------------------------------------------------------------------------
                 track_index, clip_index = int(params[0]), int(params[1])
-                track = self.song.tracks[track_index]
-                clip = track.clip_slots[clip_index].clip
+                clip = self.resolver.get_clip(track_index, clip_index)
                 if pass_clip_index:
                     rv = func(clip, *args, tuple(params[0:]))
                 else:
@@ -150,17 +720,82 @@ class ClipHandler(AbletonOSCHandler):
                                         create_clip_callback(self._set_property, prop))
 
         def clip_get_notes(clip, params: Tuple[Any] = ()):
+            params, packed = split_packed_flag(params)
             if len(params) == 4:
                 pitch_start, pitch_span, time_start, time_span = params
+                all_note_attributes = get_note_attributes(clip.get_notes_extended(pitch_start, pitch_span,
+                                                                                  time_start, time_span))
             elif len(params) == 0:
-                pitch_start, pitch_span, time_start, time_span = 0, 127, -8192, 16384
+                #--------------------------------------------------------------------------------
+                # Queries for all of a clip's notes are served from its snapshot.
+                #--------------------------------------------------------------------------------
+                all_note_attributes = self._get_note_snapshot(clip).notes
             else:
                 raise ValueError("Invalid number of arguments for /clip/get/notes. Either 0 or 4 arguments must be passed.")
-            notes = clip.get_notes_extended(pitch_start, pitch_span, time_start, time_span)
-            all_note_attributes = []
-            for note in notes:
-                all_note_attributes += [note.pitch, note.start_time, note.duration, note.velocity, note.mute]
-            return tuple(all_note_attributes)
+            if packed:
+                return pack_note_attributes(all_note_attributes)
+            return all_note_attributes
+
+        def clip_get_notes_page(clip, params: Tuple[Any] = ()):
+            if len(params) != 2:
+                raise ValueError("Invalid number of arguments for /clip/get/notes/page. offset and limit must be passed.")
+            offset, limit = int(params[0]), int(params[1])
+            return get_notes_page(self._get_note_snapshot(clip).notes, offset, limit)
+
+        def clip_get_notes_stream(clip, params: Tuple[Any] = ()):
+            """
+            Start streaming all of the notes of a clip to the client, across several ticks,
+            as /live/clip/get/notes/page messages followed by /live/clip/get/notes/end.
+            """
+            track_index, clip_index, *params = params
+            page_size = int(params[0]) if params else OSC_NOTE_STREAM_PAGE_SIZE
+            if page_size <= 0:
+                raise ValueError("Page size for /clip/get/notes/stream must be positive (got %d)" % page_size)
+            self._note_streams.append(NoteStream(self.osc_server.remote_addr,
+                                                 (track_index, clip_index),
+                                                 clip,
+                                                 page_size))
+
+        def clip_get_notes_hash(clip, params: Tuple[Any] = ()):
+            return self._get_note_snapshot(clip).hash,
+
+        def clip_start_listen_notes(clip, params: Tuple[Any] = ()):
+            """
+            Start listening for changes to the notes of a clip. Each time the notes change,
+            /live/clip/get/notes/hash and /live/clip/get/notes are sent with the new notes.
+            """
+            params, throttle = self._split_listen_params(params)
+            listener_key = ("notes", params)
+            #--------------------------------------------------------------------------------
+            # The hash of the notes last sent to each subscriber, so that a subscriber whose
+            # update was dropped by its throttle is still sent the change later.
+            #--------------------------------------------------------------------------------
+            last_hashes = {}
+
+            def send_notes(snapshot, recipients):
+                for remote_addr in recipients:
+                    if last_hashes.get(remote_addr) == snapshot.hash:
+                        continue
+                    last_hashes[remote_addr] = snapshot.hash
+                    self.osc_server.send_update("/live/clip/get/notes/hash", params, (snapshot.hash,), remote_addr)
+                    self.osc_server.send_update("/live/clip/get/notes", params, snapshot.notes, remote_addr)
+
+            def notes_changed_callback():
+                #--------------------------------------------------------------------------------
+                # Invalidate the snapshot first, as this may be called before the snapshot's
+                # own listener. Live can report changes that leave the notes unchanged, which
+                # are detected by comparing hashes.
+                #--------------------------------------------------------------------------------
+                self._invalidate_note_snapshot(clip)
+                snapshot = self._get_note_snapshot(clip)
+                if any(last_hashes.get(client) != snapshot.hash for client in self.listener_clients.get(listener_key, {})):
+                    send_notes(snapshot, self._get_listener_recipients(listener_key, (snapshot.hash,)))
+
+            self.logger.info("Adding listener for clip %s, property: notes" % str(params))
+            self._add_listener(listener_key, clip, "notes", notes_changed_callback, throttle)
+            remote_addr = self.osc_server.remote_addr
+            snapshot = self._get_note_snapshot(clip)
+            send_notes(snapshot, self._get_listener_recipients(listener_key, (snapshot.hash,), remote_addr))
 
         def clip_add_notes(clip, params: Tuple[Any] = ()):
             notes = []
@@ -184,28 +819,178 @@ class ClipHandler(AbletonOSCHandler):
             clip.remove_notes_extended(pitch_start, pitch_span, time_start, time_span)
 
         self.osc_server.add_handler("/live/clip/get/notes", create_clip_callback(clip_get_notes))
+        self.osc_server.add_handler("/live/clip/get/notes/hash", create_clip_callback(clip_get_notes_hash))
+        self.osc_server.add_handler("/live/clip/get/notes/page", create_clip_callback(clip_get_notes_page))
+        self.osc_server.add_handler("/live/clip/get/notes/stream",
+                                    create_clip_callback(clip_get_notes_stream, pass_clip_index=True))
+        self.osc_server.add_handler("/live/clip/start_listen/notes",
+                                    create_clip_callback(clip_start_listen_notes, pass_clip_index=True))
+        self.osc_server.add_handler("/live/clip/stop_listen/notes",
+                                    create_clip_callback(self._stop_listen, "notes", pass_clip_index=True))
         self.osc_server.add_handler("/live/clip/add/notes", create_clip_callback(clip_add_notes))
         self.osc_server.add_handler("/live/clip/remove/notes", create_clip_callback(clip_remove_notes))
 
-        def clips_filter_handler(params: Tuple):
-            # TODO: Pre-cache clip notes
-            if len(self._clip_notes_cache) == 0:
-                self.logger.warning("Building clip notes cache...")
-                self._build_clip_name_cache()
+        #--------------------------------------------------------------------------------
+        # Columnar note transfer.
+        #
+        # Notes are sent as one column per attribute, rather than interleaved per note.
+        # Columns are either sent as packed-mode blobs (one blob per column), or as plain
+        # params, prefixed by the number of notes: count, [column 0...], [column 1...], ...
+        #--------------------------------------------------------------------------------
+        note_columns = [("note_id", "i"),
+                        ("pitch", "i"),
+                        ("start_time", "f"),
+                        ("duration", "f"),
+                        ("velocity", "f"),
+                        ("mute", "i"),
+                        ("probability", "f"),
+                        ("velocity_deviation", "f"),
+                        ("release_velocity", "f")]
+        #--------------------------------------------------------------------------------
+        # The columns accepted by add, which can omit the trailing extended attributes.
+        #--------------------------------------------------------------------------------
+        add_note_columns = note_columns[1:]
+        add_note_columns_required = 5
+
+        def read_note_columns(params: Tuple[Any]):
+            """
+            Returns the columns of a columnar note request, as a list of sequences of values.
+            """
+            if params and isinstance(params[0], bytes):
+                columns = [unpack_column(blob) for blob in params]
             else:
-                self.logger.warning("Found existing clip notes cache (len = %d)" % len(self._clip_notes_cache))
-            note_indices = [note_name_to_midi(name) for name in params]
-
-            self.logger.warning("Got note indices: %s" % note_indices)
-            for track_index, track in enumerate(self.song.tracks):
-                for clip_slot_index, clip_slot in enumerate(track.clip_slots):
-                    clip_notes_list = self._clip_notes_cache[track_index][clip_slot_index]
-                    if clip_notes_list:
-                        clip = clip_slot.clip
-                        if all(note in note_indices for note in clip_notes_list):
-                            clip.muted = False
-                        else:
-                            clip.muted = True
+                count = int(params[0]) if params else 0
+                values = params[1:]
+                if count == 0 or len(values) % count != 0:
+                    raise ValueError("Columnar notes must be: count, [column values...] (got %d values for %d notes)" %
+                                     (len(values), count))
+                columns = [values[offset:offset + count] for offset in range(0, len(values), count)]
+            if len(set(len(column) for column in columns)) > 1:
+                raise ValueError("Columnar notes must all have the same number of values")
+            return columns
+
+        def clip_get_notes_columns(clip, params: Tuple[Any] = ()):
+            params, packed = split_packed_flag(params)
+            if len(params) == 4:
+                pitch_start, pitch_span, time_start, time_span = params
+            elif len(params) == 0:
+                pitch_start, pitch_span, time_start, time_span = 0, 127, -8192, 16384
+            else:
+                raise ValueError("Invalid number of arguments for /clip/get/notes/columns. Either 0 or 4 arguments must be passed.")
+            notes = clip.get_notes_extended(pitch_start, pitch_span, time_start, time_span)
+            if packed:
+                return tuple(pack_column((getattr(note, name) for note in notes), type_code)
+                             for name, type_code in note_columns)
+            rv = [len(notes)]
+            for name, _ in note_columns:
+                rv += [getattr(note, name) for note in notes]
+            return tuple(rv)
+
+        def clip_add_notes_columns(clip, params: Tuple[Any] = ()):
+            columns = read_note_columns(params)
+            if not add_note_columns_required <= len(columns) <= len(add_note_columns):
+                raise ValueError("Invalid number of columns for /clip/add/notes/columns: expected %d to %d (got %d)" %
+                                 (add_note_columns_required, len(add_note_columns), len(columns)))
+            names = [name for name, _ in add_note_columns[:len(columns)]]
+            #--------------------------------------------------------------------------------
+            # Cast each column to the type expected by MidiNoteSpecification, as ints and
+            # floats are interchangeable in plain params, and mute is packed as an int.
+            #--------------------------------------------------------------------------------
+            columns = [list(map(bool if name == "mute" else int if type_code == "i" else float, column))
+                       for (name, type_code), column in zip(add_note_columns, columns)]
+            notes = tuple(Live.Clip.MidiNoteSpecification(**dict(zip(names, values)))
+                          for values in zip(*columns))
+            clip.add_new_notes(notes)
+
+        def clip_remove_notes_columns(clip, params: Tuple[Any] = ()):
+            #--------------------------------------------------------------------------------
+            # A single column of note IDs, as a packed blob or as plain params.
+            #--------------------------------------------------------------------------------
+            if params and isinstance(params[0], bytes):
+                note_ids = unpack_column(params[0])
+            else:
+                note_ids = params
+            clip.remove_notes_by_id([int(note_id) for note_id in note_ids])
+
+        #--------------------------------------------------------------------------------
+        # Incremental note editing by note ID.
+        #
+        # Notes are identified by the note_id returned by /live/clip/get/notes/columns,
+        # and given as (note_id, pitch, start_time, duration, velocity, mute) tuples.
+        #--------------------------------------------------------------------------------
+        def clip_get_notes_by_id(clip, params: Tuple[Any] = ()):
+            notes = clip.get_notes_by_id([int(note_id) for note_id in params])
+            all_note_attributes = []
+            for note in notes:
+                all_note_attributes += [note.note_id, note.pitch, note.start_time, note.duration, note.velocity, note.mute]
+            return tuple(all_note_attributes)
+
+        def clip_modify_notes(clip, params: Tuple[Any] = ()):
+            """
+            Modify existing notes in a single apply_note_modifications() call, preserving their
+            note IDs. Any attribute given as None (OSC nil) is left unchanged.
+            """
+            if len(params) % 6 != 0:
+                raise ValueError("Invalid number of arguments for /clip/modify/notes. Notes must be passed as "
+                                 "(note_id, pitch, start_time, duration, velocity, mute) tuples.")
+            modifications = {}
+            for offset in range(0, len(params), 6):
+                modifications[int(params[offset])] = params[offset + 1:offset + 6]
+            notes = clip.get_notes_by_id(list(modifications.keys()))
+            for note in notes:
+                pitch, start_time, duration, velocity, mute = modifications[note.note_id]
+                if pitch is not None:
+                    note.pitch = int(pitch)
+                if start_time is not None:
+                    note.start_time = float(start_time)
+                if duration is not None:
+                    note.duration = float(duration)
+                if velocity is not None:
+                    note.velocity = float(velocity)
+                if mute is not None:
+                    note.mute = bool(mute)
+            clip.apply_note_modifications(notes)
+
+        #--------------------------------------------------------------------------------
+        # Bulk note transforms, applied to a single clip, or to every MIDI clip within a
+        # range of tracks and scenes.
+        #--------------------------------------------------------------------------------
+        def transform_clip_notes(clip, transform, params: Tuple[Any]):
+            notes = clip.get_all_notes_extended()
+            transform(notes, params)
+            clip.apply_note_modifications(notes)
+
+        def create_clips_transform_callback(transform):
+            def clips_transform_callback(params: Tuple[Any]):
+                if len(params) < 4:
+                    raise ValueError("Transforms of a range of clips must be passed: "
+                                     "track_start, track_end, scene_start, scene_end, [params...]")
+                track_start, track_end, scene_start, scene_end = (int(param) for param in params[:4])
+                for track_index in range(len(self.resolver.tracks))[track_start:track_end]:
+                    for clip_slot in self.resolver.get_clip_slots(track_index)[scene_start:scene_end]:
+                        if clip_slot.has_clip and clip_slot.clip.is_midi_clip:
+                            transform_clip_notes(clip_slot.clip, transform, tuple(params[4:]))
+            return clips_transform_callback
+
+        for transform_name, transform in note_transforms.items():
+            self.osc_server.add_handler("/live/clip/transform/notes/%s" % transform_name,
+                                        create_clip_callback(transform_clip_notes, transform))
+            self.osc_server.add_handler("/live/clips/transform/notes/%s" % transform_name,
+                                        create_clips_transform_callback(transform))
+
+        self.osc_server.add_handler("/live/clip/get/notes/by_id", create_clip_callback(clip_get_notes_by_id))
+        self.osc_server.add_handler("/live/clip/modify/notes", create_clip_callback(clip_modify_notes))
+
+        self.osc_server.add_handler("/live/clip/get/notes/columns", create_clip_callback(clip_get_notes_columns))
+        self.osc_server.add_handler("/live/clip/add/notes/columns", create_clip_callback(clip_add_notes_columns))
+        self.osc_server.add_handler("/live/clip/remove/notes/columns", create_clip_callback(clip_remove_notes_columns))
+
+        def clips_filter_handler(params: Tuple):
+            if not self._clip_index.is_built:
+                self.logger.info("Building clip index...")
+            note_indices = set(note_name_to_midi(name) for name in params)
+            changed_count = self._clip_index.filter(note_indices)
+            self.logger.info("Filtered clips by notes %s (%d clips changed)" % (sorted(note_indices, key=str), changed_count))
 
         self.osc_server.add_handler("/live/clips/filter", clips_filter_handler)
 
@@ -222,19 +1007,109 @@ class ClipHandler(AbletonOSCHandler):
 
         self.osc_server.add_handler("/live/clips/unfilter", clips_unfilter_handler)
 
-    def _build_clip_name_cache(self):
-        regex = "([_-])([A-G][A-G#b1-9-]*)$"
-        for track_index, track in enumerate(self.song.tracks):
-            self._clip_notes_cache.append([])
-            for clip_slot_index, clip_slot in enumerate(track.clip_slots):
-                self._clip_notes_cache[-1].append([])
-                if clip_slot.has_clip:
-                    clip = clip_slot.clip
-                    clip_name = clip.name
-                    match = re.search(regex, clip_name)
-                    if match:
-                        clip_notes_str = match.group(2)
-                        clip_notes_str = re.sub("[1-9]", "", clip_notes_str)
-                        clip_notes_list = clip_notes_str.split("-")
-                        clip_notes_list = [note_name_to_midi(name) for name in clip_notes_list]
-                        self._clip_notes_cache[-1][-1] = clip_notes_list
\ No newline at end of file
+        def clips_select_handler(params: Tuple):
+            bits = self._clip_index.select(parse_clip_predicates(params))
+            positions = []
+            for bit in iter_bits(bits):
+                positions += self._clip_index.get_position(bit)
+            return tuple(positions)
+
+        def clips_apply_handler(params: Tuple):
+            action = params[0] if len(params) > 0 else None
+            if action not in clip_action_arity:
+                raise ValueError("Unknown clip action: %s (expected one of: %s)" %
+                                 (action, ", ".join(clip_action_arity.keys())))
+            arity = clip_action_arity[action]
+            action_params = tuple(params[1:1 + arity])
+            if len(action_params) != arity:
+                raise ValueError("Clip action %s takes %d value(s)" % (action, arity))
+            bits = self._clip_index.select(parse_clip_predicates(params[1 + arity:]))
+            return (self._clip_index.apply(bits, action, action_params),)
+
+        self.osc_server.add_handler("/live/clips/select", clips_select_handler)
+        self.osc_server.add_handler("/live/clips/apply", clips_apply_handler)
+
+    #--------------------------------------------------------------------------------
+    # Note snapshots.
+    #
+    # The notes of each clip queried are cached, and invalidated by the clip's notes
+    # listener, so that repeated queries of an unchanged clip don't re-read its notes.
+    #--------------------------------------------------------------------------------
+    def _get_note_snapshot(self, clip) -> NoteSnapshot:
+        """
+        Returns the NoteSnapshot of `clip`, re-reading its notes if they have changed.
+        """
+        snapshot = self._note_snapshots.get(clip._live_ptr)
+        if snapshot is not None and snapshot.clip != clip:
+            #--------------------------------------------------------------------------------
+            # The clip has been deleted, and its address reused by a new clip.
+            #--------------------------------------------------------------------------------
+            self._remove_note_snapshot(clip._live_ptr)
+            snapshot = None
+        if snapshot is None:
+            while len(self._note_snapshots) >= OSC_MAX_NOTE_SNAPSHOTS:
+                self._remove_note_snapshot(next(iter(self._note_snapshots)))
+            snapshot = self._note_snapshots[clip._live_ptr] = NoteSnapshot(clip, None)
+
+            def notes_changed_callback():
+                snapshot.notes = None
+            snapshot.listener = notes_changed_callback
+            clip.add_notes_listener(notes_changed_callback)
+
+            #--------------------------------------------------------------------------------
+            # Session clips are discarded when their slot's clip is deleted or replaced.
+            # Listeners can't be removed from within a notification, so the snapshot is
+            # discarded on the next tick.
+            #--------------------------------------------------------------------------------
+            clip_slot = clip.canonical_parent
+            if hasattr(clip_slot, "add_has_clip_listener"):
+                live_ptr = clip._live_ptr
+
+                def has_clip_changed_callback():
+                    snapshot.notes = None
+                    self._removed_note_snapshots.append((live_ptr, snapshot))
+                snapshot.clip_slot = clip_slot
+                snapshot.slot_listener = has_clip_changed_callback
+                clip_slot.add_has_clip_listener(has_clip_changed_callback)
+        else:
+            self._note_snapshots.move_to_end(clip._live_ptr)
+        if snapshot.notes is None:
+            snapshot.notes = get_note_attributes(clip.get_notes_extended(0, 127, -8192, 16384))
+            snapshot.hash = get_notes_hash(snapshot.notes)
+        return snapshot
+
+    def _invalidate_note_snapshot(self, clip) -> None:
+        snapshot = self._note_snapshots.get(clip._live_ptr)
+        if snapshot is not None:
+            snapshot.notes = None
+
+    def _remove_note_snapshot(self, live_ptr) -> None:
+        snapshot = self._note_snapshots.pop(live_ptr)
+        listeners = [(snapshot.clip, "notes", snapshot.listener)]
+        if snapshot.clip_slot is not None:
+            listeners.append((snapshot.clip_slot, "has_clip", snapshot.slot_listener))
+        for target, prop, listener in listeners:
+            try:
+                getattr(target, "remove_%s_listener" % prop)(listener)
+            except Exception as e:
+                #--------------------------------------------------------------------------------
+                # Benign if the clip has since been deleted (see _remove_listener).
+                #--------------------------------------------------------------------------------
+                self.logger.info("Exception whilst removing %s listener (likely benign): %s" % (prop, e))
+
+    def _discard_removed_note_snapshots(self) -> None:
+        """
+        Discard the snapshots of clips that have been deleted since the last tick.
+        """
+        for live_ptr, snapshot in self._removed_note_snapshots:
+            #--------------------------------------------------------------------------------
+            # The snapshot may already have been replaced by that of a new clip.
+            #--------------------------------------------------------------------------------
+            if self._note_snapshots.get(live_ptr) is snapshot:
+                self._remove_note_snapshot(live_ptr)
+        self._removed_note_snapshots = []
+
+    def _clear_note_snapshots(self) -> None:
+        for live_ptr in list(self._note_snapshots.keys()):
+            self._remove_note_snapshot(live_ptr)
+        self._removed_note_snapshots = []
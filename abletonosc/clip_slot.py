@@ -5,13 +5,13 @@ class ClipSlotHandler(AbletonOSCHandler):
     def __init__(self, manager):
         super().__init__(manager)
         self.class_identifier = "clip_slot"
+        self.listener_id_count = 2
 
     def init_api(self):
         def create_clip_slot_callback(func, *args, pass_clip_index=False):
             def clip_slot_callback(params: Tuple[Any]):
                 track_index, clip_index = int(params[0]), int(params[1])
-                track = self.song.tracks[track_index]
-                clip_slot = track.clip_slots[clip_index]
+                clip_slot = self.resolver.get_clip_slot(track_index, clip_index)
 
                 if pass_clip_index:
                     rv = func(clip_slot, *args, tuple(params[0:]))
@@ -60,8 +60,7 @@ class ClipSlotHandler(AbletonOSCHandler):
 
         def duplicate_clip_slot(clip_slot, args):
             target_track_index, target_clip_index = tuple(args)
-            track = self.song.tracks[target_track_index]
-            target_clip_slot = track.clip_slots[target_clip_index]
+            target_clip_slot = self.resolver.get_clip_slot(target_track_index, target_clip_index)
             clip_slot.duplicate_clip_to(target_clip_slot)
 
         self.osc_server.add_handler("/live/clip_slot/duplicate_clip_to", create_clip_slot_callback(duplicate_clip_slot))
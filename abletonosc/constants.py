@@ -4,3 +4,62 @@
 
 OSC_LISTEN_PORT = 11000
 OSC_RESPONSE_PORT = 11001
+
+#--------------------------------------------------------------------------------
+# Limits on the work done by OSCServer.process() in a single tick.
+# Datagrams that cannot be handled within the time budget or message cap are
+# kept in a queue and handled on subsequent ticks, so that a burst of incoming
+# messages doesn't block Live's main thread.
+#--------------------------------------------------------------------------------
+OSC_TICK_TIME_BUDGET = 0.02
+OSC_TICK_MAX_MESSAGES = 500
+OSC_MAX_PENDING_MESSAGES = 10000
+
+#--------------------------------------------------------------------------------
+# Outgoing messages are queued and sent once per tick, packed into OSC bundles
+# of at most this many bytes (an Ethernet MTU, less IP and UDP headers).
+#--------------------------------------------------------------------------------
+OSC_MAX_BUNDLE_SIZE = 1472
+
+#--------------------------------------------------------------------------------
+# A message to a UDP client larger than this many bytes is split into chunks,
+# sent to OSC_CHUNK_ADDRESS, which the client reassembles (see OSCServer.send).
+#--------------------------------------------------------------------------------
+OSC_MAX_DATAGRAM_SIZE = 8192
+OSC_CHUNK_ADDRESS = "/live/chunk"
+
+#--------------------------------------------------------------------------------
+# Streamed note queries (/live/clip/get/notes/stream) send notes in pages of up
+# to OSC_NOTE_STREAM_PAGE_SIZE notes, sending at most OSC_NOTE_STREAM_PAGES_PER_TICK
+# pages per tick. A page of 256 notes fits within OSC_MAX_DATAGRAM_SIZE.
+#--------------------------------------------------------------------------------
+OSC_NOTE_STREAM_PAGE_SIZE = 256
+OSC_NOTE_STREAM_PAGES_PER_TICK = 8
+
+#--------------------------------------------------------------------------------
+# Maximum number of clips whose notes are cached for repeated queries. The least
+# recently queried clip's notes are discarded when the cache is full.
+#--------------------------------------------------------------------------------
+OSC_MAX_NOTE_SNAPSHOTS = 64
+
+#--------------------------------------------------------------------------------
+# Clients that send /live/api/heartbeat are expected to keep sending messages.
+# If no message is received from such a client for this many seconds, its
+# listeners are removed.
+#--------------------------------------------------------------------------------
+OSC_HEARTBEAT_TIMEOUT = 5.0
+
+#--------------------------------------------------------------------------------
+# Clients can also connect over TCP, with packets framed using SLIP as per OSC 1.1,
+# if OSC_STREAM_LISTEN_ADDR is set to the address to accept connections on (e.g.
+# ("127.0.0.1", OSC_LISTEN_PORT)). The TCP listener is disabled by default.
+#
+# Replies are sent over the same connection, in bundles of up to
+# OSC_MAX_STREAM_BUNDLE_SIZE bytes. A connection whose unsent replies exceed
+# OSC_MAX_STREAM_BUFFER_SIZE bytes, or that sends more than
+# OSC_MAX_STREAM_RECV_BUFFER_SIZE bytes without completing a frame, is closed.
+#--------------------------------------------------------------------------------
+OSC_STREAM_LISTEN_ADDR = None
+OSC_MAX_STREAM_BUNDLE_SIZE = 65536
+OSC_MAX_STREAM_BUFFER_SIZE = 16 * 1024 * 1024
+OSC_MAX_STREAM_RECV_BUFFER_SIZE = 4 * 1024 * 1024
@@ -1,5 +1,6 @@
 from typing import Tuple, Any
 from .handler import AbletonOSCHandler
+from .packed import split_packed_flag, pack_column
 
 class DeviceHandler(AbletonOSCHandler):
     def __init__(self, manager):
@@ -10,7 +11,7 @@ class DeviceHandler(AbletonOSCHandler):
         def create_device_callback(func, *args, include_ids: bool = False):
             def device_callback(params: Tuple[Any]):
                 track_index, device_index = int(params[0]), int(params[1])
-                device = self.song.tracks[track_index].devices[device_index]
+                device = self.resolver.get_device(track_index, device_index)
                 if (include_ids):
                     rv = func(device, *args, params[0:])
                 else:
@@ -56,6 +57,9 @@ class DeviceHandler(AbletonOSCHandler):
             return tuple(parameter.name for parameter in device.parameters)
 
         def device_get_parameters_value(device, params: Tuple[Any] = ()):
+            params, packed = split_packed_flag(params)
+            if packed:
+                return pack_column(parameter.value for parameter in device.parameters),
             return tuple(parameter.value for parameter in device.parameters)
 
         def device_get_parameters_min(device, params: Tuple[Any] = ()):
@@ -95,35 +99,36 @@ class DeviceHandler(AbletonOSCHandler):
             return param_index, device.parameters[param_index].str_for_value(device.parameters[param_index].value)
         
         def device_get_parameter_value_listener(device, params: Tuple[Any] = ()):
-
-            def property_changed_callback():
-                value = device.parameters[params[2]].value
+            params, throttle = self._split_listen_params(params, id_count=3)
+            parameter = device.parameters[params[2]]
+            value_address, key = self._get_listener_address("/live/device/get/parameter/value", params)
+            value_string_address, _ = self._get_listener_address("/live/device/get/parameter/value_string", params)
+            listener_key = self._get_listener_key('device_parameter_value', key)
+
+            def send_parameter_value(remote_addrs):
+                if not remote_addrs:
+                    return
+                value = parameter.value
                 self.logger.info("Property %s changed of %s %s: %s" % ('value', 'device parameter', str(params), value))
-                self.osc_server.send("/live/device/get/parameter/value", (*params, value,))
-
-                value_string = device.parameters[params[2]].str_for_value(device.parameters[params[2]].value)
+                value_string = parameter.str_for_value(value)
                 self.logger.info("Property %s changed of %s %s: %s" % ('value_string', 'device parameter', str(params), value_string))
-                self.osc_server.send("/live/device/get/parameter/value_string", (*params, value_string,))
+                for remote_addr in remote_addrs:
+                    self.osc_server.send_update(value_address, key, (value,), remote_addr)
+                    self.osc_server.send_update(value_string_address, key, (value_string,), remote_addr)
 
-            listener_key = ('device_parameter_value', tuple(params))
-            if listener_key in self.listener_functions:
-               device_get_parameter_remove_value_listener(device, params)
+            def property_changed_callback():
+                send_parameter_value(self._get_listener_recipients(listener_key, (parameter.value,)))
 
             self.logger.info("Adding listener for %s %s, property: %s" % ('device parameter', str(params), 'value'))
-            device.parameters[params[2]].add_value_listener(property_changed_callback)
-            self.listener_functions[listener_key] = property_changed_callback
+            self._add_listener(listener_key, parameter, "value", property_changed_callback, throttle)
 
-            property_changed_callback()
+            remote_addr = self.osc_server.remote_addr
+            send_parameter_value(self._get_listener_recipients(listener_key, (parameter.value,), remote_addr))
 
         def device_get_parameter_remove_value_listener(device, params: Tuple[Any] = ()):
-            listener_key = ('device_parameter_value', tuple(params))
-            if listener_key in self.listener_functions:
-                self.logger.info("Removing listener for %s %s, property %s" % (self.class_identifier, str(params), 'value'))
-                listener_function = self.listener_functions[listener_key]
-                device.parameters[params[2]].remove_value_listener(listener_function)
-                del self.listener_functions[listener_key]
-            else:
-                self.logger.warning("No listener function found for property: %s (%s)" % (prop, str(params)))
+            _, key = self._get_listener_address(None, tuple(params)[:3])
+            self._remove_listener_client(self._get_listener_key('device_parameter_value', key),
+                                         self.osc_server.remote_addr)
 
         def device_set_parameter_value(device, params: Tuple[Any] = ()):
             param_index, param_value = params[:2]
@@ -163,3 +168,12 @@ class DeviceHandler(AbletonOSCHandler):
 
         self.osc_server.add_handler("/live/device/view/get/is_collapsed", create_device_callback(device_view_get_is_collapsed))
         self.osc_server.add_handler("/live/device/view/set/is_collapsed", create_device_callback(device_view_set_is_collapsed))
+
+        #--------------------------------------------------------------------------------
+        # Stable device IDs, and /live/device@id/... addresses (see _add_id_handlers)
+        #--------------------------------------------------------------------------------
+        def device_get_id(device, _):
+            return self.resolver.get_object_id("device", device),
+
+        self.osc_server.add_handler("/live/device/get/id", create_device_callback(device_get_id))
+        self._add_id_handlers("device")
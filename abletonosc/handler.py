@@ -1,7 +1,62 @@
 from ableton.v2.control_surface.component import Component
 from typing import Optional, Tuple, Any
 import logging
+import time
 from .osc_server import OSCServer
+from .resolver import ObjectResolver
+
+class ListenerThrottle:
+    def __init__(self, max_rate: float = 0.0, min_delta: float = 0.0):
+        """
+        Decides whether a listener update should be sent, dropping updates that follow the
+        previous update too closely or that change its value by too little.
+
+        An update dropped because it follows the previous update too closely is kept as
+        pending, so that the latest value is sent once max_rate allows (see is_pending_due).
+
+        Args:
+            max_rate: The maximum number of updates to send per second. 0 = unlimited.
+            min_delta: The minimum change in a numeric value for an update to be sent.
+                       0 = send every change.
+        """
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.min_delta = min_delta
+        self.last_time = None
+        self.last_value = None
+        self.pending_value = None
+
+    def should_send(self, value: Tuple) -> bool:
+        now = time.monotonic()
+        if self.last_time is not None:
+            if now - self.last_time < self.min_interval:
+                self.pending_value = value
+                return False
+            if self.min_delta > 0 and not self._has_changed(value):
+                self.pending_value = None
+                return False
+        self.last_time = now
+        self.last_value = value
+        self.pending_value = None
+        return True
+
+    def is_pending_due(self) -> bool:
+        """
+        Returns True if an update was dropped by max_rate, and the minimum interval since
+        the last update sent has now passed.
+        """
+        return self.pending_value is not None and time.monotonic() - self.last_time >= self.min_interval
+
+    def _has_changed(self, value: Tuple) -> bool:
+        if len(value) != len(self.last_value):
+            return True
+        for new, old in zip(value, self.last_value):
+            if isinstance(new, (int, float)) and isinstance(old, (int, float)) and \
+                    not isinstance(new, bool) and not isinstance(old, bool):
+                if abs(new - old) >= self.min_delta:
+                    return True
+            elif new != old:
+                return True
+        return False
 
 class AbletonOSCHandler(Component):
     def __init__(self, manager):
@@ -10,10 +65,26 @@ class AbletonOSCHandler(Component):
         self.logger = logging.getLogger("abletonosc")
         self.manager = manager
         self.osc_server: OSCServer = self.manager.osc_server
+        self.resolver: ObjectResolver = self.manager.resolver
+        #--------------------------------------------------------------------------------
+        # (kind, object_id, index_count) of the @id request being handled, if any.
+        #--------------------------------------------------------------------------------
+        self._id_request = None
         self.init_api()
         self.listener_functions = {}
         self.listener_objects = {}
+        self.listener_clients = {}
+        #--------------------------------------------------------------------------------
+        # If set, the only clients that listener callbacks send updates to (see
+        # _send_pending_updates).
+        #--------------------------------------------------------------------------------
+        self._pending_update_clients = None
         self.class_identifier = None
+        #--------------------------------------------------------------------------------
+        # The number of leading params of a start_listen/stop_listen request that identify
+        # the object being listened to (e.g. track_index). Any further params are options.
+        #--------------------------------------------------------------------------------
+        self.listener_id_count = 0
 
     def init_api(self):
         pass
@@ -21,6 +92,14 @@ class AbletonOSCHandler(Component):
     def clear_api(self):
         self._clear_listeners()
 
+    def tick(self):
+        """
+        Called once per tick, after incoming OSC messages have been processed. Handlers can
+        override this to spread long-running work across ticks, calling this method to send
+        the updates of throttled listeners. Messages sent are flushed at the end of the tick.
+        """
+        self._send_pending_updates()
+
     #--------------------------------------------------------------------------------
     # Generic callbacks
     #--------------------------------------------------------------------------------
@@ -44,10 +123,30 @@ class AbletonOSCHandler(Component):
         self.logger.info("Getting property for %s: %s = %s" % (self.class_identifier, prop, value))
         return (value, *params)
 
+    def _split_listen_params(self, params: Tuple[Any], id_count: Optional[int] = None) -> Tuple[Tuple, ListenerThrottle]:
+        """
+        Split the params of a start_listen request into the params identifying the object
+        (e.g. track_index), and a ListenerThrottle built from the optional params that follow:
+
+            [max_rate, [min_delta]]
+
+        Args:
+            params: The request params.
+            id_count: The number of identifying params. Defaults to self.listener_id_count.
+        """
+        if id_count is None:
+            id_count = self.listener_id_count
+        params = tuple(params)
+        options = params[id_count:]
+        if len(options) > 2:
+            raise ValueError("Listener options must be: [max_rate, [min_delta]] (got %s)" % str(options))
+        return params[:id_count], ListenerThrottle(*(float(option) for option in options))
+
     def _start_listen(self, target, prop, params: Optional[Tuple] = (), getter = None) -> None:
         """
         Start listening for the property named `prop` on the Live object `target`.
-        `params` is typically a tuple containing the track/clip index.
+        `params` is typically a tuple containing the track/clip index, optionally followed
+        by a maximum update rate (in Hz) and the minimum change in value to report.
 
         getter can be used for a customer getter when we're accessing native objects
         e.g. in view.py we don't return the selected_scene, but the selected_scene index.
@@ -58,59 +157,211 @@ class AbletonOSCHandler(Component):
             params:
             getter:
         """
-        def property_changed_callback():
+        index_params, throttle = self._split_listen_params(params)
+        osc_address, params = self._get_listener_address("/live/%s/get/%s" % (self.class_identifier, prop),
+                                                         index_params)
+        listener_key = self._get_listener_key(prop, params)
+
+        def get_value():
             if getter is None:
                 value = getattr(target, prop)
             else:
-                value = getter(params)
+                value = getter(index_params)
             if type(value) is not tuple:
                 value = (value,)
-            self.logger.info("Property %s changed of %s %s: %s" % (prop, self.class_identifier, str(params), value))
-            osc_address = "/live/%s/get/%s" % (self.class_identifier, prop)
-            self.osc_server.send(osc_address, (*params, *value,))
+            return value
 
-        listener_key = (prop, tuple(params))
-        if listener_key in self.listener_functions:
-            self._stop_listen(target, prop, params)
+        def property_changed_callback():
+            value = get_value()
+            recipients = self._get_listener_recipients(listener_key, value)
+            if recipients:
+                self.logger.info("Property %s changed of %s %s: %s" % (prop, self.class_identifier, str(params), value))
+            for remote_addr in recipients:
+                self.osc_server.send_update(osc_address, params, value, remote_addr)
 
         self.logger.info("Adding listener for %s %s, property: %s" % (self.class_identifier, str(params), prop))
-        add_listener_function_name = "add_%s_listener" % prop
-        add_listener_function = getattr(target, add_listener_function_name)
-        add_listener_function(property_changed_callback)
-        self.listener_functions[listener_key] = property_changed_callback
-        self.listener_objects[listener_key] = target
+        self._add_listener(listener_key, target, prop, property_changed_callback, throttle)
         #--------------------------------------------------------------------------------
-        # Immediately send the current value
+        # Immediately send the current value to the client that requested it
         #--------------------------------------------------------------------------------
-        property_changed_callback()
+        remote_addr = self.osc_server.remote_addr
+        value = get_value()
+        if remote_addr in self._get_listener_recipients(listener_key, value, remote_addr):
+            self.osc_server.send_update(osc_address, params, value, remote_addr)
 
     def _stop_listen(self, target, prop, params: Optional[Tuple[Any]] = ()) -> None:
-        listener_key = (prop, tuple(params))
+        _, params = self._get_listener_address(None, tuple(params)[:self.listener_id_count])
+        self._remove_listener_client(self._get_listener_key(prop, params), self.osc_server.remote_addr)
+
+    #--------------------------------------------------------------------------------
+    # ID addressing.
+    #
+    # Each index-addressed endpoint of an object kind (e.g. /live/track/get/name,
+    # with params track_index, ...) is also registered with an @id address (e.g.
+    # /live/track@id/get/name, with params track_id, ...), which takes the object's
+    # stable ID in place of its indices (see ObjectResolver.get_object_id). Replies
+    # and listener updates are sent to the @id address, keyed by ID.
+    #--------------------------------------------------------------------------------
+    def _add_id_handlers(self, kind: str) -> None:
+        """
+        Register an @id address for each handler registered so far under /live/<kind>/.
+        """
+        prefix = "/live/%s/" % kind
+        for address, callback in self.osc_server.get_handlers(prefix).items():
+            self.osc_server.add_handler("/live/%s@id/%s" % (kind, address[len(prefix):]),
+                                        self._create_id_callback(kind, callback))
+
+    def _create_id_callback(self, kind: str, callback):
+        def id_callback(params: Tuple[Any]):
+            object_id = int(params[0])
+            indices = self.resolver.get_indices_by_id(kind, object_id)
+            self._id_request = (kind, object_id, len(indices))
+            try:
+                rv = callback([*indices, *params[1:]])
+            finally:
+                self._id_request = None
+            if rv is not None and tuple(rv[:len(indices)]) == indices:
+                rv = (object_id, *rv[len(indices):])
+            return rv
+        return id_callback
+
+    def _get_listener_address(self, osc_address: Optional[str], params: Tuple) -> Tuple[Optional[str], Tuple]:
+        """
+        Returns the address and key params of a listener's updates. For an @id request,
+        these are the @id address, and the object's ID in place of its indices.
+        """
+        if self._id_request is None:
+            return osc_address, params
+        kind, object_id, index_count = self._id_request
+        if osc_address is not None:
+            osc_address = osc_address.replace("/live/%s/" % kind, "/live/%s@id/" % kind, 1)
+        return osc_address, (object_id, *params[index_count:])
+
+    def _get_listener_key(self, name: str, params: Tuple) -> Tuple:
+        """
+        Returns the listener_key of a listener with the given key params (as returned by
+        _get_listener_address). Keys of @id subscriptions are marked with "@id", so that
+        they are distinct from those of index subscriptions with the same params.
+        """
+        if self._id_request is None:
+            return name, params
+        return name, "@id", params
+
+    #--------------------------------------------------------------------------------
+    # Listener registry.
+    #
+    # Each listener is identified by a listener_key (typically (prop, params); see
+    # _get_listener_key), and observes a single property of a Live object. Any number
+    # of clients can subscribe to a listener, each with its own ListenerThrottle; the
+    # Live observer is removed when the last subscriber unsubscribes.
+    #--------------------------------------------------------------------------------
+    def _add_listener(self, listener_key, target, prop, callback, throttle: ListenerThrottle) -> None:
+        """
+        Subscribe the client whose request is being handled to the listener `listener_key`,
+        adding `callback` as a listener for the property `prop` of the Live object `target`.
+
+        If the listener already exists, its subscribers are retained but its observer is
+        replaced, as the object it was observing may since have been deleted and recreated.
+        """
+        add_listener_function_name = "add_%s_listener" % prop
+        add_listener_function = getattr(target, add_listener_function_name)
+
+        clients = {}
         if listener_key in self.listener_functions:
-            self.logger.info("Removing listener for %s %s, property %s" % (self.class_identifier, str(params), prop))
-            listener_function = self.listener_functions[listener_key]
-            remove_listener_function_name = "remove_%s_listener" % prop
+            clients = self.listener_clients[listener_key]
+            self._remove_listener(listener_key)
+
+        add_listener_function(callback)
+        clients[self.osc_server.remote_addr] = throttle
+        self.listener_functions[listener_key] = callback
+        self.listener_objects[listener_key] = (target, prop)
+        self.listener_clients[listener_key] = clients
+
+    def _remove_listener_client(self, listener_key, remote_addr: Tuple[str, int]) -> None:
+        """
+        Unsubscribe the client `remote_addr` from the listener `listener_key`, removing the
+        listener once it has no remaining subscribers.
+        """
+        clients = self.listener_clients.get(listener_key, {})
+        if remote_addr in clients:
+            del clients[remote_addr]
+            if not clients:
+                self._remove_listener(listener_key)
+        else:
+            self.logger.warning("No listener function found for %s: %s (client %s)" %
+                                (self.class_identifier, str(listener_key), str(remote_addr)))
+
+    def _remove_listener(self, listener_key) -> None:
+        """
+        Remove the listener `listener_key`, regardless of its subscribers.
+        """
+        self.logger.info("Removing listener for %s: %s" % (self.class_identifier, str(listener_key)))
+        listener_function = self.listener_functions[listener_key]
+        target, prop = self.listener_objects[listener_key]
+        remove_listener_function_name = "remove_%s_listener" % prop
+        try:
             remove_listener_function = getattr(target, remove_listener_function_name)
+            remove_listener_function(listener_function)
+        except Exception as e:
+            #--------------------------------------------------------------------------------
+            # This exception may be thrown when an observer is no longer connected --
+            # e.g., when trying to stop listening for a clip property of a clip that has been deleted.
+            # Ignore as it is benign.
+            #--------------------------------------------------------------------------------
+            self.logger.info("Exception whilst removing listener (likely benign): %s" % e)
+
+        del self.listener_functions[listener_key]
+        del self.listener_objects[listener_key]
+        del self.listener_clients[listener_key]
+
+    def _get_listener_recipients(self, listener_key, value: Tuple, remote_addr: Optional[Tuple[str, int]] = None):
+        """
+        Returns the subscribers of `listener_key` that should be sent an update containing
+        `value`, according to each subscriber's throttle. If `remote_addr` is specified,
+        only that subscriber is considered.
+        """
+        clients = self.listener_clients.get(listener_key, {})
+        if remote_addr is not None:
+            clients = {remote_addr: clients[remote_addr]} if remote_addr in clients else {}
+        elif self._pending_update_clients is not None:
+            clients = {client: clients[client] for client in self._pending_update_clients if client in clients}
+        return [client for client, throttle in clients.items() if throttle.should_send(value)]
+
+    def _send_pending_updates(self) -> None:
+        """
+        Send the latest value of each listener to any subscribers whose updates were dropped
+        by their max_rate, once their minimum interval has passed, by calling the listener's
+        callback with only those subscribers as recipients.
+
+        The pending update is then cleared, whether or not the callback sent it (e.g. because
+        the value is no longer a change worth sending), so that it is not replayed again.
+        """
+        for listener_key, clients in list(self.listener_clients.items()):
+            due_clients = [client for client, throttle in clients.items() if throttle.is_pending_due()]
+            if not due_clients:
+                continue
+            self._pending_update_clients = due_clients
             try:
-                remove_listener_function(listener_function)
+                self.listener_functions[listener_key]()
             except Exception as e:
                 #--------------------------------------------------------------------------------
-                # This exception may be thrown when an observer is no longer connected --
-                # e.g., when trying to stop listening for a clip property of a clip that has been deleted.
-                # Ignore as it is benign.
+                # The object may have been deleted since the update was dropped.
                 #--------------------------------------------------------------------------------
-                self.logger.info("Exception whilst removing listener (likely benign): %s" % e)
-
-            del self.listener_functions[listener_key]
-            del self.listener_objects[listener_key]
-        else:
-            self.logger.warning("No listener function found for property: %s (%s)" % (prop, str(params)))
+                self.logger.info("Exception whilst sending pending update for %s (likely benign): %s" % (str(listener_key), e))
+            finally:
+                self._pending_update_clients = None
+                for client in due_clients:
+                    if client in clients:
+                        clients[client].pending_value = None
 
-    def _clear_listeners(self):
+    def _clear_listeners(self, remote_addr: Optional[Tuple[str, int]] = None):
         """
         Clears all listener functions, to prevent listeners continuing to report after a reload.
+        If `remote_addr` is specified, only that client's subscriptions are removed, and
+        listeners that other clients are subscribed to continue to report.
         """
-        for listener_key in list(self.listener_functions.keys())[:]:
-            target = self.listener_objects[listener_key]
-            prop, params = listener_key
-            self._stop_listen(target, prop, params)
+        for listener_key in list(self.listener_functions.keys()):
+            if remote_addr is None:
+                self._remove_listener(listener_key)
+            elif remote_addr in self.listener_clients[listener_key]:
+                self._remove_listener_client(listener_key, remote_addr)
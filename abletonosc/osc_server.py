@@ -1,19 +1,194 @@
-from typing import Tuple, Any, Callable
-from .constants import OSC_LISTEN_PORT, OSC_RESPONSE_PORT
+from typing import Tuple, Callable, Optional
+from .constants import OSC_LISTEN_PORT, OSC_RESPONSE_PORT, OSC_TICK_TIME_BUDGET, \
+    OSC_TICK_MAX_MESSAGES, OSC_MAX_PENDING_MESSAGES, OSC_MAX_BUNDLE_SIZE, OSC_HEARTBEAT_TIMEOUT, \
+    OSC_MAX_STREAM_BUNDLE_SIZE, OSC_MAX_STREAM_BUFFER_SIZE, OSC_MAX_DATAGRAM_SIZE, OSC_CHUNK_ADDRESS, \
+    OSC_STREAM_LISTEN_ADDR, OSC_MAX_STREAM_RECV_BUFFER_SIZE
 from ..pythonosc.osc_message import OscMessage, ParseError
-from ..pythonosc.osc_bundle import OscBundle
+from ..pythonosc.osc_bundle import OscBundle, ParseError as BundleParseError
 from ..pythonosc.osc_message_builder import OscMessageBuilder, BuildError
+from ..pythonosc.parsing import osc_types
+from ..pythonosc import slip
 
 import re
+import math
+import time
+import struct
 import errno
 import socket
 import logging
 import traceback
+from collections import deque, OrderedDict
+
+#--------------------------------------------------------------------------------
+# Maximum number of distinct wildcard addresses whose matches are cached.
+#--------------------------------------------------------------------------------
+WILDCARD_CACHE_SIZE = 1024
+
+#--------------------------------------------------------------------------------
+# Characters that make an address an OSC address pattern, matched by match_wildcard.
+#--------------------------------------------------------------------------------
+WILDCARD_CHARS = "*?[{"
+
+#--------------------------------------------------------------------------------
+# Size of the "#bundle" header and timetag, and of each element's size prefix.
+#--------------------------------------------------------------------------------
+BUNDLE_HEADER_SIZE = 16
+BUNDLE_ELEMENT_HEADER_SIZE = 4
+BUNDLE_HEADER = b"#bundle\x00" + osc_types.write_date(osc_types.IMMEDIATELY)
+BUNDLE_ELEMENT_HEADER = struct.Struct(">i")
+
+#--------------------------------------------------------------------------------
+# Maximum number of distinct (address, type signature) pairs whose encoded headers
+# are cached. The least recently used template is evicted when the cache is full.
+#--------------------------------------------------------------------------------
+MESSAGE_TEMPLATE_CACHE_SIZE = 1024
+
+#--------------------------------------------------------------------------------
+# Maximum number of params of a message encoded from a MessageTemplate. Longer
+# messages (such as bulk replies) are built with OscMessageBuilder, so that the
+# cache only holds small templates for the short, frequently-sent replies.
+#--------------------------------------------------------------------------------
+MESSAGE_TEMPLATE_MAX_PARAMS = 8
+
+#--------------------------------------------------------------------------------
+# OSC type tags of params that can be encoded by a MessageTemplate, and the struct
+# format character of each. True, False and None are encoded in the type tag alone.
+#--------------------------------------------------------------------------------
+TEMPLATE_STRUCT_FORMATS = {"i": "i", "h": "q", "f": "f", "T": "", "F": "", "N": ""}
+
+#--------------------------------------------------------------------------------
+# Number of bytes to read from a stream connection in each call to recv().
+#--------------------------------------------------------------------------------
+STREAM_RECV_SIZE = 65536
+
+class AddressNode:
+    """
+    A node in the trie of registered OSC addresses, keyed by path segment.
+    `address` is set if a handler is registered for the path ending at this node.
+    """
+    __slots__ = ("children", "address")
+
+    def __init__(self):
+        self.children = {}
+        self.address = None
+
+    def iter_addresses(self):
+        """
+        Yield every registered address in the subtree rooted at this node, except those
+        below a segment containing "@" (such as /live/track@id/...), which are only
+        matched by a pattern that names that segment (see OSCServer.match_wildcard).
+        """
+        if self.address is not None:
+            yield self.address
+        for segment, child in self.children.items():
+            if "@" not in segment:
+                yield from child.iter_addresses()
+
+def is_wildcard(address: str) -> bool:
+    """
+    Returns True if `address` is an OSC address pattern (e.g. /live/track/get/*).
+    """
+    return any(char in address for char in WILDCARD_CHARS)
+
+def get_wildcard_regex(segment: str) -> str:
+    """
+    Translates one path segment of an OSC address pattern into a regex. `*` matches one or
+    more characters, `?` matches any one character, `[abc]`, `[a-z]` and `[!abc]` match one
+    character from (or not from) a set, and `{foo,bar}` matches any of the given strings.
+    An unterminated `[` or `{` is matched literally.
+    """
+    regex = ""
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        if char == "*":
+            regex += "[^/]+"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[" and segment.find("]", index + 1) > index + 1:
+            end = segment.find("]", index + 1)
+            members = segment[index + 1:end]
+            negate = members.startswith("!") and len(members) > 1
+            if negate:
+                members = members[1:]
+            #--------------------------------------------------------------------------------
+            # A "-" between two characters denotes a range; anywhere else it is literal.
+            #--------------------------------------------------------------------------------
+            members = "".join(member if member == "-" and 0 < member_index < len(members) - 1 else re.escape(member)
+                              for member_index, member in enumerate(members))
+            regex += "[^/%s]" % members if negate else "[%s]" % members
+            index = end
+        elif char == "{" and "}" in segment[index + 1:]:
+            end = segment.index("}", index + 1)
+            regex += "(?:%s)" % "|".join(re.escape(option) for option in segment[index + 1:end].split(","))
+            index = end
+        else:
+            regex += re.escape(char)
+        index += 1
+    return regex
+
+def get_type_signature(params: Tuple) -> Optional[str]:
+    """
+    Returns the OSC type tags that OscMessageBuilder would use for `params` (e.g. "if"),
+    or None if any param is not of a fixed-width type that a MessageTemplate can encode.
+    """
+    signature = ""
+    for param in params:
+        param_type = type(param)
+        if param_type is float:
+            signature += "f"
+        elif param_type is int:
+            signature += "h" if param.bit_length() > 32 else "i"
+        elif param is True:
+            signature += "T"
+        elif param is False:
+            signature += "F"
+        elif param is None:
+            signature += "N"
+        else:
+            return None
+    return signature
+
+class MessageTemplate:
+    """
+    The pre-encoded address and type tag of messages with a given address and type
+    signature, and a struct.Struct that packs their params. Encoding a message from a
+    template skips rebuilding the header and inferring the type of each param.
+    """
+    __slots__ = ("header", "packer", "has_implicit_params")
+
+    def __init__(self, address: str, signature: str):
+        self.header = osc_types.write_string(address) + osc_types.write_string("," + signature)
+        self.packer = struct.Struct(">" + "".join(TEMPLATE_STRUCT_FORMATS[tag] for tag in signature))
+        self.has_implicit_params = any(tag in "TFN" for tag in signature)
+
+    def encode(self, params: Tuple) -> bytes:
+        if self.has_implicit_params:
+            params = [param for param in params if param is not True and param is not False and param is not None]
+        return self.header + self.packer.pack(*params)
+
+class StreamConnection:
+    """
+    A client connected to the stream (TCP) listener. Packets are framed with SLIP, as
+    specified by OSC 1.1. `recv_buffer` holds the bytes of any partially-received frame,
+    and `send_buffer` any framed data that could not yet be written to the socket.
+    """
+    __slots__ = ("socket", "peer_addr", "recv_buffer", "send_buffer")
+
+    def __init__(self, sock: socket.socket, peer_addr: Tuple[str, int]):
+        self.socket = sock
+        self.peer_addr = peer_addr
+        self.recv_buffer = bytearray()
+        self.send_buffer = bytearray()
 
 class OSCServer:
     def __init__(self,
                  local_addr: Tuple[str, int] = ('0.0.0.0', OSC_LISTEN_PORT),
-                 remote_addr: Tuple[str, int] = ('127.0.0.1', OSC_RESPONSE_PORT)):
+                 remote_addr: Tuple[str, int] = ('127.0.0.1', OSC_RESPONSE_PORT),
+                 tick_time_budget: float = OSC_TICK_TIME_BUDGET,
+                 tick_max_messages: int = OSC_TICK_MAX_MESSAGES,
+                 heartbeat_timeout: float = OSC_HEARTBEAT_TIMEOUT,
+                 stream_addr: Optional[Tuple[str, int]] = OSC_STREAM_LISTEN_ADDR):
         """
         Class that handles OSC server responsibilities, including support for sending
         reply messages.
@@ -27,6 +202,14 @@ class OSCServer:
                         By default, binds to the wildcard address 0.0.0.0, which means listening on
                         every available local IPv4 interface (including 127.0.0.1).
             remote_addr: Remote address to send replies to, by default. Can be overridden in send().
+            tick_time_budget: Maximum number of seconds to spend handling messages in each call
+                              to process(). Messages still queued are handled on the next call.
+            tick_max_messages: Maximum number of datagrams to handle in each call to process().
+            heartbeat_timeout: Number of seconds after which a client that has sent a heartbeat
+                               is considered to have gone away, if no further messages are received.
+            stream_addr: Local address and port to accept stream (TCP) connections on, or None to
+                         listen for UDP only (the default). Replies to a stream client are sent over
+                         its connection.
         """
 
         self._local_addr = local_addr
@@ -37,8 +220,81 @@ class OSCServer:
         self._socket.setblocking(0)
         self._socket.bind(self._local_addr)
         self._callbacks = {}
+        self._callback_order = {}
+        self._address_index = AddressNode()
+        self._wildcard_cache = {}
+
+        #--------------------------------------------------------------------------------
+        # Datagrams received but not yet handled, as (data, remote_addr) tuples.
+        #--------------------------------------------------------------------------------
+        self._pending = deque()
+
+        #--------------------------------------------------------------------------------
+        # Messages awaiting the next call to flush(), as lists of message datagrams keyed
+        # by remote address.
+        #--------------------------------------------------------------------------------
+        self._outbound = {}
+
+        #--------------------------------------------------------------------------------
+        # Listener updates awaiting the next call to flush(), keyed by
+        # (remote_addr, address, key), so that only the latest value of each is sent.
+        #--------------------------------------------------------------------------------
+        self._updates = {}
+
+        #--------------------------------------------------------------------------------
+        # MessageTemplates of the messages sent, keyed by (address, type signature).
+        #--------------------------------------------------------------------------------
+        self._message_templates = OrderedDict()
+
+        #--------------------------------------------------------------------------------
+        # Identifier of the next message to be split into chunks, so that the client
+        # can tell which chunks belong together.
+        #--------------------------------------------------------------------------------
+        self._next_chunk_id = 0
+        self.tick_time_budget = tick_time_budget
+        self.tick_max_messages = tick_max_messages
+        self.messages_processed = 0
+        self.messages_deferred = 0
+        self.ticks_deferred = 0
+        #--------------------------------------------------------------------------------
+        # The number of messages at the front of the pending queue that have already been
+        # counted in messages_deferred, so that each deferred message is only counted once.
+        #--------------------------------------------------------------------------------
+        self._num_pending_deferred = 0
+
+        #--------------------------------------------------------------------------------
+        # The time that each client that has sent a heartbeat was last heard from,
+        # keyed by reply address.
+        #--------------------------------------------------------------------------------
+        self._heartbeat_clients = {}
+        self.heartbeat_timeout = heartbeat_timeout
 
         self.logger = logging.getLogger("abletonosc")
+
+        #--------------------------------------------------------------------------------
+        # Stream connections, keyed by the peer address of each connection, which also
+        # serves as the client's reply address. Clients whose connections have closed are
+        # reported by get_expired_clients().
+        #--------------------------------------------------------------------------------
+        self._stream_addr = stream_addr
+        self._stream_socket = None
+        self._stream_connections = {}
+        self._closed_clients = []
+        if stream_addr is not None:
+            try:
+                self._stream_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self._stream_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self._stream_socket.setblocking(0)
+                self._stream_socket.bind(stream_addr)
+                self._stream_socket.listen()
+            except OSError as e:
+                #--------------------------------------------------------------------------------
+                # The stream listener is optional: carry on with UDP only.
+                #--------------------------------------------------------------------------------
+                self.logger.warning("AbletonOSC: Couldn't listen for stream connections on %s (%s)" %
+                                    (str(stream_addr), e))
+                self._stream_socket.close()
+                self._stream_socket = None
         self.logger.info("Starting OSC server (local %s, response port %d)",
                          str(self._local_addr), self._response_port)
 
@@ -51,20 +307,99 @@ class OSCServer:
             handler: A handler function, with signature:
                      params: Tuple[Any, ...]
         """
+        if address not in self._callbacks:
+            self._callback_order[address] = len(self._callback_order)
+            node = self._address_index
+            for segment in address.split("/"):
+                node = node.children.setdefault(segment, AddressNode())
+            node.address = address
         self._callbacks[address] = handler
+        self._wildcard_cache = {}
+
+    def get_handlers(self, prefix: str = "") -> dict:
+        """
+        Returns the OSC handlers whose addresses start with `prefix`, keyed by address.
+        """
+        return {address: handler for address, handler in self._callbacks.items() if address.startswith(prefix)}
 
     def clear_handlers(self) -> None:
         """
         Remove all existing OSC handlers.
         """
         self._callbacks = {}
+        self._callback_order = {}
+        self._address_index = AddressNode()
+        self._wildcard_cache = {}
+
+    def match_wildcard(self, address: str) -> Tuple[str, ...]:
+        """
+        Returns the registered addresses matching the wildcard address `address`, in the order
+        in which their handlers were added. Each segment is an OSC address pattern (see
+        get_wildcard_regex), and (as with a regex match) the final segment matches as a prefix,
+        so that /live/track/get/* also matches /live/track/get/clips/name.
+
+        Matches are found by walking the address trie, so only the branches that can match
+        are visited, and the result is cached until the set of handlers changes.
+
+        @id addresses (e.g. /live/track@id/get/name), which take an object ID in place of
+        indices, are only matched by a pattern whose segment also contains "@id", so that
+        a pattern such as /live/*/get/name doesn't pass indices to handlers that expect IDs.
+        """
+        if address in self._wildcard_cache:
+            return self._wildcard_cache[address]
+
+        segments = address.split("/")
+        last_index = len(segments) - 1
+        matches = []
+        nodes = [self._address_index]
+        for index, segment in enumerate(segments):
+            is_last = index == last_index
+            if is_wildcard(segment):
+                try:
+                    regex = re.compile(get_wildcard_regex(segment))
+                except re.error:
+                    #--------------------------------------------------------------------------------
+                    # e.g. a reversed character range such as [z-a], which matches nothing.
+                    #--------------------------------------------------------------------------------
+                    nodes = []
+                    break
+                test = regex.match if is_last else regex.fullmatch
+            elif is_last:
+                test = lambda key, segment=segment: key.startswith(segment)
+            else:
+                test = None
+            if test is not None and "@" not in segment:
+                test = lambda key, test=test: "@" not in key and test(key)
+
+            next_nodes = []
+            for node in nodes:
+                if test is None:
+                    if segment in node.children:
+                        next_nodes.append(node.children[segment])
+                else:
+                    next_nodes.extend(child for key, child in node.children.items() if test(key))
+            nodes = next_nodes
+            if not nodes:
+                break
+
+        for node in nodes:
+            matches.extend(node.iter_addresses())
+        matches.sort(key=self._callback_order.__getitem__)
+        matches = tuple(matches)
+
+        if len(self._wildcard_cache) >= WILDCARD_CACHE_SIZE:
+            self._wildcard_cache = {}
+        self._wildcard_cache[address] = matches
+        return matches
 
     def send(self,
              address: str,
              params: Tuple = (),
              remote_addr: Tuple[str, int] = None) -> None:
         """
-        Send an OSC message.
+        Send an OSC message. The message is queued, and sent with any other queued messages
+        on the next call to flush(). A message to a UDP client that is larger than
+        OSC_MAX_DATAGRAM_SIZE is split into chunks (see _split_message()).
 
         Args:
             address: The OSC address (e.g. /frequency)
@@ -72,18 +407,158 @@ class OSCServer:
             remote_addr: The remote address to send to, as a 2-tuple (hostname, port).
                          If None, uses the default remote address.
         """
-        msg_builder = OscMessageBuilder(address)
-        for param in params:
-            msg_builder.add_arg(param)
-
         try:
-            msg = msg_builder.build()
+            dgram = self._encode_message(address, params)
             if remote_addr is None:
                 remote_addr = self._remote_addr
-            self._socket.sendto(msg.dgram, remote_addr)
+            if len(dgram) > OSC_MAX_DATAGRAM_SIZE and remote_addr not in self._stream_connections:
+                self._outbound.setdefault(remote_addr, []).extend(self._split_message(address, tuple(params), len(dgram)))
+            else:
+                self._outbound.setdefault(remote_addr, []).append(dgram)
         except BuildError:
             self.logger.error("AbletonOSC: OSC build error: %s" % (traceback.format_exc()))
 
+    def _encode_message(self, address: str, params: Tuple) -> bytes:
+        """
+        Returns the datagram of an OSC message. Messages of up to MESSAGE_TEMPLATE_MAX_PARAMS
+        params that are all ints, floats, bools or None are encoded from a cached
+        MessageTemplate; others are built with OscMessageBuilder.
+        """
+        signature = get_type_signature(params) if len(params) <= MESSAGE_TEMPLATE_MAX_PARAMS else None
+        if signature is not None:
+            template_key = (address, signature)
+            template = self._message_templates.get(template_key)
+            if template is None:
+                if len(self._message_templates) >= MESSAGE_TEMPLATE_CACHE_SIZE:
+                    self._message_templates.popitem(last=False)
+                template = self._message_templates[template_key] = MessageTemplate(address, signature)
+            else:
+                self._message_templates.move_to_end(template_key)
+            try:
+                return template.encode(params)
+            except (struct.error, OverflowError):
+                #--------------------------------------------------------------------------------
+                # Out-of-range values: fall through, so that OscMessageBuilder raises BuildError.
+                #--------------------------------------------------------------------------------
+                pass
+
+        msg_builder = OscMessageBuilder(address)
+        for param in params:
+            msg_builder.add_arg(param)
+        return msg_builder.build().dgram
+
+    def _split_message(self, address: str, params: Tuple, size: int):
+        """
+        Split a message that is too large to send in a single datagram into chunk messages,
+        each with the params:
+
+            chunk_id, chunk_index, chunk_count, address, *params[start:end]
+
+        The client reassembles the original message once it has received all chunk_count
+        chunks with the same chunk_id. Params are divided evenly between the chunks, and
+        the number of chunks is doubled until every chunk fits within OSC_MAX_DATAGRAM_SIZE
+        (or contains a single param, which can't be split further).
+        """
+        chunk_id = self._next_chunk_id
+        self._next_chunk_id = (self._next_chunk_id + 1) % (2 ** 31)
+
+        chunk_count = max(2, math.ceil(size / (OSC_MAX_DATAGRAM_SIZE / 2)))
+        while True:
+            params_per_chunk = max(1, math.ceil(len(params) / chunk_count))
+            starts = range(0, len(params), params_per_chunk)
+            chunks = [self._encode_message(OSC_CHUNK_ADDRESS,
+                                           (chunk_id, chunk_index, len(starts), address,
+                                            *params[start:start + params_per_chunk]))
+                      for chunk_index, start in enumerate(starts)]
+            if all(len(chunk) <= OSC_MAX_DATAGRAM_SIZE for chunk in chunks):
+                return chunks
+            if params_per_chunk == 1:
+                self.logger.warning("AbletonOSC: Message to %s has a param too large to send over UDP" % address)
+                return chunks
+            chunk_count *= 2
+
+    def send_update(self,
+                    address: str,
+                    key: Tuple = (),
+                    value: Tuple = (),
+                    remote_addr: Tuple[str, int] = None) -> None:
+        """
+        Queue a listener update, sent as an OSC message with params (*key, *value).
+        If further updates with the same address and key are queued before the next call
+        to flush(), only the most recent value is sent.
+
+        Args:
+            address: The OSC address (e.g. /live/track/get/volume)
+            key: A tuple of params identifying the object that changed (e.g. a track index)
+            value: A tuple of params containing the new value
+            remote_addr: The remote address to send to, as a 2-tuple (hostname, port).
+                         If None, uses the default remote address.
+        """
+        if remote_addr is None:
+            remote_addr = self._remote_addr
+        self._updates[(remote_addr, address, key)] = value
+
+    def flush(self) -> None:
+        """
+        Send all queued messages and listener updates. Messages to the same remote address
+        are packed into OSC bundles of up to OSC_MAX_BUNDLE_SIZE bytes, reducing the number
+        of datagrams sent.
+        """
+        updates, self._updates = self._updates, {}
+        for (remote_addr, address, key), value in updates.items():
+            self.send(address, (*key, *value), remote_addr)
+
+        #--------------------------------------------------------------------------------
+        # Swap out the queue first, as errors logged below are themselves relayed via OSC.
+        #--------------------------------------------------------------------------------
+        outbound, self._outbound = self._outbound, {}
+        for remote_addr, messages in outbound.items():
+            connection = self._stream_connections.get(remote_addr)
+            if connection is not None:
+                #--------------------------------------------------------------------------------
+                # A stream has no datagram size limit, so bundles are only split to bound
+                # the size of the frames that the client must buffer.
+                #--------------------------------------------------------------------------------
+                for dgram in self._pack_messages(messages, OSC_MAX_STREAM_BUNDLE_SIZE):
+                    connection.send_buffer += slip.encode(dgram)
+                continue
+            for dgram in self._pack_messages(messages):
+                try:
+                    self._socket.sendto(dgram, remote_addr)
+                except OSError:
+                    self.logger.error("AbletonOSC: Error sending OSC data: %s" % (traceback.format_exc()))
+
+        for connection in list(self._stream_connections.values()):
+            if connection.send_buffer:
+                self._send_stream(connection)
+
+    def _pack_messages(self, messages, max_size: int = OSC_MAX_BUNDLE_SIZE):
+        """
+        Yields datagrams containing the given message datagrams, grouping consecutive messages
+        into bundles of up to `max_size` bytes. A message that fits in no bundle is sent on its own.
+        """
+        batch = []
+        batch_size = BUNDLE_HEADER_SIZE
+        for message in messages:
+            element_size = BUNDLE_ELEMENT_HEADER_SIZE + len(message)
+            if batch and batch_size + element_size > max_size:
+                yield self._build_datagram(batch)
+                batch = []
+                batch_size = BUNDLE_HEADER_SIZE
+            batch.append(message)
+            batch_size += element_size
+        if batch:
+            yield self._build_datagram(batch)
+
+    def _build_datagram(self, messages):
+        if len(messages) == 1:
+            return messages[0]
+        dgram = bytearray(BUNDLE_HEADER)
+        for message in messages:
+            dgram += BUNDLE_ELEMENT_HEADER.pack(len(message))
+            dgram += message
+        return bytes(dgram)
+
     def process_message(self, message, remote_addr):
         if message.address in self._callbacks:
             callback = self._callbacks[message.address]
@@ -91,52 +566,55 @@ class OSCServer:
 
             if rv is not None:
                 assert isinstance(rv, tuple)
-                remote_hostname, _ = remote_addr
-                response_addr = (remote_hostname, self._response_port)
                 self.send(address=message.address,
                           params=rv,
-                          remote_addr=response_addr)
-        elif "*" in message.address:
-            regex = message.address.replace("*", "[^/]+")
-            for callback_address, callback in self._callbacks.items():
-                if re.match(regex, callback_address):
-                    try:
-                        rv = callback(message.params)
-                    except ValueError:
-                        #--------------------------------------------------------------------------------
-                        # Don't throw errors for queries that require more arguments
-                        # (e.g. /live/track/get/send with no args)
-                        #--------------------------------------------------------------------------------
-                        continue
-                    except AttributeError:
-                        #--------------------------------------------------------------------------------
-                        # Don't throw errors when trying to create listeners for properties that can't
-                        # be listened for (e.g. can_be_armed, is_foldable)
-                        #--------------------------------------------------------------------------------
-                        continue
-                    if rv is not None:
-                        assert isinstance(rv, tuple)
-                        remote_hostname, _ = remote_addr
-                        response_addr = (remote_hostname, self._response_port)
-                        self.send(address=callback_address,
-                                  params=rv,
-                                  remote_addr=response_addr)
+                          remote_addr=self._get_reply_addr(remote_addr))
+        elif is_wildcard(message.address):
+            for callback_address in self.match_wildcard(message.address):
+                callback = self._callbacks[callback_address]
+                try:
+                    rv = callback(message.params)
+                except ValueError:
+                    #--------------------------------------------------------------------------------
+                    # Don't throw errors for queries that require more arguments
+                    # (e.g. /live/track/get/send with no args)
+                    #--------------------------------------------------------------------------------
+                    continue
+                except AttributeError:
+                    #--------------------------------------------------------------------------------
+                    # Don't throw errors when trying to create listeners for properties that can't
+                    # be listened for (e.g. can_be_armed, is_foldable)
+                    #--------------------------------------------------------------------------------
+                    continue
+                if rv is not None:
+                    assert isinstance(rv, tuple)
+                    self.send(address=callback_address,
+                              params=rv,
+                              remote_addr=self._get_reply_addr(remote_addr))
         else:
             self.logger.error("AbletonOSC: Unknown OSC address: %s" % message.address)
 
     def process_bundle(self, bundle, remote_addr):
-        for i in bundle:
-            if OscBundle.dgram_is_bundle(i.dgram):
-                self.process_bundle(i, remote_addr)
-            else:
-                self.process_message(i, remote_addr)
+        for index in range(bundle.num_contents):
+            if bundle.content_is_bundle(index):
+                self.process_bundle(bundle.content(index), remote_addr)
+                continue
+            #--------------------------------------------------------------------------------
+            # Peek at the address first, so that messages that no handler matches are
+            # skipped without decoding their params.
+            #--------------------------------------------------------------------------------
+            address = bundle.content_address(index)
+            if address in self._callbacks or (is_wildcard(address) and self.match_wildcard(address)):
+                self.process_message(bundle.content(index), remote_addr)
+            elif not is_wildcard(address):
+                self.logger.error("AbletonOSC: Unknown OSC address: %s" % address)
 
     def parse_bundle(self, data, remote_addr):
         if OscBundle.dgram_is_bundle(data):
             try:
                 bundle = OscBundle(data)
                 self.process_bundle(bundle, remote_addr)
-            except ParseError:
+            except (ParseError, BundleParseError):
                 self.logger.error("AbletonOSC: Error parsing OSC bundle: %s" % (traceback.format_exc()))
         else:
             try:
@@ -145,25 +623,34 @@ class OSCServer:
             except ParseError:
                 self.logger.error("AbletonOSC: Error parsing OSC message: %s" % (traceback.format_exc()))
 
-    def process(self) -> None:
+    def _get_reply_addr(self, remote_addr: Tuple[str, int]) -> Tuple[str, int]:
         """
-        Synchronously process all data queued on the OSC socket.
+        Returns the address that replies to a message received from `remote_addr` should be
+        sent to: the connection itself for a stream client, or the response port on the
+        sender's host for a UDP client.
         """
+        if remote_addr in self._stream_connections:
+            return remote_addr
+        return (remote_addr[0], self._response_port)
+
+    def receive(self) -> None:
+        """
+        Read all data available on the OSC socket into the pending queue, without handling it.
+        If the queue is full, further datagrams are left in the socket's receive buffer.
+        """
+        if self._stream_socket is not None:
+            self._receive_stream()
+
         try:
-            repeats = 0
-            while True:
+            while len(self._pending) < OSC_MAX_PENDING_MESSAGES:
                 #--------------------------------------------------------------------------------
                 # Loop until no more data is available.
                 #--------------------------------------------------------------------------------
                 data, remote_addr = self._socket.recvfrom(65536)
-                #--------------------------------------------------------------------------------
-                # Update the default reply address to the most recent client. Used when
-                # sending (e.g) /live/song/beat messages and listen updates.
-                #
-                # This is slightly ugly and prevents registering listeners from different IPs.
-                #--------------------------------------------------------------------------------
-                self._remote_addr = (remote_addr[0], OSC_RESPONSE_PORT)
-                self.parse_bundle(data, remote_addr)
+                self._pending.append((data, remote_addr))
+                reply_addr = self._get_reply_addr(remote_addr)
+                if reply_addr in self._heartbeat_clients:
+                    self._heartbeat_clients[reply_addr] = time.monotonic()
 
         except socket.error as e:
             if e.errno == errno.ECONNRESET:
@@ -183,12 +670,178 @@ class OSCServer:
                 #--------------------------------------------------------------------------------
                 self.logger.error("AbletonOSC: Socket error: %s" % (traceback.format_exc()))
 
-        except Exception as e:
-            self.logger.error("AbletonOSC: Error handling OSC message: %s" % e)
-            self.logger.warning("AbletonOSC: %s" % traceback.format_exc())
+    def _receive_stream(self) -> None:
+        """
+        Accept any new stream connections, and read the complete frames available on each
+        connection into the pending queue.
+        """
+        while True:
+            try:
+                sock, peer_addr = self._stream_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                self.logger.error("AbletonOSC: Error accepting stream connection: %s" % (traceback.format_exc()))
+                break
+            sock.setblocking(0)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._stream_connections[peer_addr] = StreamConnection(sock, peer_addr)
+            self.logger.info("AbletonOSC: Accepted stream connection from %s" % str(peer_addr))
+
+        for connection in list(self._stream_connections.values()):
+            while len(self._pending) < OSC_MAX_PENDING_MESSAGES:
+                try:
+                    data = connection.socket.recv(STREAM_RECV_SIZE)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError as e:
+                    self._close_stream(connection, str(e))
+                    break
+                if not data:
+                    self._close_stream(connection, "closed by client")
+                    break
+                if slip.END not in data:
+                    #--------------------------------------------------------------------------------
+                    # No frame has been completed, so just append to the buffer rather than
+                    # re-scanning it.
+                    #--------------------------------------------------------------------------------
+                    connection.recv_buffer += data
+                    packets = []
+                else:
+                    try:
+                        packets, remainder = slip.split_frames(connection.recv_buffer + data)
+                    except slip.ProtocolError as e:
+                        self._close_stream(connection, "invalid SLIP framing: %s" % e)
+                        break
+                    connection.recv_buffer = bytearray(remainder)
+                if len(connection.recv_buffer) > OSC_MAX_STREAM_RECV_BUFFER_SIZE:
+                    self._close_stream(connection, "frame exceeds %d bytes" % OSC_MAX_STREAM_RECV_BUFFER_SIZE)
+                    break
+                for packet in packets:
+                    self._pending.append((packet, connection.peer_addr))
+                if packets and connection.peer_addr in self._heartbeat_clients:
+                    self._heartbeat_clients[connection.peer_addr] = time.monotonic()
+
+    def _send_stream(self, connection: StreamConnection) -> None:
+        """
+        Write as much of a stream connection's send buffer as the socket will accept.
+        Any remainder is kept, and written on the next call to flush().
+        """
+        try:
+            sent = connection.socket.send(connection.send_buffer)
+            del connection.send_buffer[:sent]
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            self._close_stream(connection, str(e))
+            return
+        if len(connection.send_buffer) > OSC_MAX_STREAM_BUFFER_SIZE:
+            self._close_stream(connection, "client is not reading replies")
+
+    def _close_stream(self, connection: StreamConnection, reason: str) -> None:
+        """
+        Close a stream connection. The client is reported by get_expired_clients(), so that
+        its listeners are removed.
+        """
+        self.logger.info("AbletonOSC: Stream connection from %s closed (%s)" % (str(connection.peer_addr), reason))
+        connection.socket.close()
+        del self._stream_connections[connection.peer_addr]
+        self._heartbeat_clients.pop(connection.peer_addr, None)
+        self._closed_clients.append(connection.peer_addr)
+
+    def process(self) -> None:
+        """
+        Synchronously process data queued on the OSC socket, within the per-tick time budget
+        and message cap. Datagrams that are not handled are kept until the next call.
+        Replies and listener updates queued during the tick are then sent by flush().
+        """
+        self.receive()
+
+        deadline = time.perf_counter() + self.tick_time_budget
+        processed = 0
+        while self._pending:
+            #--------------------------------------------------------------------------------
+            # At least one message is handled per tick, so that a zero budget can't stall the
+            # queue (including any /live/api/set/tick_budget that would raise it).
+            #--------------------------------------------------------------------------------
+            if processed > 0 and (processed >= self.tick_max_messages or time.perf_counter() >= deadline):
+                break
+            data, remote_addr = self._pending.popleft()
+            processed += 1
+            #--------------------------------------------------------------------------------
+            # Update the default reply address to the most recent client. Handlers use this
+            # to identify the client making a request (e.g., to subscribe it to a listener),
+            # and it is used as the destination of unsolicited messages such as /live/error.
+            #--------------------------------------------------------------------------------
+            self._remote_addr = self._get_reply_addr(remote_addr)
+            try:
+                self.parse_bundle(data, remote_addr)
+            except Exception as e:
+                self.logger.error("AbletonOSC: Error handling OSC message: %s" % e)
+                self.logger.warning("AbletonOSC: %s" % traceback.format_exc())
+
+        self.messages_processed += processed
+        if self._pending:
+            #--------------------------------------------------------------------------------
+            # Messages are processed in order, so any that were already deferred by a previous
+            # tick are at the front of the queue.
+            #--------------------------------------------------------------------------------
+            already_deferred = max(0, self._num_pending_deferred - processed)
+            self.messages_deferred += len(self._pending) - already_deferred
+            self.ticks_deferred += 1
+            self.logger.debug("Deferred %d messages to next tick" % len(self._pending))
+        self._num_pending_deferred = len(self._pending)
+
+        self.flush()
+
+    def heartbeat(self) -> None:
+        """
+        Register a heartbeat from the client whose message is being handled. From then on,
+        the client is expected to keep sending messages, and is reported by
+        get_expired_clients() if it falls silent for longer than heartbeat_timeout.
+        """
+        self._heartbeat_clients[self._remote_addr] = time.monotonic()
+
+    def get_expired_clients(self):
+        """
+        Returns the reply addresses of clients that have sent a heartbeat but from which no
+        message has been received within heartbeat_timeout seconds, and of stream clients
+        whose connections have closed. Each expired client is returned once, and must send
+        a new heartbeat to be tracked again.
+        """
+        expired_clients, self._closed_clients = self._closed_clients, []
+        if self.heartbeat_timeout <= 0:
+            return expired_clients
+        expiry_time = time.monotonic() - self.heartbeat_timeout
+        timed_out_clients = [remote_addr for remote_addr, last_seen in self._heartbeat_clients.items()
+                             if last_seen < expiry_time]
+        for remote_addr in timed_out_clients:
+            del self._heartbeat_clients[remote_addr]
+        return expired_clients + timed_out_clients
+
+    @property
+    def remote_addr(self) -> Tuple[str, int]:
+        """
+        The reply address of the client whose message is being handled, or of the most
+        recent client if no message is being handled.
+        """
+        return self._remote_addr
+
+    @property
+    def num_pending(self) -> int:
+        """
+        The number of received datagrams awaiting processing.
+        """
+        return len(self._pending)
 
     def shutdown(self) -> None:
         """
         Shutdown the server network sockets.
         """
+        self.flush()
+        for connection in list(self._stream_connections.values()):
+            connection.socket.close()
+        self._stream_connections = {}
+        if self._stream_socket is not None:
+            self._stream_socket.close()
         self._socket.close()
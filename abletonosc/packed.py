@@ -0,0 +1,62 @@
+import sys
+import struct
+from array import array
+from typing import Tuple, Any, Iterable
+
+#--------------------------------------------------------------------------------
+# Packed mode.
+#
+# Bulk queries that return a column of numeric values (e.g. /live/clip/get/notes)
+# can be followed by the string "packed", in which case each column is returned
+# as a single OSC blob rather than as one OSC param per value. Each blob contains
+# an 8-byte header:
+#
+#   type (1 byte: "f" = float32, "i" = int32), 3 padding bytes, count (uint32)
+#
+# followed by `count` big-endian values of the given type. Missing float values
+# (e.g. the length of an empty clip slot) are encoded as NaN.
+#--------------------------------------------------------------------------------
+PACKED_FLAG = "packed"
+PACKED_HEADER = struct.Struct(">c3xI")
+
+def split_packed_flag(params: Tuple[Any, ...]) -> Tuple[Tuple[Any, ...], bool]:
+    """
+    Returns the params of a request without any trailing "packed" flag, and whether
+    the flag was present.
+    """
+    params = tuple(params)
+    if params and params[-1] == PACKED_FLAG:
+        return params[:-1], True
+    return params, False
+
+def pack_column(values: Iterable, type_code: str = "f") -> bytes:
+    """
+    Pack a column of numeric values into a packed-mode blob.
+
+    Args:
+        values: The values to pack. For float columns, None is packed as NaN.
+        type_code: "f" for float32, or "i" for int32 (bools are packed as 0/1).
+    """
+    if type_code == "f":
+        column = array("f", (float("nan") if value is None else value for value in values))
+    elif type_code == "i":
+        column = array("i", (int(value) for value in values))
+    else:
+        raise ValueError("Unsupported packed type: %s" % type_code)
+    if sys.byteorder == "little":
+        column.byteswap()
+    return PACKED_HEADER.pack(type_code.encode(), len(column)) + column.tobytes()
+
+def unpack_column(blob: bytes) -> array:
+    """
+    Unpack a packed-mode blob into an array of floats ("f") or ints ("i").
+    """
+    type_code, count = PACKED_HEADER.unpack_from(blob)
+    column = array(type_code.decode())
+    data = blob[PACKED_HEADER.size:PACKED_HEADER.size + count * column.itemsize]
+    if len(data) != count * column.itemsize:
+        raise ValueError("Packed column is too short (expected %d values)" % count)
+    column.frombytes(data)
+    if sys.byteorder == "little":
+        column.byteswap()
+    return column
@@ -0,0 +1,326 @@
+import logging
+from typing import Tuple, Callable, Optional
+
+class ObjectResolver:
+    """
+    Resolves the index-addressed objects of a request (tracks, scenes, clip slots,
+    clips and devices) from cached lists, so that each request costs a list lookup
+    rather than several calls into Live's API, each of which materialises a new list.
+
+    It also maintains identity maps from tracks (including return and master tracks),
+    scenes and devices back to their indices, keyed by each object's _live_ptr, so
+    that reverse lookups are constant-time rather than a scan of a list, and assigns
+    stable IDs to tracks, scenes and devices, which remain valid when objects are
+    reordered (see get_object_id).
+
+    The song's tracks and scenes are cached until its tracks/return_tracks/scenes
+    listeners fire, and each track's clip slots and devices until the track's
+    clip_slots/devices listeners fire. Caches are only refilled on the next lookup,
+    so that structural changes made by a request are seen by the next one.
+
+    A single resolver is owned by the Manager, and shared by all handlers as
+    `self.resolver`.
+    """
+    def __init__(self, song):
+        self.song = song
+        self.logger = logging.getLogger("abletonosc")
+        self._tracks = None
+        self._scenes = None
+        self._track_positions = None
+        self._scene_indices = None
+        self._clip_slots = {}
+        self._devices = {}
+        self._device_indices = {}
+        self._song_listeners = []
+        self._track_listeners = {}
+        self._is_structure_stale = False
+        self._object_ids = {}
+        self._objects_by_id = {}
+        self._next_object_id = 1
+        self._are_object_ids_stale = False
+
+        for prop in ("tracks", "return_tracks", "scenes"):
+            callback = self._create_song_callback(prop)
+            self._add_listener(self.song, prop, callback)
+            self._song_listeners.append((self.song, prop, callback))
+
+    @property
+    def tracks(self) -> Tuple:
+        if self._is_structure_stale:
+            self._clear_track_caches()
+        if self._tracks is None:
+            self._tracks = tuple(self.song.tracks)
+        return self._tracks
+
+    @property
+    def scenes(self) -> Tuple:
+        if self._scenes is None:
+            self._scenes = tuple(self.song.scenes)
+        return self._scenes
+
+    def get_track(self, track_index: int):
+        return self.tracks[track_index]
+
+    def get_scene(self, scene_index: int):
+        return self.scenes[scene_index]
+
+    def get_clip_slots(self, track_index: int) -> Tuple:
+        track = self.get_track(track_index)
+        clip_slots = self._clip_slots.get(track._live_ptr)
+        if clip_slots is None:
+            clip_slots = self._clip_slots[track._live_ptr] = tuple(track.clip_slots)
+            self._add_track_listener(track, "clip_slots", (self._clip_slots,))
+        return clip_slots
+
+    def get_clip_slot(self, track_index: int, clip_index: int):
+        return self.get_clip_slots(track_index)[clip_index]
+
+    def get_clip(self, track_index: int, clip_index: int):
+        return self.get_clip_slot(track_index, clip_index).clip
+
+    def get_devices(self, track_index: int) -> Tuple:
+        return self._get_track_devices(self.get_track(track_index))
+
+    def get_device(self, track_index: int, device_index: int):
+        return self.get_devices(track_index)[device_index]
+
+    #--------------------------------------------------------------------------------
+    # Reverse lookups
+    #--------------------------------------------------------------------------------
+    def get_track_position(self, track) -> Optional[Tuple[str, int]]:
+        """
+        Returns the (kind, index) of a track, where kind is "track", "return" or
+        "master", or None if the track is not in the song.
+        """
+        return self._get_track_positions().get(track._live_ptr)
+
+    def get_track_index(self, track) -> int:
+        """
+        Returns the index of a track within song.tracks.
+
+        Raises:
+            ValueError: if the track is not in song.tracks (for example, a return track).
+        """
+        position = self.get_track_position(track)
+        if position is None or position[0] != "track":
+            raise ValueError("Track is not in song.tracks: %s" % (position,))
+        return position[1]
+
+    def get_scene_index(self, scene) -> int:
+        """
+        Returns the index of a scene within song.scenes.
+
+        Raises:
+            ValueError: if the scene is not in the song.
+        """
+        try:
+            return self._get_scene_indices()[scene._live_ptr]
+        except KeyError:
+            raise ValueError("Scene is not in song.scenes")
+
+    def get_device_index(self, track, device) -> int:
+        """
+        Returns the index of a device within its track's devices. The track can be any
+        track of the song, including return and master tracks.
+
+        Raises:
+            ValueError: if the device is not on the track.
+        """
+        try:
+            return self._get_device_indices(track)[device._live_ptr]
+        except KeyError:
+            raise ValueError("Device is not on the track")
+
+    #--------------------------------------------------------------------------------
+    # Stable IDs.
+    #
+    # IDs are assigned to tracks, scenes and devices on request, keyed by _live_ptr,
+    # and are never reused. Each ID is resolved to the object's current indices via
+    # the identity maps above, so remains valid when the object is moved. IDs of
+    # deleted objects are dropped after the next structural change.
+    #--------------------------------------------------------------------------------
+    def get_object_id(self, kind: str, obj) -> int:
+        """
+        Returns the stable ID of a track, scene or device, assigning one if needed.
+
+        Args:
+            kind: "track", "scene" or "device".
+            obj: The Live object.
+        """
+        self._prune_object_ids()
+        object_id = self._object_ids.get(obj._live_ptr)
+        if object_id is None:
+            object_id = self._next_object_id
+            self._next_object_id += 1
+            #--------------------------------------------------------------------------------
+            # A device is resolved via its track, which is recorded here, as a device can't
+            # move to another track without being recreated.
+            #--------------------------------------------------------------------------------
+            track = obj.canonical_parent if kind == "device" else None
+            track_ptr = track._live_ptr if track is not None else None
+            self._object_ids[obj._live_ptr] = object_id
+            self._objects_by_id[object_id] = (kind, obj._live_ptr, track, track_ptr)
+        return object_id
+
+    def get_indices_by_id(self, kind: str, object_id: int) -> Tuple[int, ...]:
+        """
+        Returns the current indices of the object with the given ID: (track_index,)
+        for a track, (scene_index,) for a scene, or (track_index, device_index) for
+        a device.
+
+        Raises:
+            ValueError: if the ID is unknown, is not of the given kind, or refers to an
+                        object that has been deleted.
+        """
+        self._prune_object_ids()
+        entry = self._objects_by_id.get(object_id)
+        if entry is None or entry[0] != kind:
+            raise ValueError("Unknown %s ID: %d" % (kind, object_id))
+        indices = self._get_object_indices(*entry)
+        if indices is None:
+            raise ValueError("The %s with ID %d has been deleted" % (kind, object_id))
+        return indices
+
+    def invalidate(self) -> None:
+        """
+        Discard all cached objects.
+        """
+        self._tracks = None
+        self._scenes = None
+        self._track_positions = None
+        self._scene_indices = None
+        self._is_structure_stale = True
+        self._are_object_ids_stale = True
+
+    def clear(self) -> None:
+        """
+        Discard all cached objects and remove all listeners.
+        """
+        self.invalidate()
+        self._clear_track_caches()
+        for target, prop, callback in self._song_listeners:
+            self._remove_listener(target, prop, callback)
+        self._song_listeners = []
+
+    def _create_song_callback(self, prop: str) -> Callable:
+        def song_structure_changed_callback():
+            if prop == "scenes":
+                #--------------------------------------------------------------------------------
+                # Adding or removing a scene also changes the clip slots of every track.
+                #--------------------------------------------------------------------------------
+                self._scenes = None
+                self._scene_indices = None
+            else:
+                self._tracks = None
+                self._track_positions = None
+            #--------------------------------------------------------------------------------
+            # Per-track caches are cleared on the next lookup, as a deleted track's _live_ptr
+            # may be reused by a new track.
+            #--------------------------------------------------------------------------------
+            self._is_structure_stale = True
+            self._are_object_ids_stale = True
+        return song_structure_changed_callback
+
+    def _get_track_positions(self) -> dict:
+        if self._is_structure_stale:
+            self._clear_track_caches()
+        if self._track_positions is None:
+            positions = {}
+            for track_index, other_track in enumerate(self.tracks):
+                positions[other_track._live_ptr] = ("track", track_index)
+            for track_index, other_track in enumerate(self.song.return_tracks):
+                positions[other_track._live_ptr] = ("return", track_index)
+            positions[self.song.master_track._live_ptr] = ("master", 0)
+            self._track_positions = positions
+        return self._track_positions
+
+    def _get_scene_indices(self) -> dict:
+        if self._scene_indices is None:
+            self._scene_indices = {other_scene._live_ptr: scene_index
+                                   for scene_index, other_scene in enumerate(self.scenes)}
+        return self._scene_indices
+
+    def _get_device_indices(self, track) -> dict:
+        devices = self._get_track_devices(track)
+        device_indices = self._device_indices.get(track._live_ptr)
+        if device_indices is None:
+            device_indices = self._device_indices[track._live_ptr] = \
+                {other_device._live_ptr: device_index for device_index, other_device in enumerate(devices)}
+        return device_indices
+
+    def _get_object_indices(self, kind: str, live_ptr: int, track, track_ptr: Optional[int]) -> Optional[Tuple[int, ...]]:
+        """
+        Returns the current indices of an object given its ID entry, or None if it
+        is no longer in the song.
+        """
+        if kind == "scene":
+            scene_index = self._get_scene_indices().get(live_ptr)
+            return None if scene_index is None else (scene_index,)
+        if kind == "track":
+            position = self._get_track_positions().get(live_ptr)
+            return None if position is None or position[0] != "track" else (position[1],)
+        if kind == "device":
+            position = self._get_track_positions().get(track_ptr)
+            if position is None or position[0] != "track":
+                return None
+            device_index = self._get_device_indices(track).get(live_ptr)
+            return None if device_index is None else (position[1], device_index)
+        raise ValueError("Unknown object kind: %s" % kind)
+
+    def _prune_object_ids(self) -> None:
+        """
+        Drop the IDs of objects that have been deleted, after a structural change.
+        """
+        if not self._are_object_ids_stale:
+            return
+        self._are_object_ids_stale = False
+        for object_id, entry in list(self._objects_by_id.items()):
+            if self._get_object_indices(*entry) is None:
+                del self._objects_by_id[object_id]
+                del self._object_ids[entry[1]]
+
+    def _get_track_devices(self, track) -> Tuple:
+        if self._is_structure_stale:
+            self._clear_track_caches()
+        devices = self._devices.get(track._live_ptr)
+        if devices is None:
+            devices = self._devices[track._live_ptr] = tuple(track.devices)
+            self._add_track_listener(track, "devices", (self._devices, self._device_indices))
+        return devices
+
+    def _add_track_listener(self, track, prop: str, caches: Tuple[dict, ...]) -> None:
+        """
+        Add a listener that discards the track's entries in `caches` when the track's
+        `prop` changes, unless one has already been added.
+        """
+        key = (track._live_ptr, prop)
+        if key in self._track_listeners:
+            return
+
+        def track_structure_changed_callback():
+            for cache in caches:
+                cache.pop(track._live_ptr, None)
+            self._are_object_ids_stale = True
+        self._add_listener(track, prop, track_structure_changed_callback)
+        self._track_listeners[key] = (track, track_structure_changed_callback)
+
+    def _clear_track_caches(self) -> None:
+        for (live_ptr, prop), (track, callback) in self._track_listeners.items():
+            self._remove_listener(track, prop, callback)
+        self._track_listeners = {}
+        self._clip_slots = {}
+        self._devices = {}
+        self._device_indices = {}
+        self._is_structure_stale = False
+
+    def _add_listener(self, target, prop: str, callback: Callable) -> None:
+        getattr(target, "add_%s_listener" % prop)(callback)
+
+    def _remove_listener(self, target, prop: str, callback: Callable) -> None:
+        try:
+            getattr(target, "remove_%s_listener" % prop)(callback)
+        except Exception as e:
+            #--------------------------------------------------------------------------------
+            # Benign if the track has since been deleted (see AbletonOSCHandler._remove_listener).
+            #--------------------------------------------------------------------------------
+            self.logger.info("Exception whilst removing %s listener (likely benign): %s" % (prop, e))
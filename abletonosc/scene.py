@@ -6,6 +6,7 @@ class SceneHandler(AbletonOSCHandler):
     def __init__(self, manager):
         super().__init__(manager)
         self.class_identifier = "scene"
+        self.listener_id_count = 1
 
     def init_api(self):
         # TODO: Needs unit tests
@@ -13,7 +14,7 @@ class SceneHandler(AbletonOSCHandler):
         def create_scene_callback(func, *args, include_ids: bool = False):
             def scene_callback(params: Tuple[Any]):
                 scene_index = int(params[0])
-                scene = self.song.scenes[scene_index]
+                scene = self.resolver.get_scene(scene_index)
                 if (include_ids):
                     rv = func(scene, *args, params[0:])
                 else:
@@ -56,6 +57,15 @@ class SceneHandler(AbletonOSCHandler):
         for prop in properties_rw:
             self.osc_server.add_handler("/live/scene/set/%s" % prop,
                                         create_scene_callback(self._set_property, prop))
+
+        #--------------------------------------------------------------------------------
+        # Stable scene IDs, and /live/scene@id/... addresses (see _add_id_handlers)
+        #--------------------------------------------------------------------------------
+        def scene_get_id(scene, _):
+            return self.resolver.get_object_id("scene", scene),
+
+        self.osc_server.add_handler("/live/scene/get/id", create_scene_callback(scene_get_id))
+        self._add_id_handlers("scene")
         
         #------------------------------------------------------------------------------------------------
         # The Live API does not have a `fire_selected` Scene method (or class method accessible from Python).
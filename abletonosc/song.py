@@ -104,6 +104,10 @@ class SongHandler(AbletonOSCHandler):
             return tuple(self.song.tracks[index].name for index in range(track_index_min, track_index_max))
         self.osc_server.add_handler("/live/song/get/track_names", song_get_track_names)
 
+        def song_get_track_ids(params):
+            return tuple(self.resolver.get_object_id("track", track) for track in self.resolver.tracks)
+        self.osc_server.add_handler("/live/song/get/track_ids", song_get_track_ids)
+
         def song_get_track_data(params):
             """
             Retrieve one more properties of a block of tracks and their clips.
@@ -124,10 +128,10 @@ class SongHandler(AbletonOSCHandler):
             self.logger.info("Getting track data: %s (tracks %d..%d)" %
                              (properties, track_index_min, track_index_max))
             if track_index_max == -1:
-                track_index_max = len(self.song.tracks)
+                track_index_max = len(self.resolver.tracks)
             rv = []
             for track_index in range(track_index_min, track_index_max):
-                track = self.song.tracks[track_index]
+                track = self.resolver.get_track(track_index)
                 for prop in properties:
                     obj, property_name = prop.split(".")
                     if obj == "track":
@@ -139,7 +143,7 @@ class SongHandler(AbletonOSCHandler):
                                 #--------------------------------------------------------------------------------
                                 # Map Track objects to their track_index to return via OSC
                                 #--------------------------------------------------------------------------------
-                                value = list(self.song.tracks).index(value)
+                                value = self.resolver.get_track_index(value)
                         rv.append(value)
                     elif obj == "clip":
                         for clip_slot in track.clip_slots:
@@ -161,10 +165,10 @@ class SongHandler(AbletonOSCHandler):
 
         def song_export_structure(params):
             tracks = []
-            for track_index, track in enumerate(self.song.tracks):
+            for track_index, track in enumerate(self.resolver.tracks):
                 group_track = None
                 if track.group_track is not None:
-                    group_track = list(self.song.tracks).index(track.group_track)
+                    group_track = self.resolver.get_track_index(track.group_track)
                 track_data = {
                     "index": track_index,
                     "name": track.name,
@@ -231,6 +235,10 @@ class SongHandler(AbletonOSCHandler):
             return tuple(self.song.scenes[index].name for index in range(scene_index_min, scene_index_max))
         self.osc_server.add_handler("/live/song/get/scenes/name", song_get_scene_names)
 
+        def song_get_scene_ids(params):
+            return tuple(self.resolver.get_object_id("scene", scene) for scene in self.resolver.scenes)
+        self.osc_server.add_handler("/live/song/get/scene_ids", song_get_scene_ids)
+
         #--------------------------------------------------------------------------------
         # Callbacks for Song: Cue point properties
         #--------------------------------------------------------------------------------
@@ -257,32 +265,26 @@ class SongHandler(AbletonOSCHandler):
         self.last_song_time = -1.0
         
         def stop_beat_listener(params: Tuple[Any] = ()):
-            try:
-                self.song.remove_current_song_time_listener(self.current_song_time_changed)
-                self.logger.info("Removing beat listener")
-            except:
-                pass
+            self._remove_listener_client(("beat", ()), self.osc_server.remote_addr)
 
         def start_beat_listener(params: Tuple[Any] = ()):
-            stop_beat_listener()
+            _, throttle = self._split_listen_params(params)
             self.logger.info("Adding beat listener")
-            self.song.add_current_song_time_listener(self.current_song_time_changed)
+            self._add_listener(("beat", ()), self.song, "current_song_time", self.current_song_time_changed, throttle)
 
         self.osc_server.add_handler("/live/song/start_listen/beat", start_beat_listener)
         self.osc_server.add_handler("/live/song/stop_listen/beat", stop_beat_listener)
 
     def current_song_time_changed(self):
         #--------------------------------------------------------------------------------
-        # If song has rewound or skipped to next beat, sent a /live/beat message
+        # If song has rewound or skipped to next beat, sent a /live/beat message. A beat
+        # dropped by a subscriber's max_rate is sent as the current beat when replayed
+        # (see _send_pending_updates).
         #--------------------------------------------------------------------------------
         if (self.song.current_song_time < self.last_song_time) or \
-                (int(self.song.current_song_time) > int(self.last_song_time)):
-            self.osc_server.send("/live/song/get/beat", (int(self.song.current_song_time),))
+                (int(self.song.current_song_time) > int(self.last_song_time)) or \
+                self._pending_update_clients is not None:
+            beat = (int(self.song.current_song_time),)
+            for remote_addr in self._get_listener_recipients(("beat", ()), beat):
+                self.osc_server.send("/live/song/get/beat", beat, remote_addr)
         self.last_song_time = self.song.current_song_time
-
-    def clear_api(self):
-        super().clear_api()
-        try:
-            self.song.remove_current_song_time_listener(self.current_song_time_changed)
-        except:
-            pass
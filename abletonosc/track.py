@@ -1,11 +1,13 @@
 from typing import Tuple, Any, Callable, Optional
 from .handler import AbletonOSCHandler
+from .packed import split_packed_flag, pack_column
 
 
 class TrackHandler(AbletonOSCHandler):
     def __init__(self, manager):
         super().__init__(manager)
         self.class_identifier = "track"
+        self.listener_id_count = 1
 
     def init_api(self):
         def create_track_callback(func: Callable,
@@ -13,12 +15,12 @@ class TrackHandler(AbletonOSCHandler):
                                   include_track_id: bool = False):
             def track_callback(params: Tuple[Any]):
                 if params[0] == "*":
-                    track_indices = list(range(len(self.song.tracks)))
+                    track_indices = list(range(len(self.resolver.tracks)))
                 else:
                     track_indices = [int(params[0])]
 
                 for track_index in track_indices:
-                    track = self.song.tracks[track_index]
+                    track = self.resolver.get_track(track_index)
                     if include_track_id:
                         rv = func(track, *args, tuple([track_index] + params[1:]))
                     else:
@@ -129,7 +131,10 @@ class TrackHandler(AbletonOSCHandler):
         def track_get_clip_names(track, _):
             return tuple(clip_slot.clip.name if clip_slot.clip else None for clip_slot in track.clip_slots)
 
-        def track_get_clip_lengths(track, _):
+        def track_get_clip_lengths(track, params):
+            params, packed = split_packed_flag(params)
+            if packed:
+                return pack_column(clip_slot.clip.length if clip_slot.clip else None for clip_slot in track.clip_slots),
             return tuple(clip_slot.clip.length if clip_slot.clip else None for clip_slot in track.clip_slots)
 
         def track_get_clip_colors(track, _):
@@ -289,10 +294,10 @@ class TrackHandler(AbletonOSCHandler):
         def track_get_group_track_index(track, _):
             """Get the index of the parent group track"""
             if hasattr(track, 'group_track') and track.group_track:
-                # Find the index of the group track
-                for i, t in enumerate(self.song.tracks):
-                    if t == track.group_track:
-                        return i,
+                try:
+                    return self.resolver.get_track_index(track.group_track),
+                except ValueError:
+                    pass
             return -1,
 
         def track_get_num_take_lanes(track, _):
@@ -329,7 +334,7 @@ class TrackHandler(AbletonOSCHandler):
             if hasattr(track, 'view') and hasattr(track.view, 'selected_device'):
                 if track.view.selected_device:
                     try:
-                        device_index = list(track.devices).index(track.view.selected_device)
+                        device_index = self.resolver.get_device_index(track, track.view.selected_device)
                         return device_index,
                     except ValueError:
                         pass
@@ -401,6 +406,15 @@ class TrackHandler(AbletonOSCHandler):
         self.osc_server.add_handler("/live/track/view/set/is_collapsed", 
                                    create_track_callback(track_view_set_is_collapsed))
 
+        #--------------------------------------------------------------------------------
+        # Stable track IDs, and /live/track@id/... addresses (see _add_id_handlers)
+        #--------------------------------------------------------------------------------
+        def track_get_id(track, _):
+            return self.resolver.get_object_id("track", track),
+
+        self.osc_server.add_handler("/live/track/get/id", create_track_callback(track_get_id))
+        self._add_id_handlers("track")
+
     def _set_mixer_property(self, target, prop, params: Tuple) -> None:
         parameter_object = getattr(target.mixer_device, prop)
         self.logger.info("Setting property for %s: %s (new value %s)" % (self.class_identifier, prop, params[0]))
@@ -412,33 +426,29 @@ class TrackHandler(AbletonOSCHandler):
         return parameter_object.value,
 
     def _start_mixer_listen(self, target, prop, params: Optional[Tuple] = ()) -> None:
+        params, throttle = self._split_listen_params(params)
         parameter_object = getattr(target.mixer_device, prop)
-        def property_changed_callback():
-            value = parameter_object.value
-            self.logger.info("Property %s changed of %s %s: %s" % (prop, self.class_identifier, str(params), value))
-            osc_address = "/live/%s/get/%s" % (self.class_identifier, prop)
-            self.osc_server.send(osc_address, (*params, value,))
+        osc_address, params = self._get_listener_address("/live/%s/get/%s" % (self.class_identifier, prop), params)
+        listener_key = self._get_listener_key(prop, params)
 
-        listener_key = (prop, tuple(params))
-        if listener_key in self.listener_functions:
-            self._stop_mixer_listen(target, prop, params)
+        def property_changed_callback():
+            value = (parameter_object.value,)
+            recipients = self._get_listener_recipients(listener_key, value)
+            if recipients:
+                self.logger.info("Property %s changed of %s %s: %s" % (prop, self.class_identifier, str(params), value[0]))
+            for remote_addr in recipients:
+                self.osc_server.send_update(osc_address, params, value, remote_addr)
 
         self.logger.info("Adding listener for %s %s, property: %s" % (self.class_identifier, str(params), prop))
-
-        parameter_object.add_value_listener(property_changed_callback)
-        self.listener_functions[listener_key] = property_changed_callback
+        self._add_listener(listener_key, parameter_object, "value", property_changed_callback, throttle)
         #--------------------------------------------------------------------------------
-        # Immediately send the current value
+        # Immediately send the current value to the client that requested it
         #--------------------------------------------------------------------------------
-        property_changed_callback()
+        remote_addr = self.osc_server.remote_addr
+        value = (parameter_object.value,)
+        if remote_addr in self._get_listener_recipients(listener_key, value, remote_addr):
+            self.osc_server.send_update(osc_address, params, value, remote_addr)
 
     def _stop_mixer_listen(self, target, prop, params: Optional[Tuple[Any]] = ()) -> None:
-        parameter_object = getattr(target.mixer_device, prop)
-        listener_key = (prop, tuple(params))
-        if listener_key in self.listener_functions:
-            self.logger.info("Removing listener for %s %s, property %s" % (self.class_identifier, str(params), prop))
-            listener_function = self.listener_functions[listener_key]
-            parameter_object.remove_value_listener(listener_function)
-            del self.listener_functions[listener_key]
-        else:
-            self.logger.warning("No listener function found for property: %s (%s)" % (prop, str(params)))
+        _, params = self._get_listener_address(None, tuple(params)[:self.listener_id_count])
+        self._remove_listener_client(self._get_listener_key(prop, params), self.osc_server.remote_addr)
@@ -9,29 +9,30 @@ class ViewHandler(AbletonOSCHandler):
 
     def init_api(self):
         def get_selected_scene(params: Optional[Tuple] = ()):
-            return (list(self.song.scenes).index(self.song.view.selected_scene),)
+            return (self.resolver.get_scene_index(self.song.view.selected_scene),)
 
         def get_selected_track(params: Optional[Tuple] = ()):
-            return (list(self.song.tracks).index(self.song.view.selected_track),)
+            return (self.resolver.get_track_index(self.song.view.selected_track),)
 
         def get_selected_clip(params: Optional[Tuple] = ()):
             return (get_selected_track()[0], get_selected_scene()[0])
         
         def get_selected_device(params: Optional[Tuple] = ()):
-            return (get_selected_track()[0], list(self.song.view.selected_track.devices).index(self.song.view.selected_track.view.selected_device))
+            selected_track = self.song.view.selected_track
+            return (get_selected_track()[0], self.resolver.get_device_index(selected_track, selected_track.view.selected_device))
 
         def set_selected_scene(params: Optional[Tuple] = ()):
-            self.song.view.selected_scene = self.song.scenes[params[0]]
+            self.song.view.selected_scene = self.resolver.get_scene(params[0])
 
         def set_selected_track(params: Optional[Tuple] = ()):
-            self.song.view.selected_track = self.song.tracks[params[0]]
+            self.song.view.selected_track = self.resolver.get_track(params[0])
 
         def set_selected_clip(params: Optional[Tuple] = ()):
             set_selected_track((params[0],))
             set_selected_scene((params[1],))
 
         def set_selected_device(params: Optional[Tuple] = ()):
-            device = self.song.tracks[params[0]].devices[params[1]]
+            device = self.resolver.get_device(params[0], params[1])
             self.song.view.select_device(device)
             return params[0], params[1]
 
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+#--------------------------------------------------------------------------------
+# Micro-benchmark of OSC message parsing, comparing the string parser in
+# pythonosc.parsing.osc_types with the previous byte-by-byte implementation,
+# which copied the tail of the datagram for each string parsed.
+#
+# Usage (from the AbletonOSC directory):
+#   python3 benchmarks/bench_osc_parsing.py
+#--------------------------------------------------------------------------------
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pythonosc.osc_message import OscMessage
+from pythonosc.osc_message_builder import OscMessageBuilder
+from pythonosc.parsing import osc_types
+
+MESSAGE_SIZES = [1024, 4096, 16384, 65536]
+
+def legacy_get_string(dgram: bytes, start_index: int):
+    """
+    The previous implementation of osc_types.get_string().
+    """
+    offset = 0
+    while dgram[start_index + offset] != 0:
+        offset += 1
+    if offset % 4 == 0:
+        offset += 4
+    else:
+        offset += (-offset % 4)
+    if offset > len(dgram[start_index:]):
+        raise osc_types.ParseError('Datagram is too short')
+    data_str = dgram[start_index:start_index + offset]
+    return data_str.replace(b'\x00', b'').decode('utf-8'), start_index + offset
+
+def build_message(size: int) -> bytes:
+    """
+    Build a message of around `size` bytes, with alternating int and string params,
+    like the reply to /live/song/get/track_data.
+    """
+    builder = OscMessageBuilder("/live/song/get/track_data")
+    index = 0
+    while len(builder.args) * 8 < size:
+        builder.add_arg(index)
+        builder.add_arg("Track %d" % index)
+        index += 1
+    return builder.build().dgram
+
+def parse_strings(get_string, dgram: bytes):
+    """
+    Parse the address, type tag and every string param of a message built by build_message().
+    """
+    address, index = get_string(dgram, 0)
+    type_tag, index = get_string(dgram, index)
+    params = []
+    for tag in type_tag[1:]:
+        if tag == "i":
+            index += 4
+        else:
+            value, index = get_string(dgram, index)
+            params.append(value)
+    return params
+
+def main():
+    print("%-10s %-8s %14s %14s %10s %16s" % ("size", "params", "legacy (us)", "current (us)", "speedup", "OscMessage (us)"))
+    for size in MESSAGE_SIZES:
+        dgram = build_message(size)
+        params = OscMessage(dgram).params
+        assert parse_strings(legacy_get_string, dgram) == parse_strings(osc_types.get_string, dgram) == params[1::2]
+
+        number = max(1, 65536 // size) * 10
+        legacy_time = min(timeit.repeat(lambda: parse_strings(legacy_get_string, dgram), number=number, repeat=3)) / number
+        current_time = min(timeit.repeat(lambda: parse_strings(osc_types.get_string, dgram), number=number, repeat=3)) / number
+        message_time = min(timeit.repeat(lambda: OscMessage(dgram), number=number, repeat=3)) / number
+        print("%-10d %-8d %14.1f %14.1f %9.1fx %16.1f" % (len(dgram), len(params),
+                                                         legacy_time * 1e6, current_time * 1e6,
+                                                         legacy_time / current_time, message_time * 1e6))
+
+if __name__ == "__main__":
+    main()
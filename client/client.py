@@ -1,6 +1,11 @@
+import sys
+import array
+import struct
 import argparse
+import socket
 import threading
-from pythonosc.udp_client import SimpleUDPClient, OscBundle, OscMessageBuilder
+from pythonosc import slip
+from pythonosc.udp_client import SimpleUDPClient, OscMessageBuilder
 from pythonosc.osc_bundle_builder import OscBundleBuilder
 from pythonosc.dispatcher import Dispatcher
 from pythonosc.osc_server import ThreadingOSCUDPServer
@@ -15,36 +20,147 @@ LOCAL_PORT = 11001
 #--------------------------------------------------------------------------------
 TICK_DURATION = 0.150
 
+#--------------------------------------------------------------------------------
+# Replies too large for a single UDP datagram are split into chunks sent to this
+# address, with params (chunk_id, chunk_index, chunk_count, address, *params).
+#--------------------------------------------------------------------------------
+CHUNK_ADDRESS = "/live/chunk"
+
+#--------------------------------------------------------------------------------
+# Maximum number of partially-received chunked replies to keep. If chunks are lost,
+# the oldest incomplete reply is discarded.
+#--------------------------------------------------------------------------------
+MAX_PENDING_CHUNKED_REPLIES = 64
+
+#--------------------------------------------------------------------------------
+# Bulk queries followed by the "packed" flag return each column of values as a blob,
+# with an 8-byte header (type "f" or "i", 3 padding bytes, uint32 count) followed by
+# big-endian float32 or int32 values.
+#--------------------------------------------------------------------------------
+PACKED_FLAG = "packed"
+PACKED_HEADER = struct.Struct(">c3xI")
+
+def unpack_array(blob: bytes) -> array.array:
+    """
+    Decode a packed-mode blob into an array.array of floats ("f") or ints ("i").
+    """
+    type_code, count = PACKED_HEADER.unpack_from(blob)
+    values = array.array(type_code.decode())
+    data = blob[PACKED_HEADER.size:PACKED_HEADER.size + count * values.itemsize]
+    if len(data) != count * values.itemsize:
+        raise ValueError("Packed column is too short (expected %d values)" % count)
+    values.frombytes(data)
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+def unpack_numpy(blob: bytes):
+    """
+    Decode a packed-mode blob into a NumPy array of float32 or int32 values.
+    Requires NumPy to be installed.
+    """
+    import numpy as np
+    type_code, count = PACKED_HEADER.unpack_from(blob)
+    dtype = ">f4" if type_code == b"f" else ">i4"
+    return np.frombuffer(blob, dtype=dtype, count=count, offset=PACKED_HEADER.size)
+
 class AbletonOSCClient:
-    def __init__(self, hostname="127.0.0.1", port=REMOTE_PORT, client_port=LOCAL_PORT):
+    def __init__(self, hostname="127.0.0.1", port=REMOTE_PORT, client_port=LOCAL_PORT, stream=False):
         """
         Create a client to connect to an Ableton OSC instance.
         Args:
             hostname: The remote host to connect to.
             port: The remote port to connect to. Defaults to 11000, the default AbletonOSC port.
             client_port: The local port to bind to. Defaults to 11001, the default AbletonOSC reply port.
+                         Unused in stream mode.
+            stream: If True, connect over TCP, with packets framed using SLIP (OSC 1.1).
+                    Replies are received over the same connection, so large replies are not
+                    limited by the maximum UDP datagram size.
         """
-        dispatcher = Dispatcher()
-        dispatcher.set_default_handler(self.handle_osc)
-        self.server = ThreadingOSCUDPServer(("0.0.0.0", client_port), dispatcher)
-        self.server_thread = threading.Thread(target=self.server.serve_forever)
-        self.server_thread.daemon = True
-        self.server_thread.start()
+        self.dispatcher = Dispatcher()
+        self.dispatcher.set_default_handler(self.handle_osc)
         self.address_handlers = {}
-        self.client = SimpleUDPClient(hostname, port)
         self.verbose = False
+        self.stream = stream
+        self.chunks = {}
+        self.chunks_lock = threading.Lock()
+        if stream:
+            self.server = None
+            self.client = None
+            self.socket = socket.create_connection((hostname, port))
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.server_thread = threading.Thread(target=self.read_stream)
+        else:
+            self.socket = None
+            self.server = ThreadingOSCUDPServer(("0.0.0.0", client_port), self.dispatcher)
+            self.client = SimpleUDPClient(hostname, port)
+            self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def read_stream(self):
+        """
+        Read SLIP-framed packets from the stream connection until it is closed,
+        passing each to the dispatcher.
+        """
+        buffer = b""
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except OSError:
+                break
+            if not data:
+                break
+            packets, buffer = slip.split_frames(buffer + data)
+            for packet in packets:
+                self.dispatcher.call_handlers_for_packet(packet, self.socket.getpeername())
 
     def handle_osc(self, address, *params):
         # print("Received OSC: %s %s" % (address, params))
+        if address == CHUNK_ADDRESS:
+            self.handle_chunk(*params)
+            return
         if address in self.address_handlers:
             self.address_handlers[address](address, params)
         if self.verbose:
             print(address, params)
 
+    def handle_chunk(self, chunk_id, chunk_index, chunk_count, address, *params):
+        """
+        Store a chunk of a reply that was too large for a single datagram. Once all of
+        its chunks have been received, the reassembled reply is handled as normal.
+        """
+        with self.chunks_lock:
+            if chunk_id not in self.chunks:
+                if len(self.chunks) >= MAX_PENDING_CHUNKED_REPLIES:
+                    del self.chunks[next(iter(self.chunks))]
+                self.chunks[chunk_id] = [None] * chunk_count
+            chunks = self.chunks[chunk_id]
+            chunks[chunk_index] = params
+            if any(chunk is None for chunk in chunks):
+                return
+            del self.chunks[chunk_id]
+        self.handle_osc(address, *(param for chunk in chunks for param in chunk))
+
     def stop(self):
-        self.server.shutdown()
-        self.server_thread.join()
-        self.server = None
+        if self.stream:
+            self.socket.shutdown(socket.SHUT_RDWR)
+            self.socket.close()
+            self.server_thread.join()
+            self.socket = None
+        else:
+            self.server.shutdown()
+            self.server_thread.join()
+            self.server = None
+
+    def send(self, content):
+        """
+        Send an OscMessage or OscBundle to the server.
+        """
+        if self.stream:
+            self.socket.sendall(slip.encode(content.dgram))
+        else:
+            self.client.send(content)
 
     def send_bundle(self,
                     messages: list[tuple[str, tuple]]):
@@ -59,7 +175,7 @@ class AbletonOSCClient:
             msg = builder.build()
             bundle_builder.add_content(msg)
         bundle = bundle_builder.build()
-        self.client.send(bundle)
+        self.send(bundle)
 
     def send_message(self,
                      address: str,
@@ -71,7 +187,13 @@ class AbletonOSCClient:
             address (str): The OSC address to send to (e.g. /live/song/set/tempo)
             params (Iterable): Optional list of arguments to pass to the OSC message.
         """
-        self.client.send_message(address, params)
+        if self.stream:
+            builder = OscMessageBuilder(address=address)
+            for param in params:
+                builder.add_arg(param)
+            self.send(builder.build())
+        else:
+            self.client.send_message(address, params)
 
     def set_handler(self,
                     address: str,
@@ -153,8 +275,29 @@ class AbletonOSCClient:
             raise RuntimeError("No response received to query: %s" % address)
         return rv
 
+    def query_packed(self,
+                     address: str,
+                     params: tuple = (),
+                     numpy: bool = False,
+                     timeout: float = TICK_DURATION):
+        """
+        Query a bulk endpoint in packed mode, decoding each packed column in the reply.
+
+        Args:
+            address: OSC query (and reply) address (e.g. /live/clip/get/notes)
+            params: Query params, to which the "packed" flag is appended
+            numpy: If True, decode columns to NumPy arrays, rather than array.array
+            timeout: Maximum number of seconds to wait for a reply
+
+        Returns:
+            The reply params, with each packed column replaced by its decoded array
+        """
+        rv = self.query(address, (*params, PACKED_FLAG), timeout)
+        unpack = unpack_numpy if numpy else unpack_array
+        return tuple(unpack(param) if isinstance(param, bytes) else param for param in rv)
+
 def main(args):
-    client = AbletonOSCClient(args.hostname, args.port)
+    client = AbletonOSCClient(args.hostname, args.port, stream=args.stream)
     client.send_message("/live/song/set/tempo", [125.0])
     tempo = client.query("/live/song/get/tempo")
     print("Got song tempo: %.1f" % tempo[0])
@@ -162,6 +305,7 @@ def main(args):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Client for AbletonOSC")
     parser.add_argument("--hostname", type=str, default="127.0.0.1")
-    parser.add_argument("--port", type=str, default=11000)
+    parser.add_argument("--port", type=int, default=11000)
+    parser.add_argument("--stream", action="store_true", help="Connect over TCP rather than UDP")
     args = parser.parse_args()
     main(args)
@@ -77,11 +77,43 @@ class Manager(ControlSurface):
             assert log_level in ("debug", "info", "warning", "error", "critical")
             self.log_level = log_level
             self.log_file_handler.setLevel(self.log_level.upper())
+        def get_tick_budget_callback(params):
+            return (self.osc_server.tick_time_budget, self.osc_server.tick_max_messages)
+        def set_tick_budget_callback(params):
+            time_budget = float(params[0])
+            max_messages = int(params[1]) if len(params) > 1 else self.osc_server.tick_max_messages
+            if time_budget <= 0 or max_messages <= 0:
+                raise ValueError("Tick budget must be positive (got %s, %s)" % (time_budget, max_messages))
+            self.osc_server.tick_time_budget = time_budget
+            self.osc_server.tick_max_messages = max_messages
+        def heartbeat_callback(params):
+            self.osc_server.heartbeat()
+            return ()
+        def get_heartbeat_timeout_callback(params):
+            return (self.osc_server.heartbeat_timeout,)
+        def set_heartbeat_timeout_callback(params):
+            self.osc_server.heartbeat_timeout = float(params[0])
+        def get_tick_stats_callback(params):
+            return (self.osc_server.messages_processed,
+                    self.osc_server.messages_deferred,
+                    self.osc_server.ticks_deferred,
+                    self.osc_server.num_pending)
 
         self.osc_server.add_handler("/live/test", test_callback)
         self.osc_server.add_handler("/live/api/reload", reload_callback)
         self.osc_server.add_handler("/live/api/get/log_level", get_log_level_callback)
         self.osc_server.add_handler("/live/api/set/log_level", set_log_level_callback)
+        self.osc_server.add_handler("/live/api/get/tick_budget", get_tick_budget_callback)
+        self.osc_server.add_handler("/live/api/set/tick_budget", set_tick_budget_callback)
+        self.osc_server.add_handler("/live/api/get/tick_stats", get_tick_stats_callback)
+        self.osc_server.add_handler("/live/api/heartbeat", heartbeat_callback)
+        self.osc_server.add_handler("/live/api/get/heartbeat_timeout", get_heartbeat_timeout_callback)
+        self.osc_server.add_handler("/live/api/set/heartbeat_timeout", set_heartbeat_timeout_callback)
+
+        #--------------------------------------------------------------------------------
+        # Cache of the song's tracks, scenes, clip slots and devices, shared by all handlers.
+        #--------------------------------------------------------------------------------
+        self.resolver = abletonosc.ObjectResolver(self.song)
 
         with self.component_guard():
             self.handlers = [
@@ -100,6 +132,7 @@ class Manager(ControlSurface):
         self.osc_server.clear_handlers()
         for handler in self.handlers:
             handler.clear_api()
+        self.resolver.clear()
 
     def tick(self):
         """
@@ -109,17 +142,45 @@ class Manager(ControlSurface):
         processes such as the OSC server to perform operations.
         """
         logger.debug("Tick...")
-        self.osc_server.process()
-        self.schedule_message(1, self.tick)
+        #--------------------------------------------------------------------------------
+        # Each step is run independently, and the next tick is always scheduled, so that an
+        # error in one step doesn't stop listeners and queued replies until reload.
+        #--------------------------------------------------------------------------------
+        steps = [self.osc_server.process]
+        steps += [handler.tick for handler in self.handlers]
+        steps += [self.osc_server.flush, self.clear_expired_clients]
+        try:
+            for step in steps:
+                try:
+                    step()
+                except Exception as e:
+                    logger.error("AbletonOSC: Error in tick: %s" % e)
+                    logger.warning("AbletonOSC: %s" % traceback.format_exc())
+        finally:
+            self.schedule_message(1, self.tick)
+
+    def clear_expired_clients(self):
+        """
+        Remove the listeners of any client that has sent a heartbeat but has since gone silent.
+        """
+        for remote_addr in self.osc_server.get_expired_clients():
+            logger.info("Client %s timed out, removing its listeners" % str(remote_addr))
+            for handler in self.handlers:
+                handler._clear_listeners(remote_addr)
 
     def reload_imports(self):
         try:
+            #--------------------------------------------------------------------------------
+            # packed is reloaded first, as the handlers import from it.
+            #--------------------------------------------------------------------------------
+            importlib.reload(abletonosc.packed)
             importlib.reload(abletonosc.application)
             importlib.reload(abletonosc.clip)
             importlib.reload(abletonosc.clip_slot)
             importlib.reload(abletonosc.device)
             importlib.reload(abletonosc.handler)
             importlib.reload(abletonosc.osc_server)
+            importlib.reload(abletonosc.resolver)
             importlib.reload(abletonosc.scene)
             importlib.reload(abletonosc.song)
             importlib.reload(abletonosc.track)
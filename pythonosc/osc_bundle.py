@@ -3,7 +3,7 @@ import logging
 from . import osc_message
 from .parsing import osc_types
 
-from typing import Any, Iterator, List, Union
+from typing import Any, Iterator, List, Tuple
 
 _BUNDLE_PREFIX = b"#bundle\x00"
 
@@ -16,6 +16,11 @@ class OscBundle(object):
     """Bundles elements that should be triggered at the same time.
 
     An element can be another OscBundle or an OscMessage.
+
+    Parsing a bundle only records the offset of each element in the datagram.
+    Elements are decoded when first accessed, so that a receiver can peek at the
+    address of each message (see content_address) and skip the ones it doesn't
+    handle without decoding their arguments.
     """
 
     def __init__(self, dgram: bytes) -> None:
@@ -34,36 +39,36 @@ class OscBundle(object):
             self._timestamp, index = osc_types.get_date(self._dgram, index)
         except osc_types.ParseError as pe:
             raise ParseError("Could not get the date from the datagram: %s" % pe)
-        # Get the contents as a list of OscBundle and OscMessage.
-        self._contents = self._parse_contents(index)
+        # Get the offsets of the contents, as (start, end, is_bundle) tuples.
+        self._offsets = self._parse_offsets(index)
+        self._contents = [None] * len(self._offsets)  # type: List[Any]
 
-    def _parse_contents(self, index: int) -> List[Union['OscBundle', osc_message.OscMessage]]:
-        contents = []  # type: List[Union[OscBundle, osc_message.OscMessage]]
+    def _parse_offsets(self, index: int) -> List[Tuple[int, int, bool]]:
+        offsets = []  # type: List[Tuple[int, int, bool]]
 
         try:
             # An OSC Bundle Element consists of its size and its contents.
             # The size is an int32 representing the number of 8-bit bytes in the
             # contents, and will always be a multiple of 4. The contents are either
             # an OSC Message or an OSC Bundle.
-            while self._dgram[index:]:
+            while index < len(self._dgram):
                 # Get the sub content size.
                 content_size, index = osc_types.get_int(self._dgram, index)
-                # Get the datagram for the sub content.
-                content_dgram = self._dgram[index:index + content_size]
-                # Increment our position index up to the next possible content.
-                index += content_size
-                # Parse the content into an OSC message or bundle.
-                if OscBundle.dgram_is_bundle(content_dgram):
-                    contents.append(OscBundle(content_dgram))
-                elif osc_message.OscMessage.dgram_is_message(content_dgram):
-                    contents.append(osc_message.OscMessage(content_dgram))
+                start, index = index, index + content_size
+                if content_size < 0 or index > len(self._dgram):
+                    raise ParseError("Content size %d exceeds the datagram" % content_size)
+                # Identify the content as an OSC message or bundle, without copying it.
+                if self._dgram.startswith(_BUNDLE_PREFIX, start, index):
+                    offsets.append((start, index, True))
+                elif self._dgram.startswith(b'/', start, index):
+                    offsets.append((start, index, False))
                 else:
                     logging.warning(
-                        "Could not identify content type of dgram %r" % content_dgram)
-        except (osc_types.ParseError, osc_message.ParseError, IndexError) as e:
+                        "Could not identify content type of dgram %r" % self._dgram[start:index])
+        except osc_types.ParseError as e:
             raise ParseError("Could not parse a content datagram: %s" % e)
 
-        return contents
+        return offsets
 
     @staticmethod
     def dgram_is_bundle(dgram: bytes) -> bool:
@@ -78,7 +83,7 @@ class OscBundle(object):
     @property
     def num_contents(self) -> int:
         """Shortcut for len(*bundle) returning the number of elements."""
-        return len(self._contents)
+        return len(self._offsets)
 
     @property
     def size(self) -> int:
@@ -91,9 +96,46 @@ class OscBundle(object):
         return self._dgram
 
     def content(self, index: int) -> Any:
-        """Returns the bundle's content 0-indexed."""
-        return self._contents[index]
+        """Returns the bundle's content 0-indexed, decoding it on first access.
+
+        Raises:
+          ParseError: if the content could not be parsed.
+        """
+        content = self._contents[index]
+        if content is None:
+            start, end, is_bundle = self._offsets[index]
+            try:
+                if is_bundle:
+                    content = OscBundle(self._dgram[start:end])
+                else:
+                    content = osc_message.OscMessage(self._dgram[start:end])
+            except osc_message.ParseError as e:
+                raise ParseError("Could not parse a content datagram: %s" % e)
+            self._contents[index] = content
+        return content
+
+    def content_is_bundle(self, index: int) -> bool:
+        """Returns whether the bundle's content 0-indexed is itself a bundle."""
+        return self._offsets[index][2]
+
+    def content_address(self, index: int) -> str:
+        """Returns the address of the bundle's message content 0-indexed,
+        without decoding its arguments.
+
+        Raises:
+          ParseError: if the address could not be parsed.
+        """
+        start, end, is_bundle = self._offsets[index]
+        if is_bundle:
+            raise ParseError("Content %d is a bundle, not a message" % index)
+        try:
+            address, address_end = osc_types.get_string(self._dgram, start)
+        except osc_types.ParseError as e:
+            raise ParseError("Could not parse a content address: %s" % e)
+        if address_end > end:
+            raise ParseError("Content address exceeds the content size")
+        return address
 
     def __iter__(self) -> Iterator[Any]:
         """Returns an iterator over the bundle's content."""
-        return iter(self._contents)
+        return (self.content(index) for index in range(len(self._offsets)))
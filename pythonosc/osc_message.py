@@ -1,15 +1,73 @@
 """Representation of an OSC message in a pythonesque way."""
 
+import functools
 import logging
+import struct
 
 from .parsing import osc_types
-from typing import List, Iterator, Any
+from typing import List, Iterator, Any, Optional, Tuple
+
+# Maximum number of distinct type tags whose decoders are cached.
+_DECODER_CACHE_SIZE = 256
+
+# Struct format characters of fixed-width types, which are decoded together.
+_FIXED_WIDTH_FORMATS = {'i': 'i', 'h': 'q', 'f': 'f', 'd': 'd', 'r': 'I'}
+
+# Types whose value is given by the type tag alone.
+_CONSTANT_VALUES = {'T': True, 'F': False, 'N': None}
+
+# Variable-width (or specially decoded) types, each decoded with its own getter.
+_GETTERS = {
+    's': osc_types.get_string,
+    'b': osc_types.get_blob,
+    'm': osc_types.get_midi,
+    't': osc_types.get_timetag,
+}
+
+# Kinds of step in a compiled decoder.
+_STEP_STRUCT = 0
+_STEP_CONSTANT = 1
+_STEP_GETTER = 2
 
 
 class ParseError(Exception):
     """Base exception raised when a datagram parsing error occurs."""
 
 
+@functools.lru_cache(maxsize=_DECODER_CACHE_SIZE)
+def _compile_decoder(type_tag: str) -> Optional[Tuple[Tuple[int, Any], ...]]:
+    """Compiles a decoder for the arguments of messages with the given type tag.
+
+    Each run of consecutive fixed-width arguments is decoded with a single
+    precompiled struct.Struct, and other arguments with their getter.
+
+    Args:
+      type_tag: The type tag, without its leading comma (e.g. 'iif').
+
+    Returns:
+      A tuple of (step kind, value) steps, or None if the type tag contains
+      arrays or unknown types, which are left to the generic parser.
+    """
+    steps = []
+    run = ''
+    for param in type_tag:
+        if param in _FIXED_WIDTH_FORMATS:
+            run += _FIXED_WIDTH_FORMATS[param]
+            continue
+        if run:
+            steps.append((_STEP_STRUCT, struct.Struct('>' + run)))
+            run = ''
+        if param in _CONSTANT_VALUES:
+            steps.append((_STEP_CONSTANT, _CONSTANT_VALUES[param]))
+        elif param in _GETTERS:
+            steps.append((_STEP_GETTER, _GETTERS[param]))
+        else:
+            return None
+    if run:
+        steps.append((_STEP_STRUCT, struct.Struct('>' + run)))
+    return tuple(steps)
+
+
 class OscMessage(object):
     """Representation of a parsed datagram representing an OSC message.
 
@@ -25,7 +83,7 @@ class OscMessage(object):
     def _parse_datagram(self) -> None:
         try:
             self._address_regexp, index = osc_types.get_string(self._dgram, 0)
-            if not self._dgram[index:]:
+            if index >= len(self._dgram):
                 # No params is legit, just return now.
                 return
 
@@ -34,6 +92,16 @@ class OscMessage(object):
             if type_tag.startswith(','):
                 type_tag = type_tag[1:]
 
+            decoder = _compile_decoder(type_tag)
+            if decoder is not None:
+                try:
+                    self._parameters = self._decode(decoder, index)
+                    return
+                except struct.error:
+                    # The datagram is too short for the type tag: fall back to the
+                    # generic parser, which pads short floats and reports other errors.
+                    pass
+
             params = []  # type: List[Any]
             param_stack = [params]
             # Parse each parameter given its type.
@@ -83,6 +151,21 @@ class OscMessage(object):
         except osc_types.ParseError as pe:
             raise ParseError('Found incorrect datagram, ignoring it', pe)
 
+    def _decode(self, decoder: Tuple[Tuple[int, Any], ...], index: int) -> List[Any]:
+        """Decodes the arguments of this message with a compiled decoder."""
+        dgram = self._dgram
+        params = []  # type: List[Any]
+        for kind, value in decoder:
+            if kind == _STEP_STRUCT:
+                params.extend(value.unpack_from(dgram, index))
+                index += value.size
+            elif kind == _STEP_CONSTANT:
+                params.append(value)
+            else:
+                val, index = value(dgram, index)
+                params.append(val)
+        return params
+
     @property
     def address(self) -> str:
         """Returns the OSC address regular expression."""
@@ -3,11 +3,38 @@
 from . import osc_message
 from .parsing import osc_types
 
+import functools
+import struct
+
 from typing import List, Tuple, Union, Any, Optional
 
 
 ArgValue = Union[str, bytes, bool, int, float, osc_types.MidiPacket, list]
 
+# Struct format characters of fixed-width argument types, which are packed in runs.
+_FIXED_WIDTH_FORMATS = {'i': 'i', 'h': 'q', 'f': 'f', 'd': 'd', 'r': 'I'}
+
+# Argument types that are encoded in the type tag alone, and so do not end a run.
+_NO_PAYLOAD_TYPES = frozenset('TFN[]')
+
+
+@functools.lru_cache(maxsize=256)
+def _get_struct(struct_format: str) -> struct.Struct:
+    """Returns a compiled Struct for a format string, cached across builds."""
+    return struct.Struct(struct_format)
+
+
+def _build_run(run_format: List[List[Any]], run_values: List[Any]) -> Tuple[struct.Struct, List[Any]]:
+    """Returns the Struct and values with which to pack a run of fixed-width arguments.
+
+    Args:
+      run_format: The run's format characters, as [format char, count] pairs, so
+                  that homogeneous runs use a compact format such as '>500f'.
+      run_values: The values of the arguments in the run.
+    """
+    return _get_struct('>' + ''.join('%d%s' % (count, format_char)
+                                     for format_char, count in run_format)), run_values
+
 
 class BuildError(Exception):
     """Error raised when an incomplete message is trying to be built."""
@@ -140,44 +167,60 @@ class OscMessageBuilder(object):
         """
         if not self._address:
             raise BuildError('OSC addresses cannot be empty')
-        dgram = b''
         try:
-            # Write the address.
-            dgram += osc_types.write_string(self._address)
-            if not self._args:
-                dgram += osc_types.write_string(',')
-                return osc_message.OscMessage(dgram)
-
-            # Write the parameters.
+            # Encode the address, type tag and variable-width arguments, and group
+            # consecutive fixed-width arguments into runs, each packed in one call.
             arg_types = "".join([arg[0] for arg in self._args])
-            dgram += osc_types.write_string(',' + arg_types)
+            pieces = [osc_types.write_string(self._address),
+                      osc_types.write_string(',' + arg_types)]  # type: List[Any]
+            size = len(pieces[0]) + len(pieces[1])
+            run_format = []  # type: List[List[Any]]
+            run_values = []  # type: List[Any]
             for arg_type, value in self._args:
+                if arg_type in _FIXED_WIDTH_FORMATS:
+                    format_char = _FIXED_WIDTH_FORMATS[arg_type]
+                    if run_format and run_format[-1][0] == format_char:
+                        run_format[-1][1] += 1
+                    else:
+                        run_format.append([format_char, 1])
+                    run_values.append(value)
+                    continue
+                if arg_type in _NO_PAYLOAD_TYPES:
+                    continue
+                if run_values:
+                    run = _build_run(run_format, run_values)
+                    pieces.append(run)
+                    size += run[0].size
+                    run_format, run_values = [], []
                 if arg_type == self.ARG_TYPE_STRING:
-                    dgram += osc_types.write_string(value)  # type: ignore[arg-type]
-                elif arg_type == self.ARG_TYPE_INT:
-                    dgram += osc_types.write_int(value)  # type: ignore[arg-type]
-                elif arg_type == self.ARG_TYPE_INT64:
-                    dgram += osc_types.write_int64(value)  # type: ignore[arg-type]
-                elif arg_type == self.ARG_TYPE_FLOAT:
-                    dgram += osc_types.write_float(value)  # type: ignore[arg-type]
-                elif arg_type == self.ARG_TYPE_DOUBLE:
-                    dgram += osc_types.write_double(value)  # type: ignore[arg-type]
+                    piece = osc_types.write_string(value)  # type: ignore[arg-type]
                 elif arg_type == self.ARG_TYPE_BLOB:
-                    dgram += osc_types.write_blob(value)  # type: ignore[arg-type]
-                elif arg_type == self.ARG_TYPE_RGBA:
-                    dgram += osc_types.write_rgba(value)  # type: ignore[arg-type]
+                    piece = osc_types.write_blob(value)  # type: ignore[arg-type]
                 elif arg_type == self.ARG_TYPE_MIDI:
-                    dgram += osc_types.write_midi(value)  # type: ignore[arg-type]
-                elif arg_type in (self.ARG_TYPE_TRUE,
-                                  self.ARG_TYPE_FALSE,
-                                  self.ARG_TYPE_ARRAY_START,
-                                  self.ARG_TYPE_ARRAY_STOP,
-                                  self.ARG_TYPE_NIL):
-                    continue
+                    piece = osc_types.write_midi(value)  # type: ignore[arg-type]
                 else:
                     raise BuildError('Incorrect parameter type found {}'.format(
                         arg_type))
-
-            return osc_message.OscMessage(dgram)
+                pieces.append(piece)
+                size += len(piece)
+            if run_values:
+                run = _build_run(run_format, run_values)
+                pieces.append(run)
+                size += run[0].size
+
+            # Write every piece into a single preallocated buffer.
+            dgram = bytearray(size)
+            index = 0
+            for piece in pieces:
+                if type(piece) is tuple:
+                    packer, values = piece
+                    packer.pack_into(dgram, index, *values)
+                    index += packer.size
+                else:
+                    dgram[index:index + len(piece)] = piece
+                    index += len(piece)
+            return osc_message.OscMessage(bytes(dgram))
+        except (struct.error, OverflowError) as e:
+            raise BuildError('Could not build the message: Wrong argument value passed: {}'.format(e))
         except osc_types.BuildError as be:
             raise BuildError('Could not build the message: {}'.format(be))
@@ -33,6 +33,14 @@ _STRING_DGRAM_PAD = 4
 _BLOB_DGRAM_PAD = 4
 _EMPTY_STR_DGRAM = b'\x00\x00\x00\x00'
 
+# Precompiled structs for fixed-size types, read in place with unpack_from.
+_INT_STRUCT = struct.Struct('>i')
+_INT64_STRUCT = struct.Struct('>q')
+_UINT64_STRUCT = struct.Struct('>Q')
+_UINT_STRUCT = struct.Struct('>I')
+_FLOAT_STRUCT = struct.Struct('>f')
+_DOUBLE_STRUCT = struct.Struct('>d')
+
 
 def write_string(val: str) -> bytes:
     """Returns the OSC string equivalent of the given python string.
@@ -69,28 +77,19 @@ def get_string(dgram: bytes, start_index: int) -> Tuple[str, int]:
     """
     if start_index < 0:
         raise ParseError('start_index < 0')
-    offset = 0
     try:
-        if (len(dgram) > start_index + _STRING_DGRAM_PAD
-                and dgram[start_index + _STRING_DGRAM_PAD] == _EMPTY_STR_DGRAM):
-            return '', start_index + _STRING_DGRAM_PAD
-        while dgram[start_index + offset] != 0:
-            offset += 1
-        # Align to a byte word.
-        if (offset) % _STRING_DGRAM_PAD == 0:
-            offset += _STRING_DGRAM_PAD
-        else:
-            offset += (-offset % _STRING_DGRAM_PAD)
-        # Python slices do not raise an IndexError past the last index,
-        # do it ourselves.
-        if offset > len(dgram[start_index:]):
-            raise ParseError('Datagram is too short')
-        data_str = dgram[start_index:start_index + offset]
-        return data_str.replace(b'\x00', b'').decode('utf-8'), start_index + offset
-    except IndexError as ie:
-        raise ParseError('Could not parse datagram %s' % ie)
+        # Find the terminating null in C, rather than scanning byte by byte.
+        end_index = dgram.index(b'\x00', start_index)
+    except ValueError:
+        raise ParseError('Could not parse datagram: string is not null-terminated')
     except TypeError as te:
         raise ParseError('Could not parse datagram %s' % te)
+    # The null is followed by 0-3 padding bytes, to align to a byte word.
+    length = end_index - start_index
+    next_index = start_index + length + _STRING_DGRAM_PAD - (length % _STRING_DGRAM_PAD)
+    if next_index > len(dgram):
+        raise ParseError('Datagram is too short')
+    return dgram[start_index:end_index].decode('utf-8'), next_index
 
 
 def write_int(val: int) -> bytes:
@@ -119,11 +118,10 @@ def get_int(dgram: bytes, start_index: int) -> Tuple[int, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _INT_DGRAM_LEN:
+        if len(dgram) - start_index < _INT_DGRAM_LEN:
             raise ParseError('Datagram is too short')
         return (
-            struct.unpack('>i',
-                          dgram[start_index:start_index + _INT_DGRAM_LEN])[0],
+            _INT_STRUCT.unpack_from(dgram, start_index)[0],
             start_index + _INT_DGRAM_LEN)
     except (struct.error, TypeError) as e:
         raise ParseError('Could not parse datagram %s' % e)
@@ -155,11 +153,10 @@ def get_int64(dgram: bytes, start_index: int) -> Tuple[int, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _INT64_DGRAM_LEN:
+        if len(dgram) - start_index < _INT64_DGRAM_LEN:
             raise ParseError('Datagram is too short')
         return (
-            struct.unpack('>q',
-                          dgram[start_index:start_index + _INT64_DGRAM_LEN])[0],
+            _INT64_STRUCT.unpack_from(dgram, start_index)[0],
             start_index + _INT64_DGRAM_LEN)
     except (struct.error, TypeError) as e:
         raise ParseError('Could not parse datagram %s' % e)
@@ -179,11 +176,10 @@ def get_uint64(dgram: bytes, start_index: int) -> Tuple[int, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _UINT64_DGRAM_LEN:
+        if len(dgram) - start_index < _UINT64_DGRAM_LEN:
             raise ParseError('Datagram is too short')
         return (
-            struct.unpack('>Q',
-                          dgram[start_index:start_index + _UINT64_DGRAM_LEN])[0],
+            _UINT64_STRUCT.unpack_from(dgram, start_index)[0],
             start_index + _UINT64_DGRAM_LEN)
     except (struct.error, TypeError) as e:
         raise ParseError('Could not parse datagram %s' % e)
@@ -204,7 +200,7 @@ def get_timetag(dgram: bytes, start_index: int) -> Tuple[Tuple[datetime, int], i
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _TIMETAG_DGRAM_LEN:
+        if len(dgram) - start_index < _TIMETAG_DGRAM_LEN:
             raise ParseError('Datagram is too short')
 
         timetag, _ = get_uint64(dgram, start_index)
@@ -246,15 +242,17 @@ def get_float(dgram: bytes, start_index: int) -> Tuple[float, int]:
     Raises:
       ParseError if the datagram could not be parsed.
     """
+    if start_index >= len(dgram):
+        raise ParseError('Could not parse datagram: no data for float at index %d' % start_index)
     try:
-        if len(dgram[start_index:]) < _FLOAT_DGRAM_LEN:
+        if len(dgram) - start_index < _FLOAT_DGRAM_LEN:
             # Noticed that Reaktor doesn't send the last bunch of \x00 needed to make
-            # the float representation complete in some cases, thus we pad here to
-            # account for that.
-            dgram = dgram + b'\x00' * (_FLOAT_DGRAM_LEN - len(dgram[start_index:]))
+            # the float representation complete in some cases, thus we pad a partial
+            # trailing word here to account for that.
+            dgram = dgram[start_index:] + b'\x00' * (_FLOAT_DGRAM_LEN - (len(dgram) - start_index))
+            return _FLOAT_STRUCT.unpack_from(dgram, 0)[0], start_index + _FLOAT_DGRAM_LEN
         return (
-            struct.unpack('>f',
-                          dgram[start_index:start_index + _FLOAT_DGRAM_LEN])[0],
+            _FLOAT_STRUCT.unpack_from(dgram, start_index)[0],
             start_index + _FLOAT_DGRAM_LEN)
     except (struct.error, TypeError) as e:
         raise ParseError('Could not parse datagram %s' % e)
@@ -286,11 +284,10 @@ def get_double(dgram: bytes, start_index: int) -> Tuple[float, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _DOUBLE_DGRAM_LEN:
+        if len(dgram) - start_index < _DOUBLE_DGRAM_LEN:
             raise ParseError('Datagram is too short')
         return (
-            struct.unpack('>d',
-                          dgram[start_index:start_index + _DOUBLE_DGRAM_LEN])[0],
+            _DOUBLE_STRUCT.unpack_from(dgram, start_index)[0],
             start_index + _DOUBLE_DGRAM_LEN)
     except (struct.error, TypeError) as e:
         raise ParseError('Could not parse datagram {}'.format(e))
@@ -318,7 +315,7 @@ def get_blob(dgram: bytes, start_index: int) -> Tuple[bytes, int]:
     # Make the size a multiple of 32 bits.
     total_size = size + (-size % _BLOB_DGRAM_PAD)
     end_index = int_offset + size
-    if end_index - start_index > len(dgram[start_index:]):
+    if end_index > len(dgram):
         raise ParseError('Datagram is too short.')
     return dgram[int_offset:int_offset + size], int_offset + total_size
 
@@ -360,7 +357,7 @@ def get_date(dgram: bytes, start_index: int) -> Tuple[float, int]:
     # Check for the special case first.
     if dgram[start_index:start_index + _TIMETAG_DGRAM_LEN] == ntp.IMMEDIATELY:
         return IMMEDIATELY, start_index + _TIMETAG_DGRAM_LEN
-    if len(dgram[start_index:]) < _TIMETAG_DGRAM_LEN:
+    if len(dgram) - start_index < _TIMETAG_DGRAM_LEN:
         raise ParseError('Datagram is too short')
     timetag, start_index = get_uint64(dgram, start_index)
     seconds = timetag * ntp._NTP_TIMESTAMP_TO_SECONDS
@@ -403,11 +400,10 @@ def get_rgba(dgram: bytes, start_index: int) -> Tuple[bytes, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _INT_DGRAM_LEN:
+        if len(dgram) - start_index < _INT_DGRAM_LEN:
             raise ParseError('Datagram is too short')
         return (
-            struct.unpack('>I',
-                          dgram[start_index:start_index + _INT_DGRAM_LEN])[0],
+            _UINT_STRUCT.unpack_from(dgram, start_index)[0],
             start_index + _INT_DGRAM_LEN)
     except (struct.error, TypeError) as e:
         raise ParseError('Could not parse datagram %s' % e)
@@ -445,10 +441,9 @@ def get_midi(dgram: bytes, start_index: int) -> Tuple[MidiPacket, int]:
       ParseError if the datagram could not be parsed.
     """
     try:
-        if len(dgram[start_index:]) < _INT_DGRAM_LEN:
+        if len(dgram) - start_index < _INT_DGRAM_LEN:
             raise ParseError('Datagram is too short')
-        val = struct.unpack('>I',
-                            dgram[start_index:start_index + _INT_DGRAM_LEN])[0]
+        val = _UINT_STRUCT.unpack_from(dgram, start_index)[0]
         midi_msg = cast(
             MidiPacket,
             tuple((val & 0xFF << 8 * i) >> 8 * i for i in range(3, -1, -1)))
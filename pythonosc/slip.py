@@ -0,0 +1,82 @@
+"""SLIP (RFC 1055) framing of OSC packets sent over stream transports such as TCP.
+
+OSC 1.1 specifies that packets sent over a stream are framed with SLIP, using
+the "double END" variant in which each packet both starts and ends with an END
+byte.
+"""
+
+from typing import List, Tuple
+
+END = b'\xc0'
+ESC = b'\xdb'
+ESC_END = b'\xdc'
+ESC_ESC = b'\xdd'
+
+
+class ProtocolError(ValueError):
+    """Raised when a SLIP packet is malformed."""
+
+
+def encode(msg: bytes) -> bytes:
+    """Encodes an OSC packet into a SLIP frame.
+
+    Args:
+      msg: The OSC packet (message or bundle datagram) to encode.
+
+    Returns:
+      The framed packet, delimited by END bytes.
+    """
+    return END + bytes(msg).replace(ESC, ESC + ESC_ESC).replace(END, ESC + ESC_END) + END
+
+
+def decode(packet: bytes) -> bytes:
+    """Decodes a SLIP frame into the OSC packet it contains.
+
+    Args:
+      packet: A SLIP frame, with or without its delimiting END bytes.
+
+    Returns:
+      The decoded OSC packet.
+
+    Raises:
+      ProtocolError: if the frame contains an END byte or an invalid escape sequence.
+    """
+    packet = bytes(packet).strip(END)
+    if END in packet:
+        raise ProtocolError('SLIP frame contains an unescaped END byte')
+    if ESC not in packet:
+        return packet
+
+    decoded = bytearray()
+    index = 0
+    while True:
+        escape_index = packet.find(ESC, index)
+        if escape_index == -1:
+            decoded += packet[index:]
+            return bytes(decoded)
+        decoded += packet[index:escape_index]
+        escaped = packet[escape_index + 1:escape_index + 2]
+        if escaped == ESC_END:
+            decoded += END
+        elif escaped == ESC_ESC:
+            decoded += ESC
+        else:
+            raise ProtocolError('Invalid SLIP escape sequence: %r' % (ESC + escaped))
+        index = escape_index + 2
+
+
+def split_frames(data: bytes) -> Tuple[List[bytes], bytes]:
+    """Splits a buffer of stream data into complete SLIP frames.
+
+    Args:
+      data: Bytes received from a stream, possibly ending part-way through a frame.
+
+    Returns:
+      A tuple containing the list of decoded OSC packets, and the trailing bytes of
+      any incomplete frame, which should be prepended to the next data received.
+
+    Raises:
+      ProtocolError: if a complete frame is malformed.
+    """
+    *frames, remainder = bytes(data).split(END)
+    return [decode(frame) for frame in frames if frame], remainder
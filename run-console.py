@@ -55,6 +55,12 @@ def main(args):
         "/live/api/reload",
         "/live/api/get/log_level",
         "/live/api/set/log_level",
+        "/live/api/get/tick_budget",
+        "/live/api/set/tick_budget",
+        "/live/api/get/tick_stats",
+        "/live/api/heartbeat",
+        "/live/api/get/heartbeat_timeout",
+        "/live/api/set/heartbeat_timeout",
         "/live/startup",
         "/live/error",
         "/live/song/capture_midi",
@@ -125,6 +131,8 @@ def main(args):
         "/live/song/get/num_scenes",
         "/live/song/get/num_tracks",
         "/live/song/get/track_names",
+        "/live/song/get/track_ids",
+        "/live/song/get/scene_ids",
         "/live/song/get/track_data",
         "/live/song/start_listen/beat",
         "/live/song/stop_listen/beat",
@@ -169,6 +177,7 @@ def main(args):
         "/live/track/get/is_visible",
         "/live/track/get/mute",
         "/live/track/get/name",
+        "/live/track/get/id",
         "/live/track/get/panning",
         "/live/track/get/playing_slot_index",
         "/live/track/get/send",
@@ -209,8 +218,30 @@ def main(args):
         "/live/clip/stop",
         "/live/clip/duplicate_loop",
         "/live/clip/get/notes",
+        "/live/clip/get/notes/hash",
+        "/live/clip/get/notes/page",
+        "/live/clip/get/notes/stream",
+        "/live/clip/start_listen/notes",
+        "/live/clip/stop_listen/notes",
         "/live/clip/add/notes",
         "/live/clip/remove/notes",
+        "/live/clip/get/notes/columns",
+        "/live/clip/add/notes/columns",
+        "/live/clip/remove/notes/columns",
+        "/live/clip/get/notes/by_id",
+        "/live/clip/modify/notes",
+        "/live/clip/transform/notes/transpose",
+        "/live/clip/transform/notes/time_shift",
+        "/live/clip/transform/notes/velocity_scale",
+        "/live/clip/transform/notes/humanize",
+        "/live/clips/transform/notes/transpose",
+        "/live/clips/transform/notes/time_shift",
+        "/live/clips/transform/notes/velocity_scale",
+        "/live/clips/transform/notes/humanize",
+        "/live/clips/filter",
+        "/live/clips/unfilter",
+        "/live/clips/select",
+        "/live/clips/apply",
         "/live/clip/get/color",
         "/live/clip/set/color",
         "/live/clip/get/name",
@@ -241,6 +272,7 @@ def main(args):
         "/live/clip/get/end_marker",
         "/live/clip/set/end_marker",
         "/live/device/get/name",
+        "/live/device/get/id",
         "/live/device/get/class_name",
         "/live/device/get/type",
         "/live/device/get/num_parameters",
@@ -142,4 +142,167 @@ def test_clip_listen_lifecycle(client):
     assert client.await_message("/live/clip/get/name", TICK_DURATION * 2) == (0, 0, "")
     client.send_message("/live/clip/set/name", [0, 0, "Alpha"])
     assert client.await_message("/live/clip/get/name", TICK_DURATION * 2) == (0, 0, "Alpha")
-    client.send_message("/live/clip/stop_listen/name", [0, 0])
\ No newline at end of file
+    client.send_message("/live/clip/stop_listen/name", [0, 0])
+#--------------------------------------------------------------------------------
+# Test clip notes - packed mode and columnar notes
+#--------------------------------------------------------------------------------
+
+def test_clip_get_notes_packed(client):
+    client.send_message("/live/clip/add/notes", (0, 0,
+                                                 60, 0.0, 0.25, 64, False,
+                                                 67, 1.0, 0.5, 32, True))
+    rv = client.query_packed("/live/clip/get/notes", (0, 0))
+    assert rv[:2] == (0, 0)
+    assert list(rv[2]) == [60, 67]
+    assert list(rv[3]) == [0.0, 1.0]
+    assert list(rv[4]) == [0.25, 0.5]
+    assert list(rv[5]) == [64.0, 32.0]
+    assert list(rv[6]) == [0, 1]
+    client.send_message("/live/clip/remove/notes", (0, 0))
+
+def test_clip_notes_columns(client):
+    client.send_message("/live/clip/add/notes/columns", (0, 0, 2,
+                                                         60, 64,
+                                                         0.0, 1.0,
+                                                         0.5, 0.25,
+                                                         100, 80,
+                                                         0, 1))
+    rv = client.query("/live/clip/get/notes/columns", (0, 0))
+    assert rv[:3] == (0, 0, 2)
+    note_ids = rv[3:5]
+    assert rv[5:7] == (60, 64)
+    assert rv[7:9] == (0.0, 1.0)
+    assert rv[9:11] == (0.5, 0.25)
+    assert rv[11:13] == (100, 80)
+    assert rv[13:15] == (False, True)
+
+    rv = client.query_packed("/live/clip/get/notes/columns", (0, 0))
+    assert rv[:2] == (0, 0)
+    assert tuple(rv[2]) == note_ids
+    assert list(rv[3]) == [60, 64]
+    assert list(rv[4]) == [0.0, 1.0]
+    assert list(rv[7]) == [0, 1]
+
+    client.send_message("/live/clip/remove/notes/columns", (0, 0, note_ids[0]))
+    assert client.query("/live/clip/get/notes", (0, 0)) == (0, 0,
+                                                            64, 1.0, 0.25, 80, True)
+    client.send_message("/live/clip/remove/notes/columns", (0, 0, note_ids[1]))
+    assert client.query("/live/clip/get/notes", (0, 0)) == (0, 0)
+
+def test_clip_modify_notes(client):
+    client.send_message("/live/clip/add/notes", (0, 0,
+                                                 60, 0.0, 0.25, 64, False,
+                                                 67, 1.0, 0.5, 32, False))
+    rv = client.query("/live/clip/get/notes/columns", (0, 0))
+    note_ids = rv[3:5]
+
+    # Attributes given as nil are left unchanged
+    client.send_message("/live/clip/modify/notes", (0, 0,
+                                                    note_ids[0], None, 2.0, None, 80, None,
+                                                    note_ids[1], 72, None, None, None, True))
+    assert client.query("/live/clip/get/notes/by_id", (0, 0) + note_ids) == (0, 0,
+                                                                            note_ids[0], 60, 2.0, 0.25, 80, False,
+                                                                            note_ids[1], 72, 1.0, 0.5, 32, True)
+    client.send_message("/live/clip/remove/notes", (0, 0))
+
+#--------------------------------------------------------------------------------
+# Test clip notes - hashes, pages and streams
+#--------------------------------------------------------------------------------
+
+def test_clip_notes_hash(client):
+    empty_hash = client.query("/live/clip/get/notes/hash", (0, 0))[2]
+    client.send_message("/live/clip/add/notes", (0, 0, 60, 0.0, 0.25, 64, False))
+    rv = client.query("/live/clip/get/notes/hash", (0, 0))
+    assert rv[:2] == (0, 0)
+    assert rv[2] != empty_hash
+    assert client.query("/live/clip/get/notes/hash", (0, 0)) == rv
+
+    client.send_message("/live/clip/remove/notes", (0, 0))
+    assert client.query("/live/clip/get/notes/hash", (0, 0)) == (0, 0, empty_hash)
+
+def test_clip_notes_page(client):
+    client.send_message("/live/clip/add/notes", (0, 0,
+                                                 60, 0.0, 0.25, 64, False,
+                                                 62, 0.0, 0.25, 64, False,
+                                                 64, 0.0, 0.25, 64, False))
+    assert client.query("/live/clip/get/notes/page", (0, 0, 1, 1)) == (0, 0, 1, 3,
+                                                                       62, 0.0, 0.25, 64, False)
+    assert client.query("/live/clip/get/notes/page", (0, 0, 2, 10)) == (0, 0, 2, 3,
+                                                                        64, 0.0, 0.25, 64, False)
+    assert client.query("/live/clip/get/notes/page", (0, 0, 3, 10)) == (0, 0, 3, 3)
+    client.send_message("/live/clip/remove/notes", (0, 0))
+
+def test_clip_notes_stream(client):
+    client.send_message("/live/clip/add/notes", (0, 0,
+                                                 60, 0.0, 0.25, 64, False,
+                                                 62, 0.0, 0.25, 64, False,
+                                                 64, 0.0, 0.25, 64, False))
+    notes_hash = client.query("/live/clip/get/notes/hash", (0, 0))[2]
+
+    pages = []
+    def add_page(address, params):
+        pages.append(params)
+    client.set_handler("/live/clip/get/notes/page", add_page)
+    client.send_message("/live/clip/get/notes/stream", (0, 0, 2))
+    assert client.await_message("/live/clip/get/notes/end", TICK_DURATION * 2) == (0, 0, 3, notes_hash)
+    client.remove_handler("/live/clip/get/notes/page")
+
+    assert pages == [(0, 0, 0, 3, 60, 0.0, 0.25, 64, False, 62, 0.0, 0.25, 64, False),
+                     (0, 0, 2, 3, 64, 0.0, 0.25, 64, False)]
+    client.send_message("/live/clip/remove/notes", (0, 0))
+
+#--------------------------------------------------------------------------------
+# Test clip notes - transforms
+#--------------------------------------------------------------------------------
+
+def test_clip_transform_notes(client):
+    client.send_message("/live/clip/add/notes", (0, 0, 60, 1.0, 0.25, 100, False))
+
+    client.send_message("/live/clip/transform/notes/transpose", (0, 0, 12))
+    client.send_message("/live/clip/transform/notes/velocity_scale", (0, 0, 0.5))
+    assert client.query("/live/clip/get/notes", (0, 0)) == (0, 0, 72, 1.0, 0.25, 50, False)
+
+    # Start times are not shifted before 0
+    client.send_message("/live/clip/transform/notes/time_shift", (0, 0, -2.0))
+    assert client.query("/live/clip/get/notes", (0, 0)) == (0, 0, 72, 0.0, 0.25, 50, False)
+
+    # Transform every MIDI clip in the first track and scene
+    client.send_message("/live/clips/transform/notes/transpose", (0, 1, 0, 1, -12))
+    assert client.query("/live/clip/get/notes", (0, 0)) == (0, 0, 60, 0.0, 0.25, 50, False)
+    client.send_message("/live/clip/remove/notes", (0, 0))
+
+#--------------------------------------------------------------------------------
+# Test clip selection
+#--------------------------------------------------------------------------------
+
+def test_clips_filter(client):
+    client.send_message("/live/clip/set/name", (0, 0, "Bass_C-E"))
+    wait_one_tick()
+
+    client.send_message("/live/clips/filter", ("C", "E", "G"))
+    wait_one_tick()
+    assert client.query("/live/clip/get/muted", (0, 0)) == (0, 0, False)
+
+    client.send_message("/live/clips/filter", ("C", "G"))
+    wait_one_tick()
+    assert client.query("/live/clip/get/muted", (0, 0)) == (0, 0, True)
+
+    client.send_message("/live/clips/unfilter")
+    wait_one_tick()
+    assert client.query("/live/clip/get/muted", (0, 0)) == (0, 0, False)
+
+def test_clips_select_apply(client):
+    client.send_message("/live/clip/set/name", (0, 0, "Alpha"))
+    client.send_message("/live/clip/set/name", (2, 0, "Beta"))
+    wait_one_tick()
+
+    assert client.query("/live/clips/select", ("name", "^Alpha$")) == (0, 0)
+    assert client.query("/live/clips/select", ("name", "a$")) == (0, 0, 2, 0)
+
+    assert client.query("/live/clips/apply", ("mute", "name", "^Beta$")) == (1,)
+    assert client.query("/live/clip/get/muted", (2, 0)) == (2, 0, True)
+    assert client.query("/live/clip/get/muted", (0, 0)) == (0, 0, False)
+
+    # Clips whose mute state is unchanged are not counted
+    assert client.query("/live/clips/apply", ("unmute", "name", "a$")) == (1,)
+    assert client.query("/live/clip/get/muted", (2, 0)) == (2, 0, False)
@@ -0,0 +1,41 @@
+from . import client, wait_one_tick, TICK_DURATION
+import pytest
+
+#--------------------------------------------------------------------------------
+# Test device ID addressing
+#--------------------------------------------------------------------------------
+
+def _get_test_device(client):
+    """
+    Returns the (track_id, device_id) of the first device in the set.
+    """
+    num_tracks = client.query("/live/song/get/num_tracks")[0]
+    for track_id in range(num_tracks):
+        if client.query("/live/track/get/num_devices", (track_id,))[1] > 0:
+            return track_id, 0
+    pytest.skip("No track in the test set has a device")
+
+def test_device_id(client):
+    track_id, device_id = _get_test_device(client)
+    rv = client.query("/live/device/get/id", (track_id, device_id))
+    assert rv[:2] == (track_id, device_id)
+    object_id = rv[2]
+
+    name = client.query("/live/device/get/name", (track_id, device_id))[2]
+    assert client.query("/live/device@id/get/name", (object_id,)) == (object_id, name)
+    value = client.query("/live/device/get/parameter/value", (track_id, device_id, 0))[3]
+    assert client.query("/live/device@id/get/parameter/value", (object_id, 0)) == (object_id, 0, value)
+
+def test_device_id_listen(client):
+    track_id, device_id = _get_test_device(client)
+    object_id = client.query("/live/device/get/id", (track_id, device_id))[2]
+    value = client.query("/live/device/get/parameter/value", (track_id, device_id, 0))[3]
+
+    client.send_message("/live/device@id/start_listen/parameter/value", [object_id, 0])
+    assert client.await_message("/live/device@id/get/parameter/value", TICK_DURATION * 2) == (object_id, 0, value)
+    client.send_message("/live/device@id/stop_listen/parameter/value", [object_id, 0])
+
+def test_device_unknown_id(client):
+    client.send_message("/live/device@id/get/name", [999999])
+    rv = client.await_message("/live/error", TICK_DURATION * 2)
+    assert rv[0].endswith("Unknown device ID: 999999")
@@ -0,0 +1,287 @@
+import sys
+import time
+import types
+import pytest
+
+#--------------------------------------------------------------------------------
+# Outside Live, stand in for the Component base class of the handlers, so that
+# the listener registry can be tested without Live.
+#--------------------------------------------------------------------------------
+try:
+    from ableton.v2.control_surface.component import Component
+except ImportError:
+    class Component:
+        def __init__(self, *args, **kwargs):
+            pass
+    for module_name in ["ableton", "ableton.v2", "ableton.v2.control_surface", "ableton.v2.control_surface.component"]:
+        sys.modules.setdefault(module_name, types.ModuleType(module_name))
+    sys.modules["ableton.v2.control_surface.component"].Component = Component
+
+from ..abletonosc.handler import AbletonOSCHandler, ListenerThrottle
+
+CLIENT_A = ("127.0.0.1", 11001)
+CLIENT_B = ("127.0.0.1", 11002)
+
+class FakeTrack:
+    """
+    A Live object with a single listenable property, volume.
+    """
+    def __init__(self, volume=0.0):
+        self.volume = volume
+        self.volume_listeners = []
+
+    def add_volume_listener(self, callback):
+        self.volume_listeners.append(callback)
+
+    def remove_volume_listener(self, callback):
+        self.volume_listeners.remove(callback)
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for callback in list(self.volume_listeners):
+            callback()
+
+class FakeServer:
+    """
+    Records the listener updates sent by a handler, as (remote_addr, address, key, value).
+    """
+    def __init__(self):
+        self.remote_addr = CLIENT_A
+        self.updates = []
+
+    def send_update(self, address, key, value, remote_addr):
+        self.updates.append((remote_addr, address, key, value))
+
+class FakeManager:
+    def __init__(self):
+        self.osc_server = FakeServer()
+        self.resolver = None
+
+class TrackHandler(AbletonOSCHandler):
+    def __init__(self, manager):
+        super().__init__(manager)
+        self.class_identifier = "track"
+        self.listener_id_count = 1
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    A fake monotonic clock, advanced by setting clock[0].
+    """
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    return clock
+
+@pytest.fixture
+def handler():
+    return TrackHandler(FakeManager())
+
+def start_listen(handler, track, remote_addr, *options):
+    handler.osc_server.remote_addr = remote_addr
+    handler._start_listen(track, "volume", (0, *options))
+
+def stop_listen(handler, track, remote_addr):
+    handler.osc_server.remote_addr = remote_addr
+    handler._stop_listen(track, "volume", (0,))
+
+def take_updates(handler):
+    updates = handler.osc_server.updates
+    handler.osc_server.updates = []
+    return updates
+
+#--------------------------------------------------------------------------------
+# ListenerThrottle
+#--------------------------------------------------------------------------------
+
+def test_throttle_unlimited(clock):
+    throttle = ListenerThrottle()
+    assert throttle.should_send((0.0,))
+    assert throttle.should_send((0.0,))
+    assert throttle.should_send((0.5,))
+    assert throttle.pending_value is None
+
+def test_throttle_max_rate(clock):
+    throttle = ListenerThrottle(max_rate=8)
+    assert throttle.should_send((0.1,))
+    clock[0] += 0.0625
+    assert not throttle.should_send((0.2,))
+    assert not throttle.should_send((0.3,))
+    assert throttle.pending_value == (0.3,)
+    assert not throttle.is_pending_due()
+    clock[0] += 0.0625
+    assert throttle.is_pending_due()
+    assert throttle.should_send((0.3,))
+    assert throttle.pending_value is None
+    assert not throttle.is_pending_due()
+
+def test_throttle_min_delta(clock):
+    throttle = ListenerThrottle(min_delta=0.1)
+    assert throttle.should_send((0.5,))
+    assert not throttle.should_send((0.55,))
+    assert not throttle.should_send((0.45,))
+    assert throttle.should_send((0.75,))
+    assert throttle.last_value == (0.75,)
+
+def test_throttle_min_delta_non_numeric(clock):
+    throttle = ListenerThrottle(min_delta=10)
+    assert throttle.should_send(("Track 1", 0))
+    assert throttle.should_send(("Track 2", 0))
+    assert throttle.should_send((True,))
+    assert throttle.should_send((False,))
+    assert throttle.should_send((False, 1))
+
+def test_throttle_min_delta_drop_clears_pending(clock):
+    throttle = ListenerThrottle(max_rate=10, min_delta=0.1)
+    assert throttle.should_send((0.5,))
+    clock[0] += 0.05
+    assert not throttle.should_send((0.9,))
+    assert throttle.pending_value == (0.9,)
+    clock[0] += 0.1
+    assert not throttle.should_send((0.52,))
+    assert throttle.pending_value is None
+
+#--------------------------------------------------------------------------------
+# Pending replay of updates dropped by max_rate
+#--------------------------------------------------------------------------------
+
+def test_pending_update_sent_once_due(handler, clock):
+    track = FakeTrack(0.0)
+    start_listen(handler, track, CLIENT_A, 10)
+    assert take_updates(handler) == [(CLIENT_A, "/live/track/get/volume", (0,), (0.0,))]
+
+    clock[0] += 0.01
+    track.set_volume(0.25)
+    track.set_volume(0.5)
+    handler.tick()
+    assert take_updates(handler) == []
+
+    clock[0] += 0.1
+    handler.tick()
+    assert take_updates(handler) == [(CLIENT_A, "/live/track/get/volume", (0,), (0.5,))]
+    clock[0] += 1
+    handler.tick()
+    assert take_updates(handler) == []
+
+def test_pending_update_not_stuck_when_dropped_on_replay(handler, clock):
+    track = FakeTrack(0.5)
+    start_listen(handler, track, CLIENT_A, 10, 0.1)
+    take_updates(handler)
+
+    clock[0] += 0.01
+    track.set_volume(0.9)
+    track.volume = 0.52
+    clock[0] += 0.1
+    handler.tick()
+    assert take_updates(handler) == []
+    throttle = handler.listener_clients[("volume", (0,))][CLIENT_A]
+    assert throttle.pending_value is None
+    assert not throttle.is_pending_due()
+
+def test_pending_update_only_sent_to_due_clients(handler, clock):
+    track = FakeTrack(0.0)
+    start_listen(handler, track, CLIENT_A, 10)
+    start_listen(handler, track, CLIENT_B)
+    take_updates(handler)
+
+    clock[0] += 0.01
+    track.set_volume(0.5)
+    assert take_updates(handler) == [(CLIENT_B, "/live/track/get/volume", (0,), (0.5,))]
+    clock[0] += 0.1
+    handler.tick()
+    assert take_updates(handler) == [(CLIENT_A, "/live/track/get/volume", (0,), (0.5,))]
+
+def test_pending_update_of_deleted_object_cleared(handler, clock):
+    track = FakeTrack(0.0)
+    start_listen(handler, track, CLIENT_A, 10)
+    clock[0] += 0.01
+    track.set_volume(0.5)
+    del track.volume
+    clock[0] += 0.1
+    handler.tick()
+    handler.tick()
+    assert handler.listener_clients[("volume", (0,))][CLIENT_A].pending_value is None
+
+#--------------------------------------------------------------------------------
+# Listener registry
+#--------------------------------------------------------------------------------
+
+def test_listener_fans_out_to_clients(handler, clock):
+    track = FakeTrack(0.0)
+    start_listen(handler, track, CLIENT_A)
+    start_listen(handler, track, CLIENT_B)
+    take_updates(handler)
+    assert len(track.volume_listeners) == 1
+    assert set(handler.listener_clients[("volume", (0,))]) == {CLIENT_A, CLIENT_B}
+
+    track.set_volume(0.5)
+    assert take_updates(handler) == [(CLIENT_A, "/live/track/get/volume", (0,), (0.5,)),
+                                     (CLIENT_B, "/live/track/get/volume", (0,), (0.5,))]
+
+def test_start_listen_sends_current_value_to_requester_only(handler, clock):
+    track = FakeTrack(0.25)
+    start_listen(handler, track, CLIENT_A)
+    assert take_updates(handler) == [(CLIENT_A, "/live/track/get/volume", (0,), (0.25,))]
+    start_listen(handler, track, CLIENT_B)
+    assert take_updates(handler) == [(CLIENT_B, "/live/track/get/volume", (0,), (0.25,))]
+
+def test_resubscribing_replaces_throttle(handler, clock):
+    track = FakeTrack(0.0)
+    start_listen(handler, track, CLIENT_A)
+    start_listen(handler, track, CLIENT_A, 10)
+    assert len(track.volume_listeners) == 1
+    assert list(handler.listener_clients[("volume", (0,))]) == [CLIENT_A]
+    assert handler.listener_clients[("volume", (0,))][CLIENT_A].min_interval == pytest.approx(0.1)
+
+def test_stop_listen_is_refcounted(handler, clock):
+    track = FakeTrack(0.0)
+    start_listen(handler, track, CLIENT_A)
+    start_listen(handler, track, CLIENT_B)
+    take_updates(handler)
+
+    stop_listen(handler, track, CLIENT_A)
+    assert len(track.volume_listeners) == 1
+    track.set_volume(0.5)
+    assert take_updates(handler) == [(CLIENT_B, "/live/track/get/volume", (0,), (0.5,))]
+
+    stop_listen(handler, track, CLIENT_A)
+    assert len(track.volume_listeners) == 1
+
+    stop_listen(handler, track, CLIENT_B)
+    assert track.volume_listeners == []
+    assert handler.listener_functions == {}
+    assert handler.listener_objects == {}
+    assert handler.listener_clients == {}
+
+def test_clear_listeners_of_client(handler, clock):
+    tracks = [FakeTrack(0.0), FakeTrack(0.0)]
+    start_listen(handler, tracks[0], CLIENT_A)
+    start_listen(handler, tracks[0], CLIENT_B)
+    handler.osc_server.remote_addr = CLIENT_A
+    handler._start_listen(tracks[1], "volume", (1,))
+    take_updates(handler)
+
+    handler._clear_listeners(CLIENT_A)
+    assert len(tracks[0].volume_listeners) == 1
+    assert tracks[1].volume_listeners == []
+    assert list(handler.listener_clients) == [("volume", (0,))]
+
+    tracks[0].set_volume(0.5)
+    assert take_updates(handler) == [(CLIENT_B, "/live/track/get/volume", (0,), (0.5,))]
+
+def test_clear_all_listeners(handler, clock):
+    track = FakeTrack(0.0)
+    start_listen(handler, track, CLIENT_A)
+    start_listen(handler, track, CLIENT_B)
+    handler._clear_listeners()
+    assert track.volume_listeners == []
+    assert handler.listener_clients == {}
+
+def test_remove_listener_of_deleted_object(handler, clock):
+    track = FakeTrack(0.0)
+    start_listen(handler, track, CLIENT_A)
+
+    def remove_volume_listener(callback):
+        raise RuntimeError("Object no longer exists")
+    track.remove_volume_listener = remove_volume_listener
+    stop_listen(handler, track, CLIENT_A)
+    assert handler.listener_clients == {}
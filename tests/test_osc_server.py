@@ -0,0 +1,445 @@
+from ..abletonosc.osc_server import OSCServer, MessageTemplate, get_type_signature, get_wildcard_regex, is_wildcard, \
+    MESSAGE_TEMPLATE_MAX_PARAMS
+from ..abletonosc.constants import OSC_MAX_BUNDLE_SIZE, OSC_MAX_DATAGRAM_SIZE, OSC_CHUNK_ADDRESS
+from ..client import AbletonOSCClient
+from ..pythonosc.osc_message import OscMessage
+from ..pythonosc.osc_bundle import OscBundle
+from ..pythonosc.osc_message_builder import OscMessageBuilder, BuildError
+from ..pythonosc import slip
+
+import math
+import time
+import socket
+import threading
+import pytest
+
+#--------------------------------------------------------------------------------
+# OSC server internals, tested without Live.
+#--------------------------------------------------------------------------------
+
+@pytest.fixture
+def server():
+    server = OSCServer(local_addr=("127.0.0.1", 0), stream_addr=None)
+    yield server
+    server.shutdown()
+
+@pytest.fixture
+def receiver():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(0.2)
+    yield receiver
+    receiver.close()
+
+def receive_datagrams(receiver):
+    """
+    Returns all of the datagrams received by `receiver` until it times out.
+    """
+    dgrams = []
+    try:
+        while True:
+            dgrams.append(receiver.recv(65536))
+    except socket.timeout:
+        return dgrams
+
+def get_messages(dgram):
+    """
+    Returns the (address, params) of each message in a datagram, in order.
+    """
+    if OscBundle.dgram_is_bundle(dgram):
+        bundle = OscBundle(dgram)
+        return [message for index in range(bundle.num_contents)
+                for message in get_messages(bundle.content(index).dgram)]
+    message = OscMessage(dgram)
+    return [(message.address, tuple(message.params))]
+
+def add_handlers(server, addresses):
+    for address in addresses:
+        server.add_handler(address, lambda params: None)
+
+#--------------------------------------------------------------------------------
+# Wildcard matching
+#--------------------------------------------------------------------------------
+
+TRACK_ADDRESSES = [
+    "/live/track/get/name",
+    "/live/track/get/color",
+    "/live/track/get/mute",
+    "/live/track/get/clips/name",
+    "/live/track/set/name",
+    "/live/track/set/color",
+    "/live/clip/get/name",
+    "/live/track@id/get/name",
+]
+
+def test_is_wildcard():
+    assert not is_wildcard("/live/track/get/name")
+    for address in ["/live/track/get/*", "/live/track/get/nam?", "/live/track/[gs]et/name", "/live/{track,clip}/get/name"]:
+        assert is_wildcard(address)
+
+def test_wildcard_star(server):
+    add_handlers(server, TRACK_ADDRESSES)
+    assert server.match_wildcard("/live/track/get/*") == ("/live/track/get/name",
+                                                          "/live/track/get/color",
+                                                          "/live/track/get/mute",
+                                                          "/live/track/get/clips/name")
+    assert server.match_wildcard("/live/*/get/name") == ("/live/track/get/name", "/live/clip/get/name")
+    assert server.match_wildcard("/live/track/*/c*") == ("/live/track/get/color",
+                                                         "/live/track/get/clips/name",
+                                                         "/live/track/set/color")
+    assert server.match_wildcard("/live/device/*") == ()
+
+def test_wildcard_question_mark(server):
+    add_handlers(server, TRACK_ADDRESSES)
+    assert server.match_wildcard("/live/track/?et/name") == ("/live/track/get/name", "/live/track/set/name")
+    assert server.match_wildcard("/live/track/get/mut?") == ("/live/track/get/mute",)
+    assert server.match_wildcard("/live/track/g?t/name") == ("/live/track/get/name",)
+    assert server.match_wildcard("/live/track/??et/name") == ()
+
+def test_wildcard_character_set(server):
+    add_handlers(server, TRACK_ADDRESSES)
+    assert server.match_wildcard("/live/track/[gs]et/name") == ("/live/track/get/name", "/live/track/set/name")
+    assert server.match_wildcard("/live/track/[a-h]et/name") == ("/live/track/get/name",)
+    assert server.match_wildcard("/live/track/[!g]et/name") == ("/live/track/set/name",)
+    assert server.match_wildcard("/live/track/get/[cm]?l*") == ("/live/track/get/color",)
+    assert server.match_wildcard("/live/track/[z-a]et/name") == ()
+
+def test_wildcard_alternatives(server):
+    add_handlers(server, TRACK_ADDRESSES)
+    assert server.match_wildcard("/live/track/get/{name,mute}") == ("/live/track/get/name", "/live/track/get/mute")
+    assert server.match_wildcard("/live/{track,clip}/get/name") == ("/live/track/get/name", "/live/clip/get/name")
+    assert server.match_wildcard("/live/{device,scene}/get/name") == ()
+
+def test_wildcard_regex_escapes_literals():
+    assert get_wildcard_regex("a.b") == r"a\.b"
+    assert get_wildcard_regex("[a-c-]") == r"[a-c\-]"
+    assert get_wildcard_regex("[!x]") == "[^/x]"
+    assert get_wildcard_regex("{a.b,c}") == r"(?:a\.b|c)"
+    assert get_wildcard_regex("x[y") == r"x\[y"
+    assert get_wildcard_regex("x{y") == r"x\{y"
+
+def test_wildcard_excludes_id_addresses(server):
+    add_handlers(server, TRACK_ADDRESSES)
+    for pattern in ["/live/*/get/name", "/live/tr?ck*/get/name", "/live/*", "/li*", "/*"]:
+        assert "/live/track@id/get/name" not in server.match_wildcard(pattern)
+    assert server.match_wildcard("/live/track@id/get/*") == ("/live/track@id/get/name",)
+    assert server.match_wildcard("/live/*@id/get/name") == ("/live/track@id/get/name",)
+
+def test_wildcard_cache_cleared_by_new_handlers(server):
+    add_handlers(server, TRACK_ADDRESSES)
+    assert server.match_wildcard("/live/scene/get/*") == ()
+    add_handlers(server, ["/live/scene/get/name"])
+    assert server.match_wildcard("/live/scene/get/*") == ("/live/scene/get/name",)
+
+def test_wildcard_message_calls_handlers(server):
+    calls = []
+    server.add_handler("/live/track/get/name", lambda params: calls.append(("name", params)))
+    server.add_handler("/live/track/get/mute", lambda params: calls.append(("mute", params)))
+    server.add_handler("/live/track/get/color", lambda params: calls.append(("color", params)))
+
+    builder = OscMessageBuilder("/live/track/get/{name,mute}")
+    builder.add_arg(2)
+    server.parse_bundle(builder.build().dgram, ("127.0.0.1", 12345))
+    assert calls == [("name", [2]), ("mute", [2])]
+
+#--------------------------------------------------------------------------------
+# Outbound queue
+#--------------------------------------------------------------------------------
+
+def test_flush_sends_single_message_unbundled(server, receiver):
+    server.send("/live/song/get/tempo", (120.0,), receiver.getsockname())
+    server.flush()
+    dgrams = receive_datagrams(receiver)
+    assert len(dgrams) == 1
+    assert not OscBundle.dgram_is_bundle(dgrams[0])
+    assert get_messages(dgrams[0]) == [("/live/song/get/tempo", (120.0,))]
+
+def test_flush_bundles_within_size_limit(server, receiver):
+    sent = [("/live/track/get/name", (index, "Track %d" % index)) for index in range(200)]
+    for address, params in sent:
+        server.send(address, params, receiver.getsockname())
+    server.flush()
+
+    dgrams = receive_datagrams(receiver)
+    assert 1 < len(dgrams) < len(sent)
+    assert all(len(dgram) <= OSC_MAX_BUNDLE_SIZE for dgram in dgrams)
+    assert [message for dgram in dgrams for message in get_messages(dgram)] == sent
+
+def test_flush_sends_oversized_message_alone(server, receiver):
+    large_params = tuple(range(OSC_MAX_BUNDLE_SIZE // 4))
+    server.send("/live/song/get/tempo", (120.0,), receiver.getsockname())
+    server.send("/live/clip/get/notes", large_params, receiver.getsockname())
+    server.send("/live/song/get/tempo", (121.0,), receiver.getsockname())
+    server.flush()
+
+    dgrams = receive_datagrams(receiver)
+    assert [get_messages(dgram) for dgram in dgrams] == [[("/live/song/get/tempo", (120.0,))],
+                                                         [("/live/clip/get/notes", large_params)],
+                                                         [("/live/song/get/tempo", (121.0,))]]
+
+def test_flush_empties_queue(server, receiver):
+    server.send("/live/song/get/tempo", (120.0,), receiver.getsockname())
+    server.flush()
+    server.flush()
+    assert len(receive_datagrams(receiver)) == 1
+
+#--------------------------------------------------------------------------------
+# Listener update coalescing
+#--------------------------------------------------------------------------------
+
+def test_send_update_coalesces_within_tick(server, receiver):
+    remote_addr = receiver.getsockname()
+    server.send_update("/live/track/get/volume", (0,), (0.1,), remote_addr)
+    server.send_update("/live/track/get/volume", (0,), (0.2,), remote_addr)
+    server.send_update("/live/track/get/volume", (0,), (0.5,), remote_addr)
+    server.flush()
+    messages = [message for dgram in receive_datagrams(receiver) for message in get_messages(dgram)]
+    assert messages == [("/live/track/get/volume", (0, 0.5))]
+
+def test_send_update_keeps_distinct_keys(server, receiver):
+    remote_addr = receiver.getsockname()
+    server.send_update("/live/track/get/volume", (0,), (0.25,), remote_addr)
+    server.send_update("/live/track/get/volume", (1,), (0.5,), remote_addr)
+    server.send_update("/live/track/get/panning", (0,), (0.75,), remote_addr)
+    server.send_update("/live/track/get/volume", (0,), (1.0,), remote_addr)
+    server.flush()
+    messages = [message for dgram in receive_datagrams(receiver) for message in get_messages(dgram)]
+    assert messages == [("/live/track/get/volume", (0, 1.0)),
+                        ("/live/track/get/volume", (1, 0.5)),
+                        ("/live/track/get/panning", (0, 0.75))]
+
+def test_send_update_keeps_distinct_clients(server):
+    receivers = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in range(2)]
+    try:
+        for index, client in enumerate(receivers):
+            client.bind(("127.0.0.1", 0))
+            client.settimeout(0.2)
+            server.send_update("/live/song/get/tempo", (), (120.0 + index,), client.getsockname())
+        server.flush()
+        assert get_messages(receive_datagrams(receivers[0])[0]) == [("/live/song/get/tempo", (120.0,))]
+        assert get_messages(receive_datagrams(receivers[1])[0]) == [("/live/song/get/tempo", (121.0,))]
+    finally:
+        for client in receivers:
+            client.close()
+
+def test_send_update_not_coalesced_across_ticks(server, receiver):
+    remote_addr = receiver.getsockname()
+    server.send_update("/live/song/get/tempo", (), (120.0,), remote_addr)
+    server.flush()
+    server.send_update("/live/song/get/tempo", (), (121.0,), remote_addr)
+    server.flush()
+    messages = [message for dgram in receive_datagrams(receiver) for message in get_messages(dgram)]
+    assert messages == [("/live/song/get/tempo", (120.0,)), ("/live/song/get/tempo", (121.0,))]
+
+#--------------------------------------------------------------------------------
+# Stream (TCP) connections
+#--------------------------------------------------------------------------------
+
+@pytest.fixture
+def stream_server():
+    server = OSCServer(local_addr=("127.0.0.1", 0), stream_addr=("127.0.0.1", 0))
+    yield server
+    server.shutdown()
+
+@pytest.fixture
+def stream_client(stream_server):
+    client = socket.create_connection(stream_server._stream_socket.getsockname())
+    client.settimeout(0.2)
+    yield client
+    client.close()
+
+def build_message(address, params=()):
+    builder = OscMessageBuilder(address)
+    for param in params:
+        builder.add_arg(param)
+    return builder.build().dgram
+
+def process_until(server, condition, timeout=2.0):
+    """
+    Process the server's pending data until `condition()` is true, or the timeout passes.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        server.process()
+        time.sleep(0.01)
+    return condition()
+
+def receive_stream_messages(client):
+    """
+    Returns the (address, params) of each message received on a stream connection
+    until it times out.
+    """
+    data = b""
+    try:
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    except socket.timeout:
+        pass
+    packets, remainder = slip.split_frames(data)
+    assert remainder == b""
+    return [message for packet in packets for message in get_messages(packet)]
+
+def test_stream_request_and_reply(stream_server, stream_client):
+    requests = []
+    def handler(params):
+        requests.append(tuple(params))
+        return ("reply", *params)
+    stream_server.add_handler("/live/test", handler)
+
+    stream_client.sendall(slip.encode(build_message("/live/test", (1, "two"))))
+    assert process_until(stream_server, lambda: requests)
+    assert requests == [(1, "two")]
+    assert receive_stream_messages(stream_client) == [("/live/test", ("reply", 1, "two"))]
+
+def test_stream_partial_frames(stream_server, stream_client):
+    requests = []
+    stream_server.add_handler("/live/test", lambda params: requests.append(tuple(params)))
+
+    data = b"".join(slip.encode(build_message("/live/test", (index, 0.5))) for index in range(3))
+    stream_client.sendall(data[:5])
+    process_until(stream_server, lambda: stream_server._stream_connections, timeout=0.5)
+    stream_client.sendall(data[5:len(data) - 1])
+    assert process_until(stream_server, lambda: len(requests) == 2)
+    stream_client.sendall(data[len(data) - 1:])
+    assert process_until(stream_server, lambda: len(requests) == 3)
+    assert requests == [(0, 0.5), (1, 0.5), (2, 0.5)]
+
+def test_stream_replies_not_chunked(stream_server, stream_client):
+    large_params = tuple(range(OSC_MAX_DATAGRAM_SIZE))
+    requests = []
+    def handler(params):
+        requests.append(tuple(params))
+        return large_params
+    stream_server.add_handler("/live/test", handler)
+    stream_client.sendall(slip.encode(build_message("/live/test")))
+    assert process_until(stream_server, lambda: requests)
+    assert receive_stream_messages(stream_client) == [("/live/test", large_params)]
+
+def test_stream_invalid_framing_closes_connection(stream_server, stream_client):
+    peer_addr = stream_client.getsockname()
+    expired_clients = []
+    stream_client.sendall(b"\xc0/live/test\xdb\x00\xc0")
+    assert process_until(stream_server, lambda: expired_clients.extend(stream_server.get_expired_clients()) or
+                         expired_clients)
+    assert expired_clients == [peer_addr]
+    assert stream_server._stream_connections == {}
+
+#--------------------------------------------------------------------------------
+# Chunking of replies too large for a UDP datagram
+#--------------------------------------------------------------------------------
+
+def test_large_reply_split_into_chunks(server, receiver):
+    params = tuple(range(OSC_MAX_DATAGRAM_SIZE))
+    server.send("/live/clip/get/notes", params, receiver.getsockname())
+    server.flush()
+
+    dgrams = receive_datagrams(receiver)
+    assert all(len(dgram) <= OSC_MAX_DATAGRAM_SIZE for dgram in dgrams)
+    chunks = [message for dgram in dgrams for message in get_messages(dgram)]
+    assert len(chunks) > 1
+    assert all(address == OSC_CHUNK_ADDRESS for address, _ in chunks)
+    chunk_ids = {chunk_params[0] for _, chunk_params in chunks}
+    assert len(chunk_ids) == 1
+    assert [chunk_params[1] for _, chunk_params in chunks] == list(range(len(chunks)))
+    assert all(chunk_params[2] == len(chunks) for _, chunk_params in chunks)
+    assert all(chunk_params[3] == "/live/clip/get/notes" for _, chunk_params in chunks)
+    assert tuple(param for _, chunk_params in chunks for param in chunk_params[4:]) == params
+
+def test_small_reply_not_chunked(server, receiver):
+    params = tuple(range(OSC_MAX_DATAGRAM_SIZE // 8))
+    server.send("/live/clip/get/notes", params, receiver.getsockname())
+    server.flush()
+    assert [message for dgram in receive_datagrams(receiver) for message in get_messages(dgram)] == \
+           [("/live/clip/get/notes", params)]
+
+def test_chunk_ids_distinct(server, receiver):
+    params = tuple(range(OSC_MAX_DATAGRAM_SIZE))
+    server.send("/live/clip/get/notes", params, receiver.getsockname())
+    server.send("/live/clip/get/notes", params, receiver.getsockname())
+    server.flush()
+    chunks = [message for dgram in receive_datagrams(receiver) for message in get_messages(dgram)]
+    assert len({chunk_params[0] for _, chunk_params in chunks}) == 2
+
+def test_chunked_reply_reassembled_by_client(server):
+    client = AbletonOSCClient(client_port=0)
+    try:
+        received = []
+        received_event = threading.Event()
+        def handle_reply(address, params):
+            received.append((address, params))
+            received_event.set()
+        client.set_handler("/live/clip/get/notes", handle_reply)
+
+        params = tuple(float(index) for index in range(OSC_MAX_DATAGRAM_SIZE)) + ("end",)
+        server.send("/live/clip/get/notes", params, ("127.0.0.1", client.server.server_address[1]))
+        server.flush()
+        assert received_event.wait(2.0)
+        assert received == [("/live/clip/get/notes", params)]
+        assert client.chunks == {}
+    finally:
+        client.stop()
+
+def test_client_reassembles_chunks_out_of_order():
+    client = AbletonOSCClient(client_port=0)
+    try:
+        received = []
+        client.set_handler("/live/test", lambda address, params: received.append(params))
+        client.handle_osc(OSC_CHUNK_ADDRESS, 7, 2, 3, "/live/test", 5, 6)
+        client.handle_osc(OSC_CHUNK_ADDRESS, 7, 0, 3, "/live/test", 1, 2)
+        assert received == []
+        client.handle_osc(OSC_CHUNK_ADDRESS, 7, 1, 3, "/live/test", 3, 4)
+        assert received == [(1, 2, 3, 4, 5, 6)]
+        assert client.chunks == {}
+    finally:
+        client.stop()
+
+#--------------------------------------------------------------------------------
+# Message templates
+#--------------------------------------------------------------------------------
+
+TEMPLATE_PARAMS = [
+    (),
+    (1,),
+    (-1, 2 ** 31 - 1, -2 ** 31),
+    (2 ** 32, -2 ** 32, 2 ** 63 - 1),
+    (0.5, -1.25, 3.4e38),
+    (math.inf, -math.inf, 1e-46),
+    (True, False, None),
+    (0, True, 0.5, None, 2 ** 40, False, 1.0, 7),
+]
+
+def test_type_signature():
+    assert get_type_signature((1, 2 ** 32, 0.5, True, False, None)) == "ihfTFN"
+    assert get_type_signature((1, "name")) is None
+    assert get_type_signature((b"blob",)) is None
+
+def test_template_matches_builder():
+    for params in TEMPLATE_PARAMS:
+        template = MessageTemplate("/live/test", get_type_signature(params))
+        assert template.encode(params) == build_message("/live/test", params)
+
+def test_template_nan_matches_builder():
+    template = MessageTemplate("/live/test", "f")
+    assert template.encode((math.nan,)) == build_message("/live/test", (math.nan,))
+
+def test_encode_message_matches_builder(server):
+    for params in TEMPLATE_PARAMS + [("name", 1), (1,) * (MESSAGE_TEMPLATE_MAX_PARAMS + 1)]:
+        assert server._encode_message("/live/test", params) == build_message("/live/test", params)
+        assert server._encode_message("/live/test", params) == build_message("/live/test", params)
+
+def test_encode_message_out_of_range_float(server):
+    for params in [(1e39,), (1, -1e39), (0.5, 1e300, True)]:
+        with pytest.raises(BuildError):
+            build_message("/live/test", params)
+        with pytest.raises(BuildError):
+            server._encode_message("/live/test", params)
+
+def test_send_out_of_range_float_not_sent(server, receiver):
+    server.send("/live/test", (1e39,), receiver.getsockname())
+    server.send("/live/test", (1.0,), receiver.getsockname())
+    server.flush()
+    assert [message for dgram in receive_datagrams(receiver) for message in get_messages(dgram)] == \
+           [("/live/test", (1.0,))]
@@ -0,0 +1,71 @@
+from ..abletonosc.packed import pack_column, unpack_column, split_packed_flag, PACKED_HEADER
+from ..client.client import unpack_array, unpack_numpy, PACKED_HEADER as CLIENT_PACKED_HEADER
+
+import math
+import struct
+import pytest
+
+#--------------------------------------------------------------------------------
+# Packed mode columns, tested without Live.
+#--------------------------------------------------------------------------------
+
+def test_packed_header_matches_client():
+    assert PACKED_HEADER.format == CLIENT_PACKED_HEADER.format == ">c3xI"
+    assert PACKED_HEADER.size == 8
+
+def test_pack_float_column():
+    blob = pack_column([0.5, -1.25, 100.0])
+    assert blob == b"f\x00\x00\x00" + struct.pack(">I", 3) + struct.pack(">3f", 0.5, -1.25, 100.0)
+
+def test_pack_int_column():
+    blob = pack_column([60, -1, 2 ** 31 - 1, True, False], "i")
+    assert blob == b"i\x00\x00\x00" + struct.pack(">I", 5) + struct.pack(">5i", 60, -1, 2 ** 31 - 1, 1, 0)
+
+def test_pack_empty_column():
+    assert pack_column([]) == b"f\x00\x00\x00\x00\x00\x00\x00"
+    assert list(unpack_array(pack_column([], "i"))) == []
+
+def test_float_column_round_trip():
+    values = [0.0, 0.5, -1.25, 127.0, 1e-3, 3.4e38]
+    unpacked = unpack_array(pack_column(values))
+    assert unpacked.typecode == "f"
+    assert list(unpacked) == pytest.approx(values, rel=1e-6)
+    assert list(unpack_column(pack_column(values))) == list(unpacked)
+
+def test_int_column_round_trip():
+    values = [0, 1, 60, 127, -2 ** 31, 2 ** 31 - 1]
+    unpacked = unpack_array(pack_column(values, "i"))
+    assert unpacked.typecode == "i"
+    assert list(unpacked) == values
+    assert list(unpack_column(pack_column(values, "i"))) == values
+
+def test_missing_float_values_packed_as_nan():
+    unpacked = unpack_array(pack_column([1.0, None, 2.0]))
+    assert unpacked[0] == 1.0
+    assert math.isnan(unpacked[1])
+    assert unpacked[2] == 2.0
+
+def test_large_column_round_trip():
+    values = [float(index) / 8 for index in range(10000)]
+    assert list(unpack_array(pack_column(values))) == values
+
+def test_unpack_short_column():
+    blob = pack_column([1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        unpack_array(blob[:-1])
+    with pytest.raises(ValueError):
+        unpack_column(blob[:-4])
+
+def test_pack_unsupported_type():
+    with pytest.raises(ValueError):
+        pack_column([1], "d")
+
+def test_unpack_numpy():
+    np = pytest.importorskip("numpy")
+    assert unpack_numpy(pack_column([0.5, 1.5])).tolist() == [0.5, 1.5]
+    assert unpack_numpy(pack_column([3, 4], "i")).dtype == np.dtype(">i4")
+
+def test_split_packed_flag():
+    assert split_packed_flag((0, 1, "packed")) == ((0, 1), True)
+    assert split_packed_flag([0, 1]) == ((0, 1), False)
+    assert split_packed_flag(()) == ((), False)
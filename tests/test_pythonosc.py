@@ -0,0 +1,287 @@
+from ..pythonosc import slip, osc_message
+from ..pythonosc.osc_message import OscMessage, ParseError
+from ..pythonosc.osc_message_builder import OscMessageBuilder, BuildError
+from ..pythonosc.osc_bundle import OscBundle, ParseError as BundleParseError
+from ..pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+from ..pythonosc.parsing import osc_types
+
+import struct
+import pytest
+
+#--------------------------------------------------------------------------------
+# Vendored pythonosc internals, tested without Live.
+#--------------------------------------------------------------------------------
+
+#--------------------------------------------------------------------------------
+# SLIP framing
+#--------------------------------------------------------------------------------
+
+def test_slip_encode():
+    assert slip.encode(b"abc") == b"\xc0abc\xc0"
+    assert slip.encode(b"a\xc0b\xdbc") == b"\xc0a\xdb\xdcb\xdb\xddc\xc0"
+    assert slip.encode(b"") == b"\xc0\xc0"
+
+def test_slip_round_trip():
+    for packet in [b"/live/test\x00\x00,\x00\x00\x00", b"\xc0\xdb\xdc\xdd" * 4, bytes(range(256))]:
+        assert slip.decode(slip.encode(packet)) == packet
+
+def test_slip_decode_errors():
+    with pytest.raises(slip.ProtocolError):
+        slip.decode(b"\xc0a\xc0b\xc0")
+    with pytest.raises(slip.ProtocolError):
+        slip.decode(b"\xc0a\xdbb\xc0")
+
+def test_slip_split_frames():
+    data = slip.encode(b"one") + slip.encode(b"t\xc0o")
+    assert slip.split_frames(data) == ([b"one", b"t\xc0o"], b"")
+
+def test_slip_split_partial_frames():
+    data = slip.encode(b"one") + slip.encode(b"two") + slip.encode(b"three")
+    packets = []
+    buffer = b""
+    for index in range(0, len(data), 3):
+        frames, buffer = slip.split_frames(buffer + data[index:index + 3])
+        packets += frames
+    assert packets == [b"one", b"two", b"three"]
+    assert buffer == b""
+
+def test_slip_split_keeps_incomplete_frame():
+    frames, remainder = slip.split_frames(slip.encode(b"one") + b"\xc0tw")
+    assert frames == [b"one"]
+    assert remainder == b"tw"
+    assert slip.split_frames(remainder + b"o\xc0") == ([b"two"], b"")
+
+#--------------------------------------------------------------------------------
+# Message decoding
+#--------------------------------------------------------------------------------
+
+def build_message(address, params=(), types=None):
+    builder = OscMessageBuilder(address)
+    for index, param in enumerate(params):
+        builder.add_arg(param, types[index] if types else None)
+    return builder.build().dgram
+
+MESSAGE_ARGS = [
+    ((), None),
+    ((1, 2, 3), None),
+    ((0.5, -1.5, 1e30), None),
+    ((2 ** 40, -2 ** 40), None),
+    ((0.25, 1.0e200), "fd"),
+    (("name", 1, 0.5, "", "abcd", 2), None),
+    ((True, False, None, 7, True), None),
+    ((b"blob", 1, b"abcde", 0.5), None),
+    (((0, 144, 60, 100), 1), None),
+    ((0xff0000ff, 1), "ri"),
+    (([1, 2.5, "three"], 4), None),
+    ((1, [True, [2, None]], "x"), None),
+]
+
+DECODER_MESSAGES = [build_message("/live/test", params, types) for params, types in MESSAGE_ARGS]
+
+def decode_params(dgram):
+    """
+    Returns the decoded params of a datagram, or ParseError if it can't be decoded.
+    """
+    try:
+        return repr(OscMessage(dgram).params)
+    except ParseError:
+        return ParseError
+
+def decode_baseline_params(dgram, monkeypatch):
+    """
+    Returns the params of a datagram as decoded by the generic per-argument parser.
+    """
+    with monkeypatch.context() as patch:
+        patch.setattr(osc_message, "_compile_decoder", lambda type_tag: None)
+        return decode_params(dgram)
+
+def test_decoder_matches_baseline(monkeypatch):
+    for dgram in DECODER_MESSAGES:
+        assert decode_params(dgram) is not ParseError
+        assert decode_params(dgram) == decode_baseline_params(dgram, monkeypatch)
+
+def test_decoder_values():
+    assert OscMessage(build_message("/live/test", ("name", 1, 0.5, True, None, 2 ** 40))).params == \
+           ["name", 1, 0.5, True, None, 2 ** 40]
+    assert OscMessage(build_message("/live/test", (b"\x00\x01", 0.25, 1.0e200), "bfd")).params == \
+           [b"\x00\x01", 0.25, 1.0e200]
+
+def test_decoder_truncated_matches_baseline(monkeypatch):
+    for dgram in DECODER_MESSAGES:
+        for length in range(len(dgram)):
+            truncated = dgram[:length]
+            assert decode_params(truncated) == decode_baseline_params(truncated, monkeypatch)
+
+def test_decoder_truncated_float():
+    dgram = build_message("/live/test", (1, 0.5))
+    assert OscMessage(dgram[:-2]).params == [1, 0.5]
+    with pytest.raises(ParseError):
+        OscMessage(dgram[:-4])
+    with pytest.raises(ParseError):
+        OscMessage(dgram[:-6])
+
+def test_get_float_past_end():
+    with pytest.raises(osc_types.ParseError):
+        osc_types.get_float(b"\x3f\x80\x00\x00", 4)
+    assert osc_types.get_float(b"\x3f\x80", 0) == (1.0, 4)
+
+def test_decoder_cached_per_type_tag():
+    dgrams = [build_message("/live/a", (1, 0.5)), build_message("/live/b", (2, 1.5))]
+    osc_message._compile_decoder.cache_clear()
+    for dgram in dgrams:
+        OscMessage(dgram)
+    assert osc_message._compile_decoder.cache_info().misses == 1
+    assert osc_message._compile_decoder.cache_info().hits == 1
+
+#--------------------------------------------------------------------------------
+# Message building
+#--------------------------------------------------------------------------------
+
+REFERENCE_WRITERS = {
+    "i": osc_types.write_int,
+    "h": osc_types.write_int64,
+    "f": osc_types.write_float,
+    "d": osc_types.write_double,
+    "s": osc_types.write_string,
+    "b": osc_types.write_blob,
+    "r": osc_types.write_rgba,
+    "m": osc_types.write_midi,
+}
+
+def build_reference(builder):
+    """
+    Returns the datagram of a builder's message, encoded one argument at a time.
+    """
+    dgram = osc_types.write_string(builder.address)
+    dgram += osc_types.write_string("," + "".join(arg_type for arg_type, _ in builder.args))
+    for arg_type, value in builder.args:
+        if arg_type in REFERENCE_WRITERS:
+            dgram += REFERENCE_WRITERS[arg_type](value)
+    return dgram
+
+def test_builder_matches_reference():
+    for params, types in MESSAGE_ARGS:
+        builder = OscMessageBuilder("/live/test")
+        for index, param in enumerate(params):
+            builder.add_arg(param, types[index] if types else None)
+        assert builder.build().dgram == build_reference(builder)
+
+def test_builder_runs_match_reference():
+    params_list = [
+        tuple(range(500)),
+        tuple(float(index) / 4 for index in range(500)),
+        (1, 2, 0.5, 0.25, 3, 2 ** 40, 2 ** 41, 0.75),
+        (1, True, 2, None, 3, False, 0.5, [4, 5], 6),
+        ("a", 1, 2, "b", 0.5, 0.25, "c"),
+    ]
+    for params in params_list:
+        builder = OscMessageBuilder("/live/test")
+        for param in params:
+            builder.add_arg(param)
+        assert builder.build().dgram == build_reference(builder)
+
+def test_builder_explicit_types_match_reference():
+    builder = OscMessageBuilder("/live/test")
+    for value, arg_type in [(1.5, "d"), (2.5, "f"), (0x11223344, "r"), (3, "h"), (4, "i"), (0.5, "d")]:
+        builder.add_arg(value, arg_type)
+    assert builder.build().dgram == build_reference(builder)
+
+def test_builder_errors():
+    with pytest.raises(BuildError):
+        OscMessageBuilder("").build()
+    builder = OscMessageBuilder("/live/test")
+    builder.add_arg(1e39)
+    with pytest.raises(BuildError):
+        builder.build()
+    builder = OscMessageBuilder("/live/test")
+    builder.add_arg(b"")
+    with pytest.raises(BuildError):
+        builder.build()
+
+#--------------------------------------------------------------------------------
+# Bundle parsing
+#--------------------------------------------------------------------------------
+
+def build_bundle(contents):
+    builder = OscBundleBuilder(IMMEDIATELY)
+    for content in contents:
+        builder.add_content(content)
+    return builder.build()
+
+def parse_eager(dgram):
+    """
+    Returns the contents of a bundle datagram, each decoded as it is reached, as
+    (address, params) for messages and lists of contents for bundles.
+    """
+    contents = []
+    index = 16
+    while index < len(dgram):
+        size, = struct.unpack_from(">i", dgram, index)
+        content = dgram[index + 4:index + 4 + size]
+        if OscBundle.dgram_is_bundle(content):
+            contents.append(parse_eager(content))
+        else:
+            message = OscMessage(content)
+            contents.append((message.address, message.params))
+        index += 4 + size
+    return contents
+
+def parse_lazy(bundle):
+    contents = []
+    for index in range(bundle.num_contents):
+        if bundle.content_is_bundle(index):
+            contents.append(parse_lazy(bundle.content(index)))
+        else:
+            message = bundle.content(index)
+            assert bundle.content_address(index) == message.address
+            contents.append((message.address, message.params))
+    return contents
+
+def test_bundle_matches_eager_parse():
+    messages = [OscMessage(dgram) for dgram in DECODER_MESSAGES]
+    inner = build_bundle(messages[:3])
+    bundle = build_bundle([messages[4], inner, *messages[5:], build_bundle([inner])])
+    assert parse_lazy(OscBundle(bundle.dgram)) == parse_eager(bundle.dgram)
+    assert parse_lazy(OscBundle(bundle.dgram)) == [
+        ("/live/test", messages[4].params),
+        [(message.address, message.params) for message in messages[:3]],
+        *[(message.address, message.params) for message in messages[5:]],
+        [[(message.address, message.params) for message in messages[:3]]],
+    ]
+
+def test_bundle_iteration():
+    messages = [OscMessage(dgram) for dgram in DECODER_MESSAGES[:4]]
+    bundle = OscBundle(build_bundle(messages).dgram)
+    assert bundle.num_contents == 4
+    assert [content.dgram for content in bundle] == [message.dgram for message in messages]
+    assert bundle.content(1) is bundle.content(1)
+
+def test_bundle_decodes_contents_lazily():
+    valid = build_message("/live/valid", (1,))
+    invalid = osc_types.write_string("/live/invalid") + osc_types.write_string(",i")
+    dgram = b"#bundle\x00" + osc_types.write_date(IMMEDIATELY)
+    for content in [valid, invalid]:
+        dgram += struct.pack(">i", len(content)) + content
+    bundle = OscBundle(dgram)
+    assert bundle.content_address(0) == "/live/valid"
+    assert bundle.content_address(1) == "/live/invalid"
+    assert bundle.content(0).params == [1]
+    with pytest.raises(BundleParseError):
+        bundle.content(1)
+
+def test_bundle_content_address_of_bundle():
+    bundle = OscBundle(build_bundle([build_bundle([])]).dgram)
+    assert bundle.content_is_bundle(0)
+    with pytest.raises(BundleParseError):
+        bundle.content_address(0)
+
+def test_bundle_truncated():
+    dgram = build_bundle([OscMessage(dgram) for dgram in DECODER_MESSAGES[:3]]).dgram
+    for length in range(16, len(dgram)):
+        try:
+            bundle = OscBundle(dgram[:length])
+        except BundleParseError:
+            continue
+        assert parse_lazy(bundle) == parse_eager(dgram[:length])
+    with pytest.raises(BundleParseError):
+        OscBundle(dgram[:8])
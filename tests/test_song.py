@@ -197,3 +197,64 @@ def test_song_undo_redo(client):
     wait_one_tick()
     assert client.query("/live/song/get/num_scenes") == (9,)
     client.send_message("/live/song/delete_scene", [8])
+
+#--------------------------------------------------------------------------------
+# Test song - track and scene IDs
+#--------------------------------------------------------------------------------
+
+def test_song_track_ids(client):
+    track_ids = client.query("/live/song/get/track_ids")
+    assert len(track_ids) == client.query("/live/song/get/num_tracks")[0]
+    assert len(set(track_ids)) == len(track_ids)
+    for track_id, object_id in enumerate(track_ids):
+        assert client.query("/live/track/get/id", (track_id,)) == (track_id, object_id)
+
+def test_song_scene_ids(client):
+    scene_ids = client.query("/live/song/get/scene_ids")
+    assert len(scene_ids) == client.query("/live/song/get/num_scenes")[0]
+    assert len(set(scene_ids)) == len(scene_ids)
+    for scene_id, object_id in enumerate(scene_ids):
+        assert client.query("/live/scene/get/id", (scene_id,)) == (scene_id, object_id)
+
+#--------------------------------------------------------------------------------
+# Test API - tick budget
+#--------------------------------------------------------------------------------
+
+def test_api_tick_budget(client):
+    time_budget, max_messages = client.query("/live/api/get/tick_budget")
+    client.send_message("/live/api/set/tick_budget", [0.5, 100])
+    wait_one_tick()
+    assert client.query("/live/api/get/tick_budget") == (0.5, 100)
+
+    # The message cap is optional
+    client.send_message("/live/api/set/tick_budget", [0.25])
+    wait_one_tick()
+    assert client.query("/live/api/get/tick_budget") == (0.25, 100)
+
+    client.send_message("/live/api/set/tick_budget", [time_budget, max_messages])
+    wait_one_tick()
+    assert client.query("/live/api/get/tick_budget") == (time_budget, max_messages)
+
+def test_api_tick_stats(client):
+    processed, deferred, ticks_deferred, pending = client.query("/live/api/get/tick_stats")
+    assert min(processed, deferred, ticks_deferred, pending) >= 0
+    rv = client.query("/live/api/get/tick_stats")
+    assert rv[0] > processed
+    assert rv[1] >= deferred
+    assert rv[2] >= ticks_deferred
+
+#--------------------------------------------------------------------------------
+# Test API - heartbeat
+#--------------------------------------------------------------------------------
+
+def test_api_heartbeat(client):
+    timeout = client.query("/live/api/get/heartbeat_timeout")[0]
+    client.send_message("/live/api/set/heartbeat_timeout", [10.0])
+    wait_one_tick()
+    assert client.query("/live/api/get/heartbeat_timeout") == (10.0,)
+
+    assert client.query("/live/api/heartbeat") == ()
+
+    client.send_message("/live/api/set/heartbeat_timeout", [timeout])
+    wait_one_tick()
+    assert client.query("/live/api/get/heartbeat_timeout") == (timeout,)
@@ -107,3 +107,66 @@ def test_track_listen_playing_slot_index(client):
 
     for track_id, clip_id in itertools.product((0, 1), (0, 1)):
         client.send_message("/live/clip_slot/delete_clip", (track_id, clip_id))
+
+#--------------------------------------------------------------------------------
+# Test track ID addressing
+#--------------------------------------------------------------------------------
+
+def test_track_id(client):
+    track_id = 2
+    rv = client.query("/live/track/get/id", (track_id,))
+    assert rv[0] == track_id
+    object_id = rv[1]
+    assert client.query("/live/track/get/id", (track_id,)) == (track_id, object_id)
+
+    client.send_message("/live/track@id/set/name", [object_id, "Gamma"])
+    wait_one_tick()
+    assert client.query("/live/track/get/name", (track_id,)) == (track_id, "Gamma")
+    assert client.query("/live/track@id/get/name", (object_id,)) == (object_id, "Gamma")
+
+    # IDs continue to refer to the same track after tracks are reordered
+    client.send_message("/live/song/create_midi_track", [0])
+    wait_one_tick()
+    wait_one_tick()
+    wait_one_tick()
+    assert client.query("/live/track/get/id", (track_id + 1,)) == (track_id + 1, object_id)
+    assert client.query("/live/track@id/get/name", (object_id,)) == (object_id, "Gamma")
+    client.send_message("/live/song/delete_track", [0])
+    wait_one_tick()
+    wait_one_tick()
+    wait_one_tick()
+    assert client.query("/live/song/get/num_tracks") == (4,)
+    client.send_message("/live/track@id/set/name", [object_id, "Track"])
+
+def test_track_id_listen(client):
+    track_id = 2
+    object_id = client.query("/live/track/get/id", (track_id,))[1]
+    client.send_message("/live/track/set/volume", [track_id, 0.5])
+    wait_one_tick()
+
+    client.send_message("/live/track@id/start_listen/volume", [object_id])
+    assert client.await_message("/live/track@id/get/volume", TICK_DURATION * 2) == (object_id, 0.5)
+    client.send_message("/live/track/set/volume", [track_id, 1.0])
+    assert client.await_message("/live/track@id/get/volume", TICK_DURATION * 2) == (object_id, 1.0)
+
+    client.send_message("/live/track@id/stop_listen/volume", [object_id])
+
+def test_track_id_listen_by_index(client):
+    # Find a track whose ID is also a valid track index
+    track_ids = client.query("/live/song/get/track_ids")
+    for track_id, object_id in enumerate(track_ids):
+        if object_id < len(track_ids):
+            break
+    else:
+        pytest.skip("No track ID is also a valid track index")
+    client.send_message("/live/track/set/volume", [track_id, 0.5])
+    wait_one_tick()
+
+    # Stopping a listener by index doesn't stop the listener by ID with the same params
+    client.send_message("/live/track@id/start_listen/volume", [object_id])
+    assert client.await_message("/live/track@id/get/volume", TICK_DURATION * 2) == (object_id, 0.5)
+    client.send_message("/live/track/start_listen/volume", [object_id])
+    client.send_message("/live/track/stop_listen/volume", [object_id])
+    client.send_message("/live/track/set/volume", [track_id, 1.0])
+    assert client.await_message("/live/track@id/get/volume", TICK_DURATION * 2) == (object_id, 1.0)
+    client.send_message("/live/track@id/stop_listen/volume", [object_id])